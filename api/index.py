@@ -1,4 +1,15 @@
-from main import app
+import sys
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+# Variables du déploiement Vercel (api/.env), prioritaires sur backend/.env
+load_dotenv(Path(__file__).resolve().parent / ".env")
+
+# Même application que le déploiement Docker : le paquet backend est importé depuis la racine du dépôt
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from backend.main import app
 
 # Vercel entry point
 handler = app
@@ -1,6 +1,11 @@
-from fastapi import APIRouter, File, UploadFile, Form
-from fastapi.responses import JSONResponse
-from backend.services.cv_service import process_text_cv, process_file_cv, process_image_cv
+import json
+from typing import Literal, Optional
+from fastapi import APIRouter, File, UploadFile, Form, Query, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from backend.services.cv_service import process_text_cv, process_file_cv, stream_file_cv
+from backend.api.limiter import limiter, analyze_limit
+from backend.utils.metrics import timed
+from backend.utils.uploads import read_upload
 
 router = APIRouter(prefix="/api/cv", tags=["CV"])
 
@@ -8,11 +13,18 @@ router = APIRouter(prefix="/api/cv", tags=["CV"])
 # Analyse texte brut
 # -------------------------
 @router.post("/analyze/text")
-async def analyze_text(text: str = Form(...)):
+@limiter.limit(analyze_limit)
+async def analyze_text(
+    request: Request,
+    text: str = Form(...),
+    mode: Optional[Literal["fast", "llm", "hybrid"]] = Query(None),
+    provider: Optional[Literal["groq", "openai", "stub"]] = Query(None),
+    model: Optional[str] = Query(None),
+):
     """
     Recevoir du texte brut et retourner JSON LLM
     """
-    result = await process_text_cv(text)
+    result = await process_text_cv(text, mode, provider, model)
     return JSONResponse(content=result)
 
 
@@ -20,21 +32,66 @@ async def analyze_text(text: str = Form(...)):
 # Analyse fichier (PDF ou image)
 # -------------------------
 @router.post("/analyze/file")
-async def analyze_file(file: UploadFile = File(...)):
+@limiter.limit(analyze_limit)
+async def analyze_file(
+    request: Request,
+    file: UploadFile = File(...),
+    mode: Optional[Literal["fast", "llm", "hybrid"]] = Query(None),
+    provider: Optional[Literal["groq", "openai", "stub"]] = Query(None),
+    model: Optional[str] = Query(None),
+):
     """
     Recevoir un fichier (PDF ou image) et retourner JSON LLM
     """
-    result = await process_file_cv(file)
+    result = await process_file_cv(file, mode, provider, model)
     return JSONResponse(content=result)
 
 
+# -------------------------
+# Analyse fichier en flux (Server-Sent Events)
+# -------------------------
+@router.post("/analyze/file/stream")
+@limiter.limit(analyze_limit)
+async def analyze_file_stream(
+    request: Request,
+    file: UploadFile = File(...),
+    mode: Optional[Literal["fast", "llm", "hybrid"]] = Query(None),
+    provider: Optional[Literal["groq", "openai", "stub"]] = Query(None),
+    model: Optional[str] = Query(None),
+):
+    """
+    Recevoir un fichier (PDF ou image) et diffuser la progression de l'analyse en SSE,
+    champs partiels compris, jusqu'au JSON final (événement "result")
+    """
+    # Lire le fichier avant de répondre : le flux est consommé après le retour du handler
+    with timed("upload_read"):
+        content = await read_upload(file)
+
+    async def events():
+        async for event, data in stream_file_cv(file.filename, content, mode, provider, model):
+            yield f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 # -------------------------
 # Analyse image directement
 # -------------------------
 @router.post("/analyze/image")
-async def analyze_image(image: UploadFile = File(...)):
+@limiter.limit(analyze_limit)
+async def analyze_image(
+    request: Request,
+    image: UploadFile = File(...),
+    mode: Optional[Literal["fast", "llm", "hybrid"]] = Query(None),
+    provider: Optional[Literal["groq", "openai", "stub"]] = Query(None),
+    model: Optional[str] = Query(None),
+):
     """
-    Recevoir une image et retourner JSON LLM
+    Recevoir une image et retourner JSON LLM (même pipeline que les fichiers)
     """
-    result = await process_image_cv(image)
+    result = await process_file_cv(image, mode, provider, model)
     return JSONResponse(content=result)
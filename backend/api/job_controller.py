@@ -0,0 +1,63 @@
+from typing import Optional
+
+from fastapi import APIRouter, File, Form, Request, UploadFile, HTTPException
+from fastapi.responses import JSONResponse
+
+from backend.main_api import ALLOWED_EXTENSIONS
+from backend.services.validation_service import InvalidDocument, check_type
+from backend.utils.uploads import read_upload
+from backend.services.job_service import WebhookRejected, submit_job, get_job, validate_webhook_url
+from backend.api.limiter import limiter, analyze_limit
+
+router = APIRouter(prefix="/api/jobs", tags=["Jobs"])
+
+# -------------------------
+# Soumission d'une analyse asynchrone
+# -------------------------
+@router.post("", status_code=202)
+@limiter.limit(analyze_limit)
+async def create_job(request: Request, file: UploadFile = File(...), webhook_url: Optional[str] = Form(None)):
+    """
+    Enregistrer un fichier à analyser en arrière-plan et retourner immédiatement l'id de la tâche.
+    Le résultat est consultable via GET /api/jobs/{job_id} ou envoyé au webhook fourni.
+    """
+    filename = file.filename or ""
+    ext = "." + filename.rsplit(".", 1)[-1].lower() if "." in filename else ""
+    if ext not in ALLOWED_EXTENSIONS:
+        raise HTTPException(
+            400,
+            f"Type de fichier non accepté. Autorisés: {', '.join(ALLOWED_EXTENSIONS)}",
+        )
+    if webhook_url:
+        try:
+            await validate_webhook_url(webhook_url)
+        except WebhookRejected as e:
+            raise HTTPException(400, str(e))
+
+    content = await read_upload(file)
+    if not content:
+        raise HTTPException(400, "Fichier vide")
+    try:
+        check_type(content)
+    except InvalidDocument as e:
+        raise HTTPException(e.status_code, str(e))
+
+    job_id = await submit_job(filename, content, webhook_url)
+    return JSONResponse(
+        status_code=202,
+        content={"job_id": job_id, "status": "pending", "status_url": f"/api/jobs/{job_id}"},
+    )
+
+
+# -------------------------
+# Suivi d'une analyse asynchrone
+# -------------------------
+@router.get("/{job_id}")
+async def job_status(job_id: str):
+    """
+    Retourner l'état d'une tâche (pending, running, done, error) et son résultat
+    """
+    job = await get_job(job_id)
+    if job is None:
+        raise HTTPException(404, "Tâche introuvable")
+    return job
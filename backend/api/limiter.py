@@ -0,0 +1,85 @@
+import hashlib
+import os
+import time
+
+from fastapi import Request
+from fastapi.responses import JSONResponse
+from slowapi import Limiter
+from slowapi.errors import RateLimitExceeded
+from slowapi.util import get_remote_address
+
+from backend.services.admission import ServiceOverloaded
+
+# Limites par client (surchargées via l'environnement ; syntaxe "10/minute", "100/hour;10/minute")
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() in ("1", "true", "yes")
+RATE_LIMIT_ANALYZE = os.getenv("RATE_LIMIT_ANALYZE", "10/minute")  # par adresse IP
+RATE_LIMIT_ANALYZE_API_KEY = os.getenv("RATE_LIMIT_ANALYZE_API_KEY", "60/minute")  # par clé d'API connue
+RATE_LIMIT_BATCH = os.getenv("RATE_LIMIT_BATCH", "2/minute")
+RATE_LIMIT_STORAGE = os.getenv("RATE_LIMIT_STORAGE", "memory://")  # redis://... pour partager entre workers
+
+# Clés d'API reconnues (en-tête X-API-Key) ; une clé inconnue est limitée comme son adresse IP
+API_KEYS = {key.strip() for key in os.getenv("API_KEYS", "").split(",") if key.strip()}
+
+# Derrière nginx : adresse du client lue dans X-Real-IP (écrasé par le proxy, non falsifiable tant que
+# le backend n'est joignable que par lui : port non publié, comme FORWARDED_ALLOW_IPS dans gunicorn_conf)
+RATE_LIMIT_TRUST_PROXY = os.getenv("RATE_LIMIT_TRUST_PROXY", "false").lower() in ("1", "true", "yes")
+
+
+def client_key(request: Request) -> str:
+    """
+    Identité du client pour les limites : clé d'API connue, sinon adresse IP
+    """
+    api_key = request.headers.get("x-api-key")
+    if api_key and api_key in API_KEYS:
+        return "key:" + hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]
+    if RATE_LIMIT_TRUST_PROXY and request.headers.get("x-real-ip"):
+        return "ip:" + request.headers["x-real-ip"]
+    return "ip:" + get_remote_address(request)
+
+
+def analyze_limit(key: str) -> str:
+    """
+    Limite des routes d'analyse selon le type de client
+    """
+    return RATE_LIMIT_ANALYZE_API_KEY if key.startswith("key:") else RATE_LIMIT_ANALYZE
+
+
+limiter = Limiter(key_func=client_key, storage_uri=RATE_LIMIT_STORAGE, enabled=RATE_LIMIT_ENABLED)
+
+
+def rate_limit_exceeded_handler(request: Request, exc: RateLimitExceeded) -> JSONResponse:
+    """
+    429 avec Retry-After = temps restant avant la fin de la fenêtre de limitation
+    """
+    try:
+        limit, args = request.state.view_rate_limit
+        reset_at, _ = limiter.limiter.get_window_stats(limit, *args)
+        retry_after = max(1, int(reset_at - time.time()) + 1)
+    except Exception:
+        retry_after = exc.limit.limit.get_expiry()
+    return JSONResponse(
+        status_code=429,
+        content={"detail": f"Trop de requêtes ({exc.detail}), réessayez dans {retry_after}s"},
+        headers={"Retry-After": str(retry_after)},
+    )
+
+
+def service_overloaded_handler(request: Request, exc: ServiceOverloaded) -> JSONResponse:
+    """
+    503 immédiat quand la capacité d'extraction ou d'appels LLM est saturée
+    """
+    retry_after = max(1, int(exc.retry_after + 0.5))
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(retry_after)},
+    )
+
+
+def install(app) -> None:
+    """
+    Branche le limiteur et les réponses 429/503 sur l'application
+    """
+    app.state.limiter = limiter
+    app.add_exception_handler(RateLimitExceeded, rate_limit_exceeded_handler)
+    app.add_exception_handler(ServiceOverloaded, service_overloaded_handler)
@@ -0,0 +1,91 @@
+"""
+Profil de production : gunicorn (maître) + workers uvicorn.
+
+    gunicorn -c backend/gunicorn_conf.py backend.main:app
+
+- plusieurs workers (WEB_CONCURRENCY, défaut : nombre de cœurs) : une extraction ou un crash
+  n'immobilise plus tout le service ;
+- application préchargée dans le maître avant le fork (modules partagés par copie à l'écriture) ;
+- recyclage des workers après MAX_REQUESTS requêtes (croissance mémoire de PIL/PyPDF2 bornée) ;
+- arrêt progressif : requêtes en cours et tâches /api/jobs terminées dans GRACEFUL_TIMEOUT.
+Le pool d'extraction de chaque worker est dimensionné pour ne pas dépasser le nombre de cœurs.
+"""
+import importlib
+import os
+import tempfile
+
+CPU_COUNT = os.cpu_count() or 2
+
+# -------------------- Workers --------------------
+bind = os.getenv("BIND", f"0.0.0.0:{os.getenv('PORT', '8001')}")
+workers = int(os.getenv("WEB_CONCURRENCY", str(CPU_COUNT)))
+worker_class = "uvicorn_worker.UvicornWorker"
+preload_app = os.getenv("PRELOAD_APP", "true").lower() in ("1", "true", "yes")
+
+# Recyclage : un worker redémarre après MAX_REQUESTS requêtes (± jitter pour ne pas tous les recycler ensemble)
+max_requests = int(os.getenv("MAX_REQUESTS", "1000"))
+max_requests_jitter = int(os.getenv("MAX_REQUESTS_JITTER", "100"))
+
+# Arrêt progressif (SIGTERM, recyclage) : délai avant arrêt forcé d'un worker (secondes)
+graceful_timeout = int(os.getenv("GRACEFUL_TIMEOUT", "60"))
+# Worker sans nouvelles du maître (boucle bloquée) : redémarré après ce délai (secondes)
+timeout = int(os.getenv("WORKER_TIMEOUT", "120"))
+# Connexions persistantes avec nginx : plus long que son keepalive_timeout amont (60 s)
+keepalive = int(os.getenv("KEEPALIVE_TIMEOUT", "75"))
+
+# En-têtes X-Forwarded-* acceptés de ces adresses seulement (nginx ; sous-réseau du docker-compose) :
+# un client joignant directement le port ne peut pas choisir son adresse
+forwarded_allow_ips = os.getenv("FORWARDED_ALLOW_IPS", "127.0.0.1")
+accesslog = os.getenv("ACCESS_LOG") or None
+loglevel = os.getenv("LOG_LEVEL", "INFO").lower()
+
+# Modules lourds importés une fois dans le maître, partagés par tous les workers
+PRELOAD_MODULES = ("PyPDF2", "pdf2image", "PIL.Image", "groq")
+
+
+# Lus par l'application à son import : fixés avant le préchargement (valeurs explicites conservées)
+if workers > 1:
+    # Processus d'extraction et tesseract : environ un par cœur pour l'ensemble des workers
+    os.environ.setdefault("EXTRACTION_WORKERS", str(max(1, CPU_COUNT // workers)))
+    os.environ.setdefault("OCR_CONCURRENCY", str(max(1, CPU_COUNT // workers)))
+
+# Une tâche créée par un worker doit être lisible par les autres (GET /api/jobs/{id})
+# et survivre au recyclage ou au redémarrage de son worker, même seul
+os.environ.setdefault("JOB_STORE", "sqlite")
+
+# Métriques Prometheus agrégées entre workers (répertoire partagé, vidé au démarrage du maître)
+os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", os.path.join(tempfile.gettempdir(), "pfa-cv-prometheus"))
+os.makedirs(os.environ["PROMETHEUS_MULTIPROC_DIR"], exist_ok=True)
+
+
+def on_starting(server):
+    # Appelé une fois, après le préchargement et avant le premier worker (pas au rechargement SIGHUP)
+    metrics_dir = os.environ["PROMETHEUS_MULTIPROC_DIR"]
+    for entry in os.listdir(metrics_dir):
+        os.remove(os.path.join(metrics_dir, entry))
+
+    if os.getenv("JOB_STORE") == "memory":
+        server.log.warning("JOB_STORE=memory : une tâche n'est visible que du worker qui l'a créée et perdue à son recyclage")
+    if workers > 1:
+        if os.getenv("RATE_LIMIT_STORAGE", "memory://").startswith("memory"):
+            server.log.warning("RATE_LIMIT_STORAGE en mémoire : limites de débit comptées par worker (redis:// pour les partager)")
+        for quota in ("LLM_REQUESTS_PER_MINUTE", "LLM_TOKENS_PER_MINUTE"):
+            if int(os.getenv(quota, "0")) > 0:
+                server.log.warning("%s est compté par worker : quota effectif x%s", quota, workers)
+
+    if not preload_app:
+        return
+    for name in PRELOAD_MODULES:
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            pass
+
+
+def child_exit(server, worker):
+    # Mesures d'un worker arrêté : retirées des jauges « livesum », conservées pour les compteurs
+    try:
+        from prometheus_client import multiprocess
+    except ImportError:
+        return
+    multiprocess.mark_process_dead(worker.pid)
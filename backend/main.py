@@ -4,12 +4,27 @@ from dotenv import load_dotenv
 # Load environment variables from backend/.env
 load_dotenv(Path(__file__).resolve().parent / ".env")
 
-from fastapi import FastAPI
+from backend.utils.logging_config import RequestIdMiddleware, setup_logging
+from backend.utils import tracing
+
+# Logs JSON sur stdout (LOG_LEVEL, LOG_FORMAT) et traces (OTEL_TRACES_EXPORTER) avant tout import de service
+setup_logging()
+tracing.setup_tracing()
+
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 
 from backend.main_api import router as api_router
 from backend.api.cv_controller import router as cv_router
+from backend.api.job_controller import router as job_router
+from backend.services.llm_providers import close_client
+from backend.services.pipeline import warm_up
+from backend.services.worker_pool import shutdown_pool
+from backend.services.job_service import start_workers, stop_workers
+from backend.api.limiter import install as install_limiter
+from backend.utils.uploads import install as install_uploads
+from backend.utils import metrics
 
 app = FastAPI(
     title="pfa-cv",
@@ -33,12 +48,26 @@ app.add_middleware(
         "http://127.0.0.1:3004",
         "http://localhost:8080",
         "http://127.0.0.1:8080",
+        "https://talentflow-frontend-indol.vercel.app",
+        "https://*.vercel.app",
     ],
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
 )
 
+# -------------------- Traces OpenTelemetry (un span par requête, parent des spans du pipeline) --------------------
+tracing.instrument_app(app)
+
+# -------------------- Identifiant de requête (X-Request-ID, repris dans les logs) --------------------
+app.add_middleware(RequestIdMiddleware)
+
+# -------------------- Limites de débit et admission (429/503) --------------------
+install_limiter(app)
+
+# -------------------- Taille des uploads (413 dès l'en-tête, avant lecture du formulaire) --------------------
+install_uploads(app)
+
 # -------------------- Static files (optional) --------------------
 static_dir = Path("static")
 if static_dir.exists():
@@ -47,6 +76,25 @@ if static_dir.exists():
 # -------------------- Routers --------------------
 app.include_router(api_router)
 app.include_router(cv_router)
+app.include_router(job_router)
+
+# -------------------- Lifecycle --------------------
+@app.on_event("startup")
+async def startup():
+    # Workers des analyses asynchrones (reprise des tâches non terminées)
+    await start_workers()
+    # Préchargement optionnel (WARMUP) : sinon SDK LLM et pile PDF/OCR sont importés à la première requête
+    await warm_up()
+
+@app.on_event("shutdown")
+async def shutdown():
+    await stop_workers()
+    # Libérer le pool de connexions HTTP partagé du client LLM
+    await close_client()
+    # Arrêter le pool d'extraction OCR/PDF
+    shutdown_pool()
+    # Exporter les derniers spans
+    tracing.flush()
 
 # -------------------- Health & Root --------------------
 @app.get("/")
@@ -61,3 +109,9 @@ def root():
 @app.get("/api/health")
 def health():
     return {"status": "ok"}
+
+@app.get("/metrics", include_in_schema=False)
+def prometheus_metrics():
+    # Non exposé par nginx (seuls /api/ et /docs sont relayés) : à scraper en direct sur le port 8001
+    content, content_type = metrics.render()
+    return Response(content=content, media_type=content_type)
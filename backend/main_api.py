@@ -1,22 +1,46 @@
-from fastapi import APIRouter, File, UploadFile, HTTPException
-
-from backend.services.pdf_service import extract_text_from_file
-from backend.services.llm_service import analyze_cv
-from backend.utils.cleaner import clean_cv_text
+from typing import List, Literal, Optional
+
+from fastapi import APIRouter, File, Form, Query, Request, UploadFile, HTTPException
+
+from backend.services.pipeline import analyze_file
+from backend.services.worker_pool import extraction_gate
+from backend.services.admission import ServiceOverloaded, llm_gate
+from backend.services.validation_service import InvalidDocument
+from backend.services.llm_providers import provider_states
+from backend.services.batch_service import (
+    analyze_batch, expand_zip, BATCH_MAX_ARCHIVE_SIZE, BATCH_MAX_FILES, BATCH_MAX_TOTAL_SIZE, BATCH_LLM_CONCURRENCY,
+)
+from backend.api.limiter import limiter, analyze_limit, RATE_LIMIT_BATCH
+from backend.utils.metrics import timed
+from backend.utils.uploads import MAX_FILE_SIZE, UploadTooLarge, read_upload
 
 router = APIRouter(prefix="/api", tags=["cv"])
 
-ALLOWED_EXTENSIONS = {".pdf", ".png", ".jpg", ".jpeg"}
-MAX_FILE_SIZE = 10 * 1024 * 1024  # 10 MB
+ALLOWED_EXTENSIONS = {".pdf", ".png", ".jpg", ".jpeg", ".tif", ".tiff"}
 
 
 @router.get("/health")
 def health():
-    return {"status": "ok", "service": "pfa-cv"}
+    # État des fournisseurs LLM : disjoncteur ouvert = service dégradé
+    llm = provider_states()
+    degraded = any(state["breaker"]["state"] != "closed" for state in llm.values())
+    return {
+        "status": "degraded" if degraded else "ok",
+        "service": "pfa-cv",
+        "llm": llm,
+        "admission": {"extraction": extraction_gate.state(), "llm": llm_gate.state()},
+    }
 
 
 @router.post("/analyze")
-async def analyze_cv_endpoint(file: UploadFile = File(...)):
+@limiter.limit(analyze_limit)
+async def analyze_cv_endpoint(
+    request: Request,
+    file: UploadFile = File(...),
+    mode: Optional[Literal["fast", "llm", "hybrid"]] = Query(None),
+    provider: Optional[Literal["groq", "openai", "stub"]] = Query(None),
+    model: Optional[str] = Query(None),
+):
     if not file.filename:
         raise HTTPException(400, "Aucun fichier fourni")
 
@@ -27,34 +51,103 @@ async def analyze_cv_endpoint(file: UploadFile = File(...)):
             f"Type de fichier non accepté. Autorisés: {', '.join(ALLOWED_EXTENSIONS)}",
         )
 
-    content = await file.read()
-    if len(content) > MAX_FILE_SIZE:
-        raise HTTPException(400, "Fichier trop volumineux (max 10 Mo)")
-
-    # Reconstruct a minimal file-like for extract_text_from_file (it uses .file.read() and .filename)
-    class FileLike:
-        def __init__(self, data: bytes, filename: str):
-            self._data = data
-            self.filename = filename
+    # Lecture unique, refusée (413) avant copie si le fichier dépasse MAX_FILE_SIZE
+    with timed("upload_read"):
+        content = await read_upload(file)
 
-        @property
-        def file(self):
-            import io
-            return io.BytesIO(self._data)
-
-    file_like = FileLike(content, file.filename)
+    # Pipeline complet (cache, type réel, extraction dans le pool de workers, IA)
     try:
-        raw_text = extract_text_from_file(file_like)
+        result = await analyze_file(file.filename, content, mode, provider, model)
+    except InvalidDocument as e:
+        raise HTTPException(e.status_code, str(e))
+    except ServiceOverloaded:
+        raise
     except Exception as e:
         raise HTTPException(500, f"Erreur lors de l'extraction du texte: {str(e)}")
 
-    if not raw_text or not raw_text.strip():
-        raise HTTPException(400, "Aucun texte extrait du document. Vérifiez que le fichier est lisible (PDF avec texte ou image claire).")
-
-    cleaned_text = clean_cv_text(raw_text)
-    result = await analyze_cv(cleaned_text)
-
     if "error" in result:
         raise HTTPException(502, result["error"])
-
     return result
+
+
+def _extension(filename: str) -> str:
+    return "." + filename.rsplit(".", 1)[-1].lower() if "." in filename else ""
+
+
+@router.post("/analyze/batch")
+@limiter.limit(RATE_LIMIT_BATCH)
+async def analyze_batch_endpoint(
+    request: Request,
+    files: List[UploadFile] = File(...),
+    llm_concurrency: Optional[int] = Form(None),
+    mode: Optional[Literal["fast", "llm", "hybrid"]] = Query(None),
+    provider: Optional[Literal["groq", "openai", "stub"]] = Query(None),
+    model: Optional[str] = Query(None),
+):
+    """
+    Analyse par lot : plusieurs fichiers et/ou archives ZIP.
+    Retourne un résultat par fichier, dans l'ordre d'envoi (entrées d'une archive à sa place) ;
+    les erreurs individuelles n'échouent pas le lot.
+    """
+    results = []  # un emplacement par fichier : rejet immédiat, ou None en attente d'analyse
+    documents = []
+    positions = []
+    # Octets gardés en mémoire pour le lot (fichiers lus et entrées ZIP décompressées)
+    remaining = BATCH_MAX_TOTAL_SIZE
+
+    for upload in files:
+        filename = upload.filename or ""
+        is_zip = _extension(filename) == ".zip"
+        max_size = BATCH_MAX_ARCHIVE_SIZE if is_zip else MAX_FILE_SIZE
+        try:
+            with timed("upload_read"):
+                content = await read_upload(upload, min(max_size, remaining))
+        except UploadTooLarge as e:
+            if remaining < max_size:
+                # Budget mémoire du lot dépassé : tout le lot est refusé (413)
+                raise UploadTooLarge(BATCH_MAX_TOTAL_SIZE)
+            if is_zip:
+                raise
+            # Fichier isolé trop volumineux : rejeté sans être lu, le reste du lot continue
+            results.append({"filename": filename, "status": "error", "error": str(e)})
+            continue
+
+        if is_zip:
+            try:
+                entries = expand_zip(content, BATCH_MAX_FILES, MAX_FILE_SIZE, remaining)
+            except Exception as e:
+                raise HTTPException(400, f"Archive ZIP invalide ({filename}): {str(e)}")
+            del content  # archive lue : seules les entrées décompressées restent en mémoire
+        else:
+            entries = [(filename, content, None)]
+
+        for name, data, error in entries:
+            if error is None and _extension(name) not in ALLOWED_EXTENSIONS:
+                error = "Type de fichier non accepté"
+            elif error is None and len(data) > MAX_FILE_SIZE:
+                error = str(UploadTooLarge(MAX_FILE_SIZE))
+
+            if error:
+                results.append({"filename": name, "status": "error", "error": error})
+            else:
+                remaining -= len(data)
+                positions.append(len(results))
+                results.append(None)
+                documents.append((name, data))
+
+        if len(results) > BATCH_MAX_FILES:
+            raise HTTPException(400, f"Trop de fichiers dans le lot (max {BATCH_MAX_FILES})")
+
+    # Ne jamais dépasser la limite configurée d'appels Groq simultanés
+    concurrency = min(llm_concurrency or BATCH_LLM_CONCURRENCY, BATCH_LLM_CONCURRENCY)
+    analysed = await analyze_batch(documents, llm_concurrency=concurrency, mode=mode, provider=provider, model=model)
+    for position, item in zip(positions, analysed):
+        results[position] = item
+
+    succeeded = sum(1 for item in results if item["status"] == "ok")
+    return {
+        "count": len(results),
+        "succeeded": succeeded,
+        "failed": len(results) - succeeded,
+        "results": results,
+    }
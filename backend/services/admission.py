@@ -0,0 +1,77 @@
+import asyncio
+import os
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Dict, Optional
+
+from backend.utils.metrics import IN_FLIGHT
+
+# Contrôle d'admission global (surchargé via l'environnement ; 0 = illimité)
+LLM_MAX_IN_FLIGHT = int(os.getenv("LLM_MAX_IN_FLIGHT", "32"))  # appels LLM en cours ou en file d'attente
+ADMISSION_RETRY_AFTER = int(os.getenv("ADMISSION_RETRY_AFTER", "5"))  # Retry-After des réponses 503 (secondes)
+
+# Travail d'arrière-plan (tâches /api/jobs) : attend une place au lieu d'être rejeté
+_background: ContextVar[bool] = ContextVar("admission_background", default=False)
+
+
+class ServiceOverloaded(Exception):
+    """
+    Capacité saturée : la requête est rejetée immédiatement (HTTP 503 avec Retry-After)
+    """
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after if retry_after is not None else ADMISSION_RETRY_AFTER
+
+
+@contextmanager
+def background():
+    """
+    Les portes d'admission franchies dans ce contexte attendent une place au lieu de rejeter
+    """
+    token = _background.set(True)
+    try:
+        yield
+    finally:
+        _background.reset(token)
+
+
+class AdmissionGate:
+    """
+    Borne le nombre de traitements simultanés d'un type (extraction, appel LLM) ;
+    au-delà, rejet immédiat plutôt qu'une file qui allonge la latence de tous
+    """
+
+    def __init__(self, name: str, limit: int, error: type = ServiceOverloaded):
+        self.name = name
+        self.limit = limit
+        self.error = error
+        self.in_flight = 0
+        self.rejected = 0
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    @asynccontextmanager
+    async def admit(self) -> AsyncIterator[None]:
+        if self.limit <= 0:
+            yield
+            return
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.limit)
+        if self._slots.locked() and not _background.get():
+            self.rejected += 1
+            raise self.error(f"Capacité {self.name} saturée, réessayez plus tard")
+
+        async with self._slots:
+            self.in_flight += 1
+            IN_FLIGHT.labels(self.name.lower()).inc()
+            try:
+                yield
+            finally:
+                self.in_flight -= 1
+                IN_FLIGHT.labels(self.name.lower()).dec()
+
+    def state(self) -> Dict[str, Any]:
+        return {"in_flight": self.in_flight, "limit": self.limit, "rejected": self.rejected}
+
+
+llm_gate = AdmissionGate("LLM", LLM_MAX_IN_FLIGHT)
@@ -0,0 +1,97 @@
+import asyncio
+import io
+import os
+import zipfile
+from typing import Any, Dict, List, Optional, Tuple
+
+from backend.services.pipeline import analyze_file, document_pipeline
+from backend.services.worker_pool import EXTRACTION_WORKERS
+
+# Limites du traitement par lot (surchargées via l'environnement)
+BATCH_MAX_FILES = int(os.getenv("BATCH_MAX_FILES", "200"))
+BATCH_LLM_CONCURRENCY = int(os.getenv("BATCH_LLM_CONCURRENCY", "4"))  # appels Groq simultanés max
+BATCH_EXTRACTION_CONCURRENCY = int(os.getenv("BATCH_EXTRACTION_CONCURRENCY", str(EXTRACTION_WORKERS)))
+BATCH_MAX_ARCHIVE_SIZE = int(os.getenv("BATCH_MAX_ARCHIVE_SIZE", str(100 * 1024 * 1024)))  # taille max d'une archive ZIP
+# Octets de documents gardés en mémoire pour un lot : fichiers reçus et entrées ZIP décompressées
+BATCH_MAX_TOTAL_SIZE = int(os.getenv("BATCH_MAX_TOTAL_SIZE", str(100 * 1024 * 1024)))
+
+
+def expand_zip(
+    content: bytes, max_entries: int, max_entry_size: int, max_total_size: int = BATCH_MAX_TOTAL_SIZE,
+) -> List[Tuple[str, Optional[bytes], Optional[str]]]:
+    """
+    Décompresse une archive ZIP de CV.
+    Retourne [(nom, contenu, erreur)] : le contenu est None si l'entrée est rejetée.
+    Lève ValueError si l'archive dépasse `max_entries` fichiers ou `max_total_size` octets décompressés.
+    """
+    documents = []
+    total_size = 0
+    with zipfile.ZipFile(io.BytesIO(content)) as archive:
+        for info in archive.infolist():
+            # Ignorer dossiers et métadonnées macOS
+            if info.is_dir() or info.filename.startswith("__MACOSX/") or os.path.basename(info.filename).startswith("."):
+                continue
+            if len(documents) >= max_entries:
+                raise ValueError(f"Archive trop volumineuse (max {max_entries} fichiers)")
+            name = os.path.basename(info.filename)
+            # Taille déclarée vérifiée avant décompression (protection contre les bombes ZIP)
+            if info.file_size > max_entry_size:
+                documents.append((name, None, "Fichier trop volumineux"))
+                continue
+            # zipfile ne produit jamais plus que la taille déclarée : budget vérifié avant lecture
+            total_size += info.file_size
+            if total_size > max_total_size:
+                raise ValueError(f"Archive trop volumineuse une fois décompressée (max {max_total_size // (1024 * 1024)} Mo)")
+            documents.append((name, archive.read(info), None))
+    return documents
+
+
+async def analyze_document(
+    filename: str,
+    content: bytes,
+    extraction_slots: Optional[asyncio.Semaphore] = None,
+    llm_slots: Optional[asyncio.Semaphore] = None,
+    mode: Optional[str] = None,
+    provider: Optional[str] = None,
+    model: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Analyse complète d'un fichier (cache, extraction, nettoyage, IA).
+    Retourne {"filename", "status": "ok", "result"} ou {"filename", "status": "error", "error"}.
+    """
+    # Étapes d'extraction et d'analyse IA bornées par les sémaphores du lot
+    pipeline = document_pipeline
+    if extraction_slots is not None:
+        pipeline = pipeline.limit("extract", extraction_slots)
+    if llm_slots is not None:
+        pipeline = pipeline.limit("analyze", llm_slots)
+
+    try:
+        result = await analyze_file(filename, content, mode, provider, model, pipeline)
+        if "error" in result:
+            return {"filename": filename, "status": "error", "error": result["error"]}
+        return {"filename": filename, "status": "ok", "result": result}
+
+    except Exception as e:
+        return {"filename": filename, "status": "error", "error": str(e)}
+
+
+async def analyze_batch(
+    documents: List[Tuple[str, bytes]],
+    llm_concurrency: int = BATCH_LLM_CONCURRENCY,
+    mode: Optional[str] = None,
+    provider: Optional[str] = None,
+    model: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Analyse un lot de fichiers en pipeline concurrent borné :
+    extraction (pool de workers) puis analyse IA (au plus `llm_concurrency` appels simultanés).
+    Une erreur sur un fichier n'interrompt pas le lot ; l'ordre des résultats suit l'entrée.
+    """
+    extraction_slots = asyncio.Semaphore(BATCH_EXTRACTION_CONCURRENCY)
+    llm_slots = asyncio.Semaphore(max(1, llm_concurrency))
+
+    return await asyncio.gather(*(
+        analyze_document(filename, content, extraction_slots, llm_slots, mode, provider, model)
+        for filename, content in documents
+    ))
@@ -0,0 +1,247 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional
+
+from backend.utils.metrics import CACHE_LOOKUPS
+
+# Configuration du cache (surchargée via l'environnement)
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory")  # memory | sqlite | none
+CACHE_TTL = int(os.getenv("CACHE_TTL", str(7 * 24 * 3600)))  # secondes
+CACHE_MAX_BYTES = int(os.getenv("CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+CACHE_PATH = os.getenv("CACHE_PATH", "cv_cache.sqlite3")
+
+logger = logging.getLogger(__name__)
+
+
+def hash_bytes(content: bytes, namespace: str = "") -> str:
+    """
+    Clé de cache pour le contenu brut d'un fichier téléversé
+    (namespace : "fournisseur/modèle" ayant produit le résultat)
+    """
+    digest = hashlib.sha256(namespace.encode("utf-8") + b"\0")
+    digest.update(content)
+    return "file:" + digest.hexdigest()
+
+
+def hash_text(text: str, namespace: str = "") -> str:
+    """
+    Clé de cache pour le texte nettoyé envoyé à l'IA
+    """
+    return "text:" + hashlib.sha256(f"{namespace}\0{text}".encode("utf-8")).hexdigest()
+
+
+class CacheBackend:
+    """
+    Interface commune des backends de cache (valeurs = résultats JSON validés)
+    """
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        raise NotImplementedError
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+
+class NullCache(CacheBackend):
+    """
+    Cache désactivé
+    """
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        return None
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        pass
+
+    def clear(self) -> None:
+        pass
+
+
+class MemoryCache(CacheBackend):
+    """
+    Cache LRU en mémoire avec TTL et éviction par taille totale
+    """
+
+    def __init__(self, ttl: int = CACHE_TTL, max_bytes: int = CACHE_MAX_BYTES):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (expires_at, size, payload)
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, size, payload = entry
+            if expires_at < time.time():
+                del self._entries[key]
+                self._size -= size
+                return None
+            self._entries.move_to_end(key)
+        return json.loads(payload)
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        payload = json.dumps(value, ensure_ascii=False)
+        size = len(payload.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._size -= old[1]
+            self._entries[key] = (time.time() + self.ttl, size, payload)
+            self._size += size
+
+            # Éviction LRU jusqu'à respecter la taille maximale
+            while self._size > self.max_bytes:
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self._size -= evicted_size
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+
+class SQLiteCache(CacheBackend):
+    """
+    Cache persistant sur disque (SQLite) avec TTL et éviction LRU par taille totale
+    """
+
+    def __init__(self, path: str = CACHE_PATH, ttl: int = CACHE_TTL, max_bytes: int = CACHE_MAX_BYTES):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._path = path
+        self._pid = os.getpid()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS cv_cache (
+                key TEXT PRIMARY KEY,
+                payload TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                expires_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_cv_cache_access ON cv_cache(last_access)")
+        self._conn.commit()
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        # Une connexion par processus : un worker gunicorn forké après le préchargement
+        # ne doit pas réutiliser celle du processus maître
+        if self._pid != os.getpid():
+            self._connection = sqlite3.connect(self._path, check_same_thread=False)
+            self._pid = os.getpid()
+        return self._connection
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload, expires_at FROM cv_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] < now:
+                self._conn.execute("DELETE FROM cv_cache WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+            self._conn.execute("UPDATE cv_cache SET last_access = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+        return json.loads(row[0])
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        payload = json.dumps(value, ensure_ascii=False)
+        size = len(payload.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cv_cache (key, payload, size, expires_at, last_access) VALUES (?, ?, ?, ?, ?)",
+                (key, payload, size, now + self.ttl, now),
+            )
+            self._conn.execute("DELETE FROM cv_cache WHERE expires_at < ?", (now,))
+
+            # Éviction des entrées les moins récemment utilisées au-delà de la taille maximale
+            total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM cv_cache").fetchone()[0]
+            if total > self.max_bytes:
+                rows = self._conn.execute("SELECT key, size FROM cv_cache ORDER BY last_access ASC").fetchall()
+                for evict_key, evict_size in rows:
+                    if total <= self.max_bytes:
+                        break
+                    self._conn.execute("DELETE FROM cv_cache WHERE key = ?", (evict_key,))
+                    total -= evict_size
+            self._conn.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM cv_cache")
+            self._conn.commit()
+
+
+def _build_cache() -> CacheBackend:
+    """
+    Construit le backend de cache configuré
+    """
+    if CACHE_BACKEND == "none":
+        return NullCache()
+    if CACHE_BACKEND == "sqlite":
+        try:
+            return SQLiteCache()
+        except Exception as e:
+            logger.error("Cache SQLite indisponible, repli en mémoire: %s", e)
+    return MemoryCache()
+
+
+cache = _build_cache()
+
+
+def get_cached_result(key: str) -> Optional[Dict[str, Any]]:
+    """
+    Retourne le résultat en cache (marqué from_cache) ou None
+    """
+    level = key.split(":", 1)[0]  # file | text
+    try:
+        result = cache.get(key)
+    except Exception as e:
+        logger.warning("Erreur lecture cache: %s", e)
+        return None
+    if result is None:
+        CACHE_LOOKUPS.labels(level, "miss").inc()
+        return None
+    CACHE_LOOKUPS.labels(level, "hit").inc()
+    result["from_cache"] = True
+    return result
+
+
+def store_result(key: str, result: Dict[str, Any]) -> None:
+    """
+    Met en cache un résultat d'analyse IA réussi
+    (ni les erreurs ni les extractions locales, peu coûteuses, ne sont mises en cache)
+    """
+    if "error" in result or result.get("extraction_method") == "heuristic":
+        return
+    value = {k: v for k, v in result.items() if k != "from_cache"}
+    try:
+        cache.set(key, value)
+    except Exception as e:
+        logger.warning("Erreur écriture cache: %s", e)
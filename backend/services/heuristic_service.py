@@ -0,0 +1,208 @@
+import os
+import re
+from typing import Any, Dict, List
+
+from backend.utils.compactor import section_of
+
+# Seuil de confiance au-delà duquel le résultat local est retourné sans appel IA (mode hybrid) ;
+# un nom dont l'ordre nom/prénom est incertain plafonne la confiance à 0.85 : toujours vérifié par l'IA
+FAST_PATH_MIN_CONFIDENCE = float(os.getenv("FAST_PATH_MIN_CONFIDENCE", "0.9"))
+
+# Motifs précompilés (partagés avec llm_service)
+EMAIL_RE = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+PHONE_RE = re.compile(r'(\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}')
+FR_PHONE_RE = re.compile(r'(?:\+33\s?|0)[1-9](?:[\s.-]?\d{2}){4}')
+
+_YEAR = r"(?:19|20)\d{2}"
+_PERIOD_RE = re.compile(
+    rf"((?:\d{{1,2}}/)?{_YEAR}\s*(?:[-–—]|à|au|to)\s*(?:(?:\d{{1,2}}/)?{_YEAR}|pr[ée]sent|aujourd'hui|actuel(?:lement)?|now|present)|{_YEAR})",
+    re.IGNORECASE,
+)
+_COMPANY_RE = re.compile(r"\b(?:chez|at|@)\s+([A-Z0-9][\w&.\- ]{1,60}?)(?=[.,;(|]|$|\s+(?:à|en|depuis|utilisation)\b)")
+_DIPLOMA_RE = re.compile(
+    r"\b(master|licence|bachelor|doctorat|ph\.?d|mba|dut|bts|deug|dea|dess|bac(?:calaur[ée]at)?(?:\s*\+\s*\d)?|"
+    r"dipl[ôo]me d'ing[ée]nieur|cycle ing[ée]nieur|ing[ée]nieur)\b[^,\n\-–(]*",
+    re.IGNORECASE,
+)
+_SCHOOL_RE = re.compile(
+    r"\b(universit[ée]|university|[ée]cole|school|institut|institute|facult[ée]|lyc[ée]e|ensa|encg|emi|insa|fst)\b[^,\n\-–(]*",
+    re.IGNORECASE,
+)
+_NAME_TOKEN_RE = re.compile(r"^[A-Za-zÀ-ÖØ-öø-ÿ][A-Za-zÀ-ÖØ-öø-ÿ'\-]+$")
+_NAME_LINE_LABEL_RE = re.compile(r"^(nom|name)\s*[:\-]\s*", re.IGNORECASE)
+# Champs étiquetés sur des lignes distinctes : « Nom : Dupont », « Prénom : Jean »
+_NAME_FIELD_RE = re.compile(
+    r"^(nom(?: de famille)?|last name|surname|pr[ée]nom|first name)\s*:\s*([A-Za-zÀ-ÖØ-öø-ÿ'\- ]+)$", re.IGNORECASE
+)
+
+# Dictionnaire de compétences (forme affichée) ; une seule alternative précompilée
+SKILLS = [
+    "Python", "Java", "JavaScript", "TypeScript", "C", "C++", "C#", "PHP", "Ruby", "Go", "Rust", "Kotlin", "Swift",
+    "Scala", "R", "MATLAB", "SQL", "NoSQL", "PostgreSQL", "MySQL", "MongoDB", "Oracle", "Redis", "Elasticsearch",
+    "HTML", "CSS", "React", "Angular", "Vue.js", "Node.js", "Express", "Django", "Flask", "FastAPI", "Spring",
+    "Spring Boot", "Laravel", "Symfony", ".NET", "Docker", "Kubernetes", "Git", "Jenkins", "CI/CD", "Linux",
+    "AWS", "Azure", "GCP", "Terraform", "Ansible", "Kafka", "Spark", "Hadoop", "Pandas", "NumPy",
+    "TensorFlow", "PyTorch", "Scikit-learn", "Machine Learning", "Deep Learning", "NLP", "Power BI", "Tableau",
+    "Excel", "UML", "Agile", "Scrum", "Jira", "REST", "GraphQL", "Figma", "Photoshop", "SAP", "Salesforce",
+    "Anglais", "Français", "Arabe", "Espagnol", "Allemand", "English", "French",
+    "Gestion de projet", "Communication", "Travail en équipe", "Leadership",
+]
+# Noms courts homonymes d'une lettre ou d'un mot (« C'est », initiale « R. », « go ») : casse exacte,
+# entourés de séparateurs de liste, et non comptés dans la confiance
+_AMBIGUOUS_SKILLS = {"C", "R", "Go"}
+_SKILL_LOOKUP = {skill.lower(): skill for skill in SKILLS if skill not in _AMBIGUOUS_SKILLS}
+_SKILLS_RE = re.compile(
+    r"(?<![\w+#.])(" + "|".join(re.escape(skill) for skill in sorted(_SKILL_LOOKUP.values(), key=len, reverse=True))
+    + r")(?![\w+#])",
+    re.IGNORECASE,
+)
+_AMBIGUOUS_SKILLS_RE = re.compile(
+    r"(?<![^\s,;:/(|•·])(" + "|".join(sorted(_AMBIGUOUS_SKILLS, key=len, reverse=True)) + r")(?=[\s,;/|•·)]|$)",
+    re.MULTILINE,
+)
+
+# Mots exclus de la détection du nom (titres, mots-clés de CV)
+_NOT_NAME_WORDS = {
+    "curriculum", "vitae", "cv", "resume", "profil", "profile", "ingénieur", "ingenieur", "développeur",
+    "developpeur", "developer", "engineer", "étudiant", "etudiant", "stagiaire", "consultant", "manager",
+    "chef", "technicien", "analyste", "data", "web", "logiciel", "informatique", "contact", "email", "tel",
+}
+
+NOT_FOUND = "Non trouvé"
+
+
+def _split_sections(lines: List[str]) -> Dict[str, List[str]]:
+    """
+    Regroupe les lignes par section de CV ("entete" = avant le premier titre)
+    """
+    sections: Dict[str, List[str]] = {"entete": []}
+    current = "entete"
+    for line in lines:
+        name, _ = section_of(line)
+        if name:
+            current = name
+            sections.setdefault(current, [])
+        else:
+            sections[current].append(line)
+    return sections
+
+
+def _find_name(header: List[str]):
+    """
+    Nom et prénom : champs « Nom : » / « Prénom : » de l'en-tête, sinon première ligne formée
+    de 2 à 4 mots alphabétiques. Retourne (nom, prénom, ordre certain) : sans étiquettes ni nom
+    en majuscules, l'ordre « Prénom Nom » n'est qu'une supposition (« Dupont Jean » est inversé).
+    """
+    fields = {}
+    for line in header[:8]:
+        field = _NAME_FIELD_RE.match(line)
+        if field:
+            label = "prenom" if field.group(1).lower().startswith(("pr", "first")) else "nom"
+            fields.setdefault(label, field.group(2).strip())
+    if len(fields) == 2:
+        return fields["nom"], fields["prenom"], True
+
+    for line in header[:8]:
+        candidate = _NAME_LINE_LABEL_RE.sub("", line.split("|")[0].split(" - ")[0]).strip()
+        tokens = candidate.split()
+        if not 2 <= len(tokens) <= 4:
+            continue
+        if not all(_NAME_TOKEN_RE.match(token) for token in tokens):
+            continue
+        if any(token.lower() in _NOT_NAME_WORDS for token in tokens):
+            continue
+        # Un mot en majuscules est le nom de famille (convention française)
+        upper = [token for token in tokens if token.isupper() and len(token) > 1]
+        if upper and len(upper) < len(tokens):
+            nom = " ".join(upper)
+            prenom = " ".join(token for token in tokens if token not in upper)
+            return nom, prenom, True
+        prenom, nom = tokens[0], " ".join(tokens[1:])
+        return nom, prenom, False
+    return NOT_FOUND, NOT_FOUND, False
+
+
+def _find_experiences(lines: List[str]) -> List[Dict[str, str]]:
+    experiences = []
+    for line in lines:
+        period = _PERIOD_RE.search(line)
+        if not period:
+            continue
+        company = _COMPANY_RE.search(line, period.end())
+        # Poste : texte entre la période et l'entreprise (ou jusqu'à la fin de la phrase)
+        end = company.start() if company else len(line)
+        poste = line[period.end():end].split(".")[0].strip(" :-–—|,")
+        experiences.append({
+            "entreprise": company.group(1).strip() if company else NOT_FOUND,
+            "poste": poste or NOT_FOUND,
+            "duree": period.group(1),
+        })
+    return experiences
+
+
+def _find_formations(lines: List[str]) -> List[Dict[str, str]]:
+    formations = []
+    for line in lines:
+        diploma = _DIPLOMA_RE.search(line)
+        school = _SCHOOL_RE.search(line)
+        if not diploma and not school:
+            continue
+        year = _PERIOD_RE.search(line)
+        formations.append({
+            "ecole": school.group(0).strip(" ,.-–") if school else NOT_FOUND,
+            "diplome": diploma.group(0).strip(" ,.-–") if diploma else NOT_FOUND,
+            "annee": year.group(1) if year else NOT_FOUND,
+        })
+    return formations
+
+
+def _find_skills(text: str) -> List[str]:
+    skills = []
+    seen = set()
+    # Ordre d'apparition dans le texte, tous motifs confondus
+    matches = sorted([*_SKILLS_RE.finditer(text), *_AMBIGUOUS_SKILLS_RE.finditer(text)], key=lambda match: match.start())
+    for match in matches:
+        skill = _SKILL_LOOKUP.get(match.group(1).lower(), match.group(1))
+        if skill not in seen:
+            seen.add(skill)
+            skills.append(skill)
+    return skills
+
+
+def extract_cv_fields(text: str) -> Dict[str, Any]:
+    """
+    Extraction locale déterministe (motifs précompilés + dictionnaire de compétences),
+    au format du résultat IA validé, avec un score de confiance entre 0 et 1.
+    """
+    lines = [line.strip() for line in text.splitlines() if line.strip()]
+    sections = _split_sections(lines)
+
+    email = EMAIL_RE.search(text)
+    phone = FR_PHONE_RE.search(text) or PHONE_RE.search(text)
+    nom, prenom, name_certain = _find_name(sections["entete"])
+    experiences = _find_experiences(sections.get("experiences", []))
+    formations = _find_formations(sections.get("formations", []))
+    # Compétences : section dédiée si présente, sinon tout le texte
+    competences = _find_skills("\n".join(sections.get("competences", [])) or text)
+
+    confidence = (
+        0.15 * bool(email)
+        + 0.10 * bool(phone)
+        # Nom compté seulement si l'ordre nom/prénom est certain (sinon l'IA tranche en mode hybrid)
+        + 0.15 * name_certain
+        + 0.25 * bool(experiences)
+        + 0.15 * bool(formations)
+        + 0.20 * min(sum(skill not in _AMBIGUOUS_SKILLS for skill in competences), 3) / 3
+    )
+
+    return {
+        "nom": nom,
+        "prenom": prenom,
+        "email": email.group(0) if email else NOT_FOUND,
+        "telephone": phone.group(0).strip() if phone else NOT_FOUND,
+        "competences": competences,
+        "experiences": experiences,
+        "formations": formations,
+        "extraction_method": "heuristic",
+        "confidence": round(confidence, 2),
+    }
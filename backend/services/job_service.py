@@ -0,0 +1,511 @@
+import asyncio
+import ipaddress
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Set
+from urllib.parse import urlsplit
+
+from backend.services.admission import background
+from backend.services.batch_service import analyze_document
+
+# Configuration des tâches asynchrones (surchargée via l'environnement)
+JOB_STORE = os.getenv("JOB_STORE", "memory")  # memory | sqlite
+JOB_DB_PATH = os.getenv("JOB_DB_PATH", "cv_jobs.sqlite3")
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+JOB_WEBHOOK_TIMEOUT = float(os.getenv("JOB_WEBHOOK_TIMEOUT", "10"))
+JOB_WEBHOOK_RETRIES = int(os.getenv("JOB_WEBHOOK_RETRIES", "3"))
+# Hôtes de webhook autorisés, séparés par des virgules (vide : tout hôte dont les adresses sont publiques)
+JOB_WEBHOOK_ALLOWED_HOSTS = {
+    host.strip().lower() for host in os.getenv("JOB_WEBHOOK_ALLOWED_HOSTS", "").split(",") if host.strip()
+}
+# Tâches terminées (résultat complet) conservées au plus JOB_RESULT_TTL secondes et au nombre de JOB_MAX_FINISHED
+JOB_RESULT_TTL = int(os.getenv("JOB_RESULT_TTL", str(24 * 3600)))
+JOB_MAX_FINISHED = int(os.getenv("JOB_MAX_FINISHED", "1000"))
+# Arrêt : délai laissé aux tâches en cours avant de les rendre aux autres processus (secondes)
+JOB_DRAIN_TIMEOUT = float(os.getenv("JOB_DRAIN_TIMEOUT", "20"))
+
+logger = logging.getLogger(__name__)
+
+# Statuts d'une tâche
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "error"
+
+
+class JobStore:
+    """
+    Interface de stockage de l'état des tâches d'analyse
+    """
+
+    def create(self, filename: str, content: bytes, webhook_url: Optional[str]) -> str:
+        raise NotImplementedError
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        raise NotImplementedError
+
+    def get_content(self, job_id: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    def update(self, job_id: str, status: str, result: Optional[Dict[str, Any]] = None, error: Optional[str] = None) -> None:
+        raise NotImplementedError
+
+    def unfinished(self) -> List[str]:
+        raise NotImplementedError
+
+    def claim(self, job_id: str) -> bool:
+        """
+        Passe une tâche en « running » pour ce processus ; False si elle est terminée
+        ou déjà traitée par un autre processus vivant
+        """
+        raise NotImplementedError
+
+    def release(self, job_id: str) -> None:
+        """
+        Remet en attente une tâche interrompue par l'arrêt de ce processus
+        """
+        raise NotImplementedError
+
+
+def _process_alive(pid: Optional[int]) -> bool:
+    """
+    Processus (d'un autre worker, sur cet hôte) toujours en vie
+    """
+    if not pid or pid == os.getpid():
+        # Identifiant repris par ce processus : l'ancien propriétaire a disparu
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class MemoryJobStore(JobStore):
+    """
+    Stockage en mémoire (perdu au redémarrage) ; tâches terminées évincées par âge et par nombre
+    """
+
+    def __init__(self, ttl: int = JOB_RESULT_TTL, max_finished: int = JOB_MAX_FINISHED):
+        self.ttl = ttl
+        self.max_finished = max_finished
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._contents: Dict[str, bytes] = {}
+        self._finished: "OrderedDict[str, float]" = OrderedDict()  # job_id -> fin, plus anciennes en tête
+        self._lock = threading.Lock()
+
+    def create(self, filename: str, content: bytes, webhook_url: Optional[str]) -> str:
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._lock:
+            self._jobs[job_id] = {
+                "job_id": job_id,
+                "status": PENDING,
+                "filename": filename,
+                "webhook_url": webhook_url,
+                "result": None,
+                "error": None,
+                "created_at": now,
+                "updated_at": now,
+            }
+            self._contents[job_id] = content
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def get_content(self, job_id: str) -> Optional[bytes]:
+        with self._lock:
+            return self._contents.get(job_id)
+
+    def update(self, job_id: str, status: str, result: Optional[Dict[str, Any]] = None, error: Optional[str] = None) -> None:
+        now = time.time()
+        with self._lock:
+            job = self._jobs[job_id]
+            job.update(status=status, result=result, error=error, updated_at=now)
+            # Le fichier n'est plus nécessaire une fois la tâche terminée
+            if status in (DONE, FAILED):
+                self._contents.pop(job_id, None)
+                self._finished[job_id] = now
+                self._finished.move_to_end(job_id)
+
+            # Éviction des tâches terminées expirées ou au-delà du nombre maximal
+            while self._finished:
+                oldest, finished_at = next(iter(self._finished.items()))
+                if finished_at >= now - self.ttl and len(self._finished) <= self.max_finished:
+                    break
+                self._finished.popitem(last=False)
+                self._jobs.pop(oldest, None)
+
+    def unfinished(self) -> List[str]:
+        with self._lock:
+            return [job_id for job_id, job in self._jobs.items() if job["status"] in (PENDING, RUNNING)]
+
+    def claim(self, job_id: str) -> bool:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            # Stockage propre au processus : une tâche « running » est déjà traitée ici
+            if job is None or job["status"] != PENDING:
+                return False
+            job.update(status=RUNNING, updated_at=time.time())
+            return True
+
+    def release(self, job_id: str) -> None:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None and job["status"] == RUNNING:
+                job.update(status=PENDING, updated_at=time.time())
+
+
+class SQLiteJobStore(JobStore):
+    """
+    Stockage persistant SQLite : les tâches non terminées sont reprises au redémarrage ;
+    tâches terminées évincées par âge et par nombre
+    """
+
+    def __init__(self, path: str = JOB_DB_PATH, ttl: int = JOB_RESULT_TTL, max_finished: int = JOB_MAX_FINISHED):
+        self.ttl = ttl
+        self.max_finished = max_finished
+        self._lock = threading.Lock()
+        self._path = path
+        self._pid = os.getpid()
+        # Tâches obtenues par ce processus (distinctes d'une tâche laissée par un ancien processus de même pid)
+        self._claimed: Set[str] = set()
+        self._connection = self._connect()
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS cv_jobs (
+                job_id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                filename TEXT NOT NULL,
+                content BLOB,
+                webhook_url TEXT,
+                result TEXT,
+                error TEXT,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL,
+                worker INTEGER
+            )
+            """
+        )
+        # Base créée avant l'ajout du processus propriétaire (plusieurs workers)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(cv_jobs)")}
+        if "worker" not in columns:
+            try:
+                self._conn.execute("ALTER TABLE cv_jobs ADD COLUMN worker INTEGER")
+            except sqlite3.OperationalError:
+                pass  # ajoutée entre-temps par un autre worker
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_cv_jobs_status ON cv_jobs(status)")
+        self._conn.commit()
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self._path, check_same_thread=False, timeout=30)
+        connection.row_factory = sqlite3.Row
+        return connection
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        # Une connexion par processus : un worker gunicorn forké après le préchargement
+        # ne doit pas réutiliser celle du processus maître
+        if self._pid != os.getpid():
+            self._connection = self._connect()
+            self._pid = os.getpid()
+            self._claimed = set()
+        return self._connection
+
+    def create(self, filename: str, content: bytes, webhook_url: Optional[str]) -> str:
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO cv_jobs (job_id, status, filename, content, webhook_url, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (job_id, PENDING, filename, content, webhook_url, now, now),
+            )
+            self._conn.commit()
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT job_id, status, filename, webhook_url, result, error, created_at, updated_at "
+                "FROM cv_jobs WHERE job_id = ?",
+                (job_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
+
+    def get_content(self, job_id: str) -> Optional[bytes]:
+        with self._lock:
+            row = self._conn.execute("SELECT content FROM cv_jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return row[0] if row else None
+
+    def update(self, job_id: str, status: str, result: Optional[Dict[str, Any]] = None, error: Optional[str] = None) -> None:
+        payload = json.dumps(result, ensure_ascii=False) if result is not None else None
+        now = time.time()
+        with self._lock:
+            if status in (DONE, FAILED):
+                self._claimed.discard(job_id)
+                # Le fichier n'est plus nécessaire une fois la tâche terminée
+                self._conn.execute(
+                    "UPDATE cv_jobs SET status = ?, result = ?, error = ?, content = NULL, updated_at = ? WHERE job_id = ?",
+                    (status, payload, error, now, job_id),
+                )
+                # Éviction des tâches terminées expirées ou au-delà du nombre maximal
+                self._conn.execute(
+                    "DELETE FROM cv_jobs WHERE status IN (?, ?) AND updated_at < ?", (DONE, FAILED, now - self.ttl)
+                )
+                self._conn.execute(
+                    "DELETE FROM cv_jobs WHERE job_id IN (SELECT job_id FROM cv_jobs WHERE status IN (?, ?) "
+                    "ORDER BY updated_at DESC LIMIT -1 OFFSET ?)",
+                    (DONE, FAILED, self.max_finished),
+                )
+            else:
+                self._conn.execute(
+                    "UPDATE cv_jobs SET status = ?, result = ?, error = ?, updated_at = ? WHERE job_id = ?",
+                    (status, payload, error, now, job_id),
+                )
+            self._conn.commit()
+
+    def unfinished(self) -> List[str]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT job_id FROM cv_jobs WHERE status IN (?, ?) ORDER BY created_at", (PENDING, RUNNING)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def claim(self, job_id: str) -> bool:
+        with self._lock:
+            row = self._conn.execute("SELECT status, worker FROM cv_jobs WHERE job_id = ?", (job_id,)).fetchone()
+            if row is None or row["status"] not in (PENDING, RUNNING):
+                return False
+            # Tâche « running » d'un worker arrêté brutalement (crash, OOM) : reprise
+            if row["status"] == RUNNING and (_process_alive(row["worker"]) or job_id in self._claimed):
+                return False
+            # Mise à jour conditionnelle : un seul worker obtient la tâche si plusieurs la réclament
+            cursor = self._conn.execute(
+                "UPDATE cv_jobs SET status = ?, worker = ?, updated_at = ? "
+                "WHERE job_id = ? AND status = ? AND worker IS ?",
+                (RUNNING, os.getpid(), time.time(), job_id, row["status"], row["worker"]),
+            )
+            self._conn.commit()
+            if cursor.rowcount == 1:
+                self._claimed.add(job_id)
+        return cursor.rowcount == 1
+
+    def release(self, job_id: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE cv_jobs SET status = ?, worker = NULL, updated_at = ? WHERE job_id = ? AND status = ? AND worker = ?",
+                (PENDING, time.time(), job_id, RUNNING, os.getpid()),
+            )
+            self._conn.commit()
+            self._claimed.discard(job_id)
+
+
+def _build_store() -> JobStore:
+    """
+    Construit le stockage de tâches configuré
+    """
+    if JOB_STORE == "sqlite":
+        try:
+            return SQLiteJobStore()
+        except Exception as e:
+            logger.error("Stockage SQLite des tâches indisponible, repli en mémoire: %s", e)
+    return MemoryJobStore()
+
+
+class WebhookRejected(ValueError):
+    """
+    URL de webhook refusée : schéma invalide, hôte non autorisé ou adresse non publique
+    """
+
+
+async def validate_webhook_url(url: str) -> Optional[str]:
+    """
+    Vérifie qu'un webhook ne vise pas le réseau interne (SSRF) : hôte de JOB_WEBHOOK_ALLOWED_HOSTS
+    si la liste est définie, sinon toutes ses adresses résolues doivent être publiques
+    (ni boucle locale, ni réseau privé, ni lien local comme 169.254.169.254). Lève WebhookRejected.
+    Retourne l'adresse vérifiée à laquelle se connecter (None pour un hôte autorisé par la liste).
+    """
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https") or not parts.hostname:
+        raise WebhookRejected("webhook_url doit être une URL http(s)")
+    host = parts.hostname.lower()
+    if JOB_WEBHOOK_ALLOWED_HOSTS:
+        if host not in JOB_WEBHOOK_ALLOWED_HOSTS:
+            raise WebhookRejected("Hôte du webhook non autorisé")
+        return None
+
+    try:
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+        addresses = await asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM)
+    except (socket.gaierror, ValueError):
+        raise WebhookRejected("Hôte du webhook introuvable")
+    for *_, sockaddr in addresses:
+        address = ipaddress.ip_address(sockaddr[0].split("%", 1)[0])
+        if getattr(address, "ipv4_mapped", None):
+            address = address.ipv4_mapped
+        if not address.is_global or address.is_multicast:
+            raise WebhookRejected("Adresse du webhook non autorisée (réseau local, privé ou réservé)")
+    return str(ipaddress.ip_address(addresses[0][4][0].split("%", 1)[0]))
+
+
+store = _build_store()
+_queue: Optional[asyncio.Queue] = None
+_workers: List[asyncio.Task] = []
+_running: Set[str] = set()
+_draining = False
+
+
+# Les appels au stockage (requêtes SQLite bloquantes) sont exécutés hors de la boucle d'événements
+async def submit_job(filename: str, content: bytes, webhook_url: Optional[str] = None) -> str:
+    """
+    Enregistre une tâche d'analyse et la place en file d'attente ; retourne son identifiant
+    """
+    if _queue is None:
+        raise RuntimeError("Workers de tâches non démarrés")
+    job_id = await asyncio.to_thread(store.create, filename, content, webhook_url)
+    _queue.put_nowait(job_id)
+    return job_id
+
+
+async def get_job(job_id: str) -> Optional[Dict[str, Any]]:
+    """
+    État public d'une tâche (sans le contenu du fichier)
+    """
+    return await asyncio.to_thread(store.get, job_id)
+
+
+async def _notify_webhook(job: Dict[str, Any]) -> None:
+    """
+    Envoie le résultat au webhook du client (réessais avec attente exponentielle)
+    """
+    import httpx  # chargé seulement si un webhook est utilisé
+
+    # Adresses vérifiées à nouveau à l'envoi : le DNS de l'hôte a pu changer depuis la soumission
+    try:
+        address = await validate_webhook_url(job["webhook_url"])
+    except WebhookRejected as e:
+        logger.error("Webhook refusé: %s", e, extra={"job_id": job["job_id"]})
+        return
+
+    url = httpx.URL(job["webhook_url"])
+    headers: Dict[str, str] = {}
+    extensions: Dict[str, Any] = {}
+    if address is not None:
+        # Connexion à l'adresse vérifiée, sans nouvelle résolution DNS (rebinding vers une adresse
+        # interne) ; Host et SNI (certificat vérifié) restent ceux de l'URL d'origine
+        headers["Host"] = url.netloc.decode("ascii")
+        extensions["sni_hostname"] = url.host
+        url = url.copy_with(host=address)
+
+    payload = {
+        "job_id": job["job_id"],
+        "status": job["status"],
+        "filename": job["filename"],
+        "result": job["result"],
+        "error": job["error"],
+    }
+    # Redirections non suivies : elles pourraient mener vers une adresse interne
+    async with httpx.AsyncClient(timeout=JOB_WEBHOOK_TIMEOUT, follow_redirects=False) as http:
+        for attempt in range(JOB_WEBHOOK_RETRIES):
+            try:
+                response = await http.post(url, json=payload, headers=headers, extensions=extensions)
+                if response.status_code < 500:
+                    return
+            except httpx.HTTPError as e:
+                logger.warning("Erreur webhook (essai %s): %s", attempt + 1, e, extra={"job_id": job["job_id"]})
+            await asyncio.sleep(2 ** attempt)
+    logger.error("Webhook abandonné", extra={"job_id": job["job_id"]})
+
+
+async def _run_job(job_id: str) -> None:
+    job = await asyncio.to_thread(store.get, job_id)
+    content = await asyncio.to_thread(store.get_content, job_id)
+    if job is None or content is None:
+        return
+    # Plusieurs workers reprennent les mêmes tâches au démarrage : un seul la traite
+    if not await asyncio.to_thread(store.claim, job_id):
+        return
+
+    _running.add(job_id)
+    try:
+        # Tâche d'arrière-plan : attendre une place d'extraction/LLM plutôt qu'échouer sur surcharge
+        with background():
+            outcome = await analyze_document(job["filename"], content)
+    except asyncio.CancelledError:
+        # Arrêt du processus (redémarrage, recyclage du worker) : reprise par un autre worker
+        await asyncio.to_thread(store.release, job_id)
+        raise
+    finally:
+        _running.discard(job_id)
+    if outcome["status"] == "ok":
+        await asyncio.to_thread(store.update, job_id, DONE, result=outcome["result"])
+    else:
+        await asyncio.to_thread(store.update, job_id, FAILED, error=outcome["error"])
+
+    if job["webhook_url"]:
+        await _notify_webhook(await asyncio.to_thread(store.get, job_id))
+
+
+async def _worker() -> None:
+    while True:
+        job_id = await _queue.get()
+        try:
+            # En cours d'arrêt : la tâche reste « pending » pour le prochain worker
+            if not _draining:
+                await _run_job(job_id)
+        except Exception as e:
+            logger.exception("Erreur tâche", extra={"job_id": job_id})
+            await asyncio.to_thread(store.update, job_id, FAILED, error=str(e))
+        finally:
+            _queue.task_done()
+
+
+async def start_workers() -> None:
+    """
+    Démarre les workers de tâches et reprend les tâches non terminées (stockage persistant)
+    """
+    global _queue
+    if _queue is not None:
+        return
+    _queue = asyncio.Queue()
+    for job_id in await asyncio.to_thread(store.unfinished):
+        _queue.put_nowait(job_id)
+    for _ in range(JOB_WORKERS):
+        _workers.append(asyncio.create_task(_worker()))
+
+
+async def stop_workers(timeout: float = JOB_DRAIN_TIMEOUT) -> None:
+    """
+    Arrête les workers : plus aucune tâche démarrée, les tâches en cours ont `timeout` secondes
+    pour se terminer ; celles interrompues sont remises en attente et seront reprises
+    """
+    global _queue, _draining
+    _draining = True
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while _running and loop.time() < deadline:
+        await asyncio.sleep(0.1)
+    for task in _workers:
+        task.cancel()
+    await asyncio.gather(*_workers, return_exceptions=True)
+    _workers.clear()
+    _queue = None
+    _draining = False
@@ -0,0 +1,400 @@
+import asyncio
+import json
+import logging
+import os
+from contextlib import contextmanager
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+
+from backend.services.admission import llm_gate
+from backend.services.llm_resilience import CallPolicy, LLMProviderError, LLMTimeoutError, LLM_CALL_TIMEOUT, parse_retry_after
+from backend.utils.compactor import count_tokens
+from backend.utils.metrics import LLM_TOKENS, timed
+
+# Fournisseur et modèle par défaut (surchargeables par requête avec ?provider= et ?model=)
+LLM_PROVIDER = os.getenv("LLM_PROVIDER", "groq")  # groq | openai | stub
+LLM_MODEL = os.getenv("LLM_MODEL") or None  # défaut : modèle propre au fournisseur
+
+logger = logging.getLogger(__name__)
+
+# Paramètres du client HTTP partagé
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "60"))
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "20"))
+
+# Groq
+GROQ_MODEL = os.getenv("GROQ_MODEL", "llama-3.3-70b-versatile")
+GROQ_BASE_URL = os.getenv("GROQ_BASE_URL") or None  # ex: serveur stub local pour les tests de charge
+
+# Serveur compatible OpenAI (llama.cpp, vLLM, Ollama...)
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL", "http://127.0.0.1:8080/v1")
+OPENAI_API_KEY = os.getenv("OPENAI_API_KEY") or None
+OPENAI_MODEL = os.getenv("OPENAI_MODEL", "default")
+
+# Fournisseur factice en mémoire (tests de charge et benchmarks hors ligne)
+STUB_LLM_LATENCY = float(os.getenv("STUB_LLM_LATENCY", "0.5"))  # secondes par appel
+
+# Réponse déterministe du fournisseur factice
+STUB_CV = {
+    "nom": "Dupont",
+    "prenom": "Jean",
+    "email": "jean.dupont@email.com",
+    "telephone": "06 12 34 56 78",
+    "competences": ["Python", "Docker", "SQL"],
+    "experiences": [{"entreprise": "TechCorp", "poste": "Développeur Fullstack", "duree": "2022-2024"}],
+    "formations": [{"ecole": "Université de Paris", "diplome": "Master Informatique", "annee": "2020"}],
+}
+
+# Client HTTP partagé : pool de connexions keep-alive réutilisé par tous les fournisseurs.
+# Construit au premier fournisseur utilisé : httpx et le SDK groq ne sont pas importés au démarrage.
+_http_client = None
+
+
+def _get_http_client():
+    global _http_client
+    if _http_client is None:
+        import httpx
+
+        _http_client = httpx.AsyncClient(
+            timeout=LLM_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=LLM_MAX_CONNECTIONS,
+                max_keepalive_connections=LLM_MAX_CONNECTIONS,
+            ),
+        )
+    return _http_client
+
+
+class LLMProvider:
+    """
+    Interface commune des fournisseurs LLM (API de type chat completions)
+    """
+
+    name = ""
+    default_model = ""
+    rate_limited = True  # soumis au quota LLM_REQUESTS_PER_MINUTE / LLM_TOKENS_PER_MINUTE
+
+    async def complete(self, prompt: str, model: str, max_tokens: int, temperature: float = 0.1) -> Tuple[str, Dict[str, int]]:
+        """
+        Retourne (texte de la réponse, {"prompt_tokens", "completion_tokens"})
+        """
+        raise NotImplementedError
+
+    def stream(
+        self, prompt: str, model: str, max_tokens: int, temperature: float = 0.1, usage: Optional[Dict[str, int]] = None,
+    ) -> AsyncIterator[str]:
+        """
+        Génère les fragments de texte de la réponse au fil de l'eau ;
+        `usage` est complété par le décompte de tokens final quand l'API le fournit
+        """
+        raise NotImplementedError
+
+
+def _usage(usage) -> Dict[str, int]:
+    """
+    Normalise le décompte de tokens renvoyé par l'API (objet ou dict)
+    """
+    if usage is None:
+        return {"prompt_tokens": 0, "completion_tokens": 0}
+    if isinstance(usage, dict):
+        return {"prompt_tokens": usage.get("prompt_tokens") or 0, "completion_tokens": usage.get("completion_tokens") or 0}
+    return {"prompt_tokens": usage.prompt_tokens or 0, "completion_tokens": usage.completion_tokens or 0}
+
+
+@contextmanager
+def _provider_errors():
+    """
+    Convertit les erreurs httpx en LLMProviderError (statut HTTP, Retry-After)
+    """
+    import httpx  # déjà chargé par le client HTTP partagé
+
+    try:
+        yield
+    except httpx.HTTPStatusError as e:
+        raise LLMProviderError(str(e), e.response.status_code, parse_retry_after(e.response.headers.get("retry-after"))) from e
+    except httpx.TransportError as e:
+        raise LLMProviderError(str(e)) from e
+
+
+@contextmanager
+def _groq_errors():
+    """
+    Convertit les erreurs du SDK groq en LLMProviderError (statut HTTP, Retry-After)
+    """
+    import groq  # déjà chargé par GroqProvider
+
+    try:
+        yield
+    except groq.APIStatusError as e:
+        raise LLMProviderError(str(e), e.status_code, parse_retry_after(e.response.headers.get("retry-after"))) from e
+    except groq.APIConnectionError as e:
+        raise LLMProviderError(str(e)) from e
+
+
+class GroqProvider(LLMProvider):
+    """
+    API Groq via le SDK officiel asynchrone
+    """
+
+    name = "groq"
+    default_model = GROQ_MODEL
+
+    def __init__(self, http_client=None):
+        # SDK importé à la construction du fournisseur (premier appel ou warm-up), pas au démarrage
+        from groq import AsyncGroq
+
+        self.client = AsyncGroq(
+            api_key=os.getenv("GROQ_API_KEY"),
+            base_url=GROQ_BASE_URL,
+            http_client=http_client or _get_http_client(),
+            max_retries=0,  # réessais gérés par CallPolicy (Retry-After, disjoncteur)
+        )
+
+    async def complete(self, prompt: str, model: str, max_tokens: int, temperature: float = 0.1) -> Tuple[str, Dict[str, int]]:
+        with _provider_errors(), _groq_errors():
+            response = await self.client.chat.completions.create(
+                model=model,
+                messages=[{"role": "user", "content": prompt}],
+                temperature=temperature,
+                max_tokens=max_tokens
+            )
+        return response.choices[0].message.content or "", _usage(response.usage)
+
+    async def stream(
+        self, prompt: str, model: str, max_tokens: int, temperature: float = 0.1, usage: Optional[Dict[str, int]] = None,
+    ) -> AsyncIterator[str]:
+        with _provider_errors(), _groq_errors():
+            stream = await self.client.chat.completions.create(
+                model=model,
+                messages=[{"role": "user", "content": prompt}],
+                temperature=temperature,
+                max_tokens=max_tokens,
+                stream=True
+            )
+            async for chunk in stream:
+                # Décompte de tokens dans le dernier fragment (extension x_groq)
+                final_usage = getattr(getattr(chunk, "x_groq", None), "usage", None)
+                if final_usage is not None and usage is not None:
+                    usage.update(_usage(final_usage))
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    yield delta
+
+
+class OpenAICompatibleProvider(LLMProvider):
+    """
+    Tout serveur exposant POST {base_url}/chat/completions (OpenAI, llama.cpp, vLLM...)
+    """
+
+    name = "openai"
+    default_model = OPENAI_MODEL
+
+    def __init__(self, base_url: str = OPENAI_BASE_URL, api_key: Optional[str] = OPENAI_API_KEY, http_client=None):
+        self.url = base_url.rstrip("/") + "/chat/completions"
+        self.headers = {"Authorization": f"Bearer {api_key}"} if api_key else {}
+        self.http = http_client or _get_http_client()
+
+    def _payload(self, prompt: str, model: str, max_tokens: int, temperature: float) -> Dict:
+        return {
+            "model": model,
+            "messages": [{"role": "user", "content": prompt}],
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+        }
+
+    async def complete(self, prompt: str, model: str, max_tokens: int, temperature: float = 0.1) -> Tuple[str, Dict[str, int]]:
+        with _provider_errors():
+            response = await self.http.post(self.url, json=self._payload(prompt, model, max_tokens, temperature), headers=self.headers)
+            response.raise_for_status()
+        data = response.json()
+        return data["choices"][0]["message"].get("content") or "", _usage(data.get("usage"))
+
+    async def stream(
+        self, prompt: str, model: str, max_tokens: int, temperature: float = 0.1, usage: Optional[Dict[str, int]] = None,
+    ) -> AsyncIterator[str]:
+        # Décompte de tokens demandé dans un dernier fragment (ignoré par les serveurs qui ne le gèrent pas)
+        payload = {
+            **self._payload(prompt, model, max_tokens, temperature), "stream": True,
+            "stream_options": {"include_usage": True},
+        }
+        with _provider_errors():
+            async with self.http.stream("POST", self.url, json=payload, headers=self.headers) as response:
+                response.raise_for_status()
+                # Flux Server-Sent Events : lignes "data: {...}" terminées par "data: [DONE]"
+                async for line in response.aiter_lines():
+                    if not line.startswith("data:"):
+                        continue
+                    data = line[5:].strip()
+                    if data == "[DONE]":
+                        break
+                    event = json.loads(data)
+                    if event.get("usage") and usage is not None:
+                        usage.update(_usage(event["usage"]))
+                    choices = event.get("choices") or []
+                    delta = (choices[0].get("delta") or {}).get("content") if choices else None
+                    if delta:
+                        yield delta
+
+
+class StubProvider(LLMProvider):
+    """
+    Fournisseur factice déterministe en mémoire : latence configurable, aucun appel réseau
+    """
+
+    name = "stub"
+    default_model = "stub"
+    rate_limited = False
+
+    def __init__(self, latency: float = STUB_LLM_LATENCY):
+        self.latency = latency
+        self.response = json.dumps(STUB_CV, ensure_ascii=False)
+
+    async def complete(self, prompt: str, model: str, max_tokens: int, temperature: float = 0.1) -> Tuple[str, Dict[str, int]]:
+        await asyncio.sleep(self.latency)
+        return self.response, {"prompt_tokens": count_tokens(prompt), "completion_tokens": count_tokens(self.response)}
+
+    async def stream(
+        self, prompt: str, model: str, max_tokens: int, temperature: float = 0.1, usage: Optional[Dict[str, int]] = None,
+    ) -> AsyncIterator[str]:
+        # Même latence totale que complete(), répartie sur les fragments
+        chunks = [self.response[i:i + 16] for i in range(0, len(self.response), 16)]
+        for chunk in chunks:
+            await asyncio.sleep(self.latency / len(chunks))
+            yield chunk
+        if usage is not None:
+            usage.update(prompt_tokens=count_tokens(prompt), completion_tokens=count_tokens(self.response))
+
+
+class ResilientProvider(LLMProvider):
+    """
+    Enveloppe un fournisseur avec sa politique d'appel : file à quotas,
+    disjoncteur, délai par tentative et réessais (CallPolicy)
+    """
+
+    def __init__(self, provider: LLMProvider):
+        self.provider = provider
+        self.name = provider.name
+        self.default_model = provider.default_model
+        self.policy = CallPolicy(provider.name, provider.rate_limited)
+
+    async def complete(self, prompt: str, model: str, max_tokens: int, temperature: float = 0.1) -> Tuple[str, Dict[str, int]]:
+        estimated = count_tokens(prompt) + max_tokens
+        async with llm_gate.admit():
+            with timed("llm"):
+                text, usage = await self.policy.run(
+                    lambda: self.provider.complete(prompt, model, max_tokens, temperature), estimated
+                )
+        self._account(model, estimated, usage)
+        return text, usage
+
+    def _account(self, model: str, estimated: int, usage: Dict[str, int]) -> None:
+        """
+        Quota rendu selon la consommation réelle (réservé à l'estimation) et métriques de tokens
+        """
+        self.policy.scheduler.settle(estimated, usage["prompt_tokens"] + usage["completion_tokens"])
+        LLM_TOKENS.labels(self.name, model, "prompt").inc(usage["prompt_tokens"])
+        LLM_TOKENS.labels(self.name, model, "completion").inc(usage["completion_tokens"])
+
+    async def stream(
+        self, prompt: str, model: str, max_tokens: int, temperature: float = 0.1, usage: Optional[Dict[str, int]] = None,
+    ) -> AsyncIterator[str]:
+        estimated = count_tokens(prompt) + max_tokens
+        usage = {} if usage is None else usage
+        received = []
+
+        async def open_stream():
+            # Une tentative = ouverture du flux jusqu'au premier fragment (seule phase réessayable)
+            usage.clear()
+            chunks = self.provider.stream(prompt, model, max_tokens, temperature, usage).__aiter__()
+            try:
+                return chunks, await chunks.__anext__()
+            except StopAsyncIteration:
+                return chunks, None
+            except BaseException:
+                await chunks.aclose()
+                raise
+
+        async with llm_gate.admit():
+            with timed("llm"):
+                chunks, first = await self.policy.run(open_stream, estimated)
+                try:
+                    if first is None:
+                        return
+                    received.append(first)
+                    yield first
+                    while True:
+                        try:
+                            chunk = await asyncio.wait_for(chunks.__anext__(), timeout=LLM_CALL_TIMEOUT)
+                        except StopAsyncIteration:
+                            return
+                        except asyncio.TimeoutError:
+                            error = LLMTimeoutError(f"Flux LLM interrompu (aucune donnée depuis {LLM_CALL_TIMEOUT:g}s)")
+                            self.policy.record(error)
+                            raise error
+                        except LLMProviderError as e:
+                            self.policy.record(e)
+                            raise
+                        received.append(chunk)
+                        yield chunk
+                finally:
+                    await chunks.aclose()
+                    if not usage:
+                        # Décompte absent du flux (interrompu, API sans décompte) : estimation sur le texte reçu
+                        usage.update(prompt_tokens=count_tokens(prompt), completion_tokens=count_tokens("".join(received)))
+                    self._account(model, estimated, usage)
+
+    def state(self) -> Dict[str, Any]:
+        return self.policy.state()
+
+
+PROVIDERS = {
+    GroqProvider.name: GroqProvider,
+    OpenAICompatibleProvider.name: OpenAICompatibleProvider,
+    StubProvider.name: StubProvider,
+}
+
+_instances: Dict[str, ResilientProvider] = {}
+
+
+def resolve_model(provider: Optional[str] = None, model: Optional[str] = None) -> Tuple[str, str]:
+    """
+    (fournisseur, modèle) effectifs : choix de la requête, sinon configuration, sinon défaut du fournisseur
+    """
+    name = provider or LLM_PROVIDER
+    if name not in PROVIDERS:
+        raise ValueError(f"Fournisseur LLM inconnu: {name}")
+    default = LLM_MODEL if name == LLM_PROVIDER else None
+    return name, model or default or PROVIDERS[name].default_model
+
+
+def model_label(provider: Optional[str] = None, model: Optional[str] = None) -> str:
+    """
+    Identifiant "fournisseur/modèle" (espace de noms des clés de cache)
+    """
+    return "/".join(resolve_model(provider, model))
+
+
+def get_provider(name: Optional[str] = None) -> ResilientProvider:
+    """
+    Instance partagée du fournisseur demandé, avec sa politique d'appel (construite au premier usage)
+    """
+    name, _ = resolve_model(name)
+    if name not in _instances:
+        _instances[name] = ResilientProvider(PROVIDERS[name]())
+        logger.info("Fournisseur LLM '%s' initialisé", name)
+    return _instances[name]
+
+
+def provider_states() -> Dict[str, Dict[str, Any]]:
+    """
+    État du disjoncteur et de la file d'attente de chaque fournisseur utilisé
+    """
+    return {name: provider.state() for name, provider in _instances.items()}
+
+
+async def close_client() -> None:
+    """
+    Ferme le pool de connexions HTTP partagé (à appeler à l'arrêt de l'application)
+    """
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
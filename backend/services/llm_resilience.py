@@ -0,0 +1,346 @@
+import asyncio
+import logging
+import os
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from backend.utils.metrics import LLM_ERRORS
+from backend.utils import tracing
+
+# Délais des appels LLM (surchargés via l'environnement)
+LLM_CALL_TIMEOUT = float(os.getenv("LLM_CALL_TIMEOUT", "30"))  # délai max d'une tentative (secondes)
+LLM_DEADLINE = float(os.getenv("LLM_DEADLINE", "90"))  # délai max total, réessais et attente en file compris
+
+# Réessais avec attente exponentielle aléatoire (« full jitter »)
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "3"))
+LLM_RETRY_BASE_DELAY = float(os.getenv("LLM_RETRY_BASE_DELAY", "0.5"))
+LLM_RETRY_MAX_DELAY = float(os.getenv("LLM_RETRY_MAX_DELAY", "20"))
+
+# Disjoncteur : ouvert après N pannes consécutives, nouvel essai après la période de refroidissement
+LLM_BREAKER_THRESHOLD = int(os.getenv("LLM_BREAKER_THRESHOLD", "5"))
+LLM_BREAKER_COOLDOWN = float(os.getenv("LLM_BREAKER_COOLDOWN", "30"))
+
+# Quota du fournisseur (par processus ; 0 = illimité)
+LLM_REQUESTS_PER_MINUTE = int(os.getenv("LLM_REQUESTS_PER_MINUTE", "0"))
+LLM_TOKENS_PER_MINUTE = int(os.getenv("LLM_TOKENS_PER_MINUTE", "0"))
+
+logger = logging.getLogger(__name__)
+
+# États du disjoncteur
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class LLMProviderError(Exception):
+    """
+    Erreur d'appel à un fournisseur LLM, normalisée quel que soit le SDK
+    (status_code None = pas de réponse : connexion impossible ou délai dépassé)
+    """
+
+    def __init__(self, message: str, status_code: Optional[int] = None, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+    @property
+    def retryable(self) -> bool:
+        return self.status_code is None or self.status_code in (408, 409, 429) or self.status_code >= 500
+
+    @property
+    def is_outage(self) -> bool:
+        """
+        Panne du fournisseur (compte pour le disjoncteur) ; 429 et 4xx prouvent qu'il répond
+        """
+        return self.status_code is None or self.status_code >= 500
+
+
+    @property
+    def kind(self) -> str:
+        """
+        Catégorie de l'erreur pour les métriques
+        """
+        return str(self.status_code) if self.status_code else "network"
+
+
+class LLMTimeoutError(LLMProviderError):
+    """
+    Aucune réponse (ou plus de données en flux) dans le délai imparti
+    """
+
+    @property
+    def kind(self) -> str:
+        return "timeout"
+
+
+class CircuitOpenError(LLMProviderError):
+    """
+    Appel refusé sans contacter le fournisseur : disjoncteur ouvert
+    """
+
+    @property
+    def retryable(self) -> bool:
+        return False
+
+    @property
+    def kind(self) -> str:
+        return "circuit_open"
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    En-tête Retry-After en secondes (nombre de secondes ou date HTTP)
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(attempt: int, retry_after: Optional[float] = None) -> float:
+    """
+    Attente avant la tentative suivante : Retry-After s'il est fourni, sinon exponentielle aléatoire
+    """
+    if retry_after is not None:
+        return retry_after + random.uniform(0, LLM_RETRY_BASE_DELAY)
+    return random.uniform(0, min(LLM_RETRY_MAX_DELAY, LLM_RETRY_BASE_DELAY * 2 ** attempt))
+
+
+class TokenBucket:
+    """
+    Seau à jetons rechargé en continu (capacité = quota par minute)
+    """
+
+    def __init__(self, per_minute: int):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay(self, amount: float) -> float:
+        """
+        Attente nécessaire avant de pouvoir prélever `amount` jetons
+        """
+        self._refill()
+        amount = min(amount, self.capacity)
+        return 0.0 if self.level >= amount else (amount - self.level) / self.rate
+
+    def take(self, amount: float) -> None:
+        self._refill()
+        self.level -= min(amount, self.capacity)
+
+    def give_back(self, amount: float) -> None:
+        self._refill()
+        self.level = min(self.capacity, self.level + amount)
+
+
+class RateScheduler:
+    """
+    File d'attente des appels LLM (ordre d'arrivée) respectant les quotas
+    requêtes/minute et tokens/minute, et les pauses imposées par Retry-After
+    """
+
+    def __init__(self, requests_per_minute: int = LLM_REQUESTS_PER_MINUTE, tokens_per_minute: int = LLM_TOKENS_PER_MINUTE):
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute > 0 else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute > 0 else None
+        self.paused_until = 0.0
+        self.waiting = 0
+        self._lock = asyncio.Lock()
+
+    def _delay(self, tokens: int) -> float:
+        delay = self.paused_until - time.monotonic()
+        if self.requests:
+            delay = max(delay, self.requests.delay(1))
+        if self.tokens:
+            delay = max(delay, self.tokens.delay(tokens))
+        return delay
+
+    async def acquire(self, tokens: int) -> None:
+        """
+        Attend son tour puis prélève une requête et `tokens` tokens (estimation)
+        """
+        self.waiting += 1
+        try:
+            async with self._lock:
+                while True:
+                    delay = self._delay(tokens)
+                    if delay <= 0:
+                        break
+                    await asyncio.sleep(delay)
+                if self.requests:
+                    self.requests.take(1)
+                if self.tokens:
+                    self.tokens.take(tokens)
+        finally:
+            self.waiting -= 1
+
+    def settle(self, estimated: int, used: int) -> None:
+        """
+        Rend au seau les tokens réservés mais non consommés
+        """
+        if self.tokens and used and estimated > used:
+            self.tokens.give_back(estimated - used)
+
+    def pause(self, seconds: float) -> None:
+        """
+        Suspend tous les appels (réponse 429 du fournisseur avec Retry-After)
+        """
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+    def state(self) -> Dict[str, Any]:
+        return {
+            "waiting": self.waiting,
+            "paused_for": round(max(0.0, self.paused_until - time.monotonic()), 1),
+            "requests_available": int(self.requests.level) if self.requests else None,
+            "tokens_available": int(self.tokens.level) if self.tokens else None,
+        }
+
+
+class CircuitBreaker:
+    """
+    Disjoncteur : échoue immédiatement tant que le fournisseur est en panne,
+    puis laisse passer un unique appel d'essai après la période de refroidissement
+    """
+
+    def __init__(self, threshold: int = LLM_BREAKER_THRESHOLD, cooldown: float = LLM_BREAKER_COOLDOWN):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+
+    def retry_in(self) -> float:
+        if self.state != OPEN:
+            return 0.0
+        return max(0.0, self.opened_at + self.cooldown - time.monotonic())
+
+    def allow(self) -> bool:
+        if self.state == CLOSED:
+            return True
+        if self.state == OPEN and self.retry_in() <= 0:
+            self.state = HALF_OPEN
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self.state = CLOSED
+        self.failures = 0
+
+    def release_trial(self) -> None:
+        """
+        Appel d'essai abandonné sans issue (annulation) : un autre appel pourra le retenter
+        """
+        if self.state == HALF_OPEN:
+            self.state = OPEN
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.state == HALF_OPEN or self.failures >= self.threshold:
+            if self.state != OPEN:
+                logger.warning("Disjoncteur LLM ouvert après %s échec(s) consécutif(s)", self.failures)
+            self.state = OPEN
+            self.opened_at = time.monotonic()
+
+
+class CallPolicy:
+    """
+    Politique d'appel d'un fournisseur : file à quotas, disjoncteur, délais et réessais
+    """
+
+    def __init__(self, name: str, rate_limited: bool = True):
+        self.name = name
+        self.scheduler = RateScheduler() if rate_limited else RateScheduler(0, 0)
+        self.breaker = CircuitBreaker()
+
+    def record(self, error: Optional[LLMProviderError]) -> None:
+        """
+        Met à jour le disjoncteur et la file selon l'issue d'une tentative
+        """
+        if error is not None:
+            LLM_ERRORS.labels(self.name, error.kind).inc()
+        if error is None or not error.is_outage:
+            self.breaker.record_success()
+        else:
+            self.breaker.record_failure()
+        if error is not None and error.status_code == 429:
+            self.scheduler.pause(error.retry_after if error.retry_after is not None else backoff_delay(1))
+
+    async def run(self, call: Callable[[], Awaitable[Any]], tokens: int) -> Any:
+        """
+        Exécute `call` (une tentative par appel) avec attente en file, délai par tentative
+        et réessais ; lève LLMProviderError si l'appel échoue définitivement
+        """
+        deadline = time.monotonic() + LLM_DEADLINE
+        attempt = 0
+        error = None
+        while True:
+            if not self.breaker.allow():
+                # Disjoncteur ouvert par les échecs de cet appel : remonter la dernière erreur réelle
+                if error is not None:
+                    raise error
+                LLM_ERRORS.labels(self.name, "circuit_open").inc()
+                raise CircuitOpenError(
+                    f"Fournisseur LLM {self.name} indisponible (disjoncteur ouvert)",
+                    retry_after=self.breaker.retry_in(),
+                )
+            try:
+                waited = time.monotonic()
+                remaining = deadline - waited
+                await asyncio.wait_for(self.scheduler.acquire(tokens), timeout=max(0.0, remaining))
+            except asyncio.TimeoutError:
+                raise LLMProviderError(f"File d'attente LLM saturée (délai de {LLM_DEADLINE:g}s dépassé)", 429)
+            # Attente en file (quotas du fournisseur) distinguée du temps de réponse dans la trace
+            tracing.current_span().add_event("llm.admitted", {
+                "llm.attempt": attempt + 1, "llm.queue_wait_ms": round((time.monotonic() - waited) * 1000, 1),
+            })
+
+            try:
+                remaining = deadline - time.monotonic()
+                result = await asyncio.wait_for(call(), timeout=max(0.0, min(LLM_CALL_TIMEOUT, remaining)))
+            except (asyncio.TimeoutError, LLMProviderError) as e:
+                error = e if isinstance(e, LLMProviderError) else LLMTimeoutError(f"Délai d'appel LLM dépassé ({LLM_CALL_TIMEOUT:g}s)")
+                self.record(error)
+                attempt += 1
+                if not error.retryable or attempt > LLM_MAX_RETRIES:
+                    raise error
+                delay = backoff_delay(attempt, error.retry_after)
+                if time.monotonic() + delay >= deadline:
+                    raise error
+                logger.warning("Erreur %s (%s), nouvel essai %s/%s dans %.1fs",
+                               self.name, error, attempt, LLM_MAX_RETRIES, delay, extra={"kind": error.kind})
+                tracing.current_span().add_event("llm.retry", {"llm.error": error.kind, "llm.retry_delay_s": round(delay, 2)})
+                await asyncio.sleep(delay)
+                continue
+            except asyncio.CancelledError:
+                self.breaker.release_trial()
+                raise
+            except Exception:
+                # Réponse inexploitable : le fournisseur a bien répondu
+                self.record(None)
+                raise
+
+            self.record(None)
+            return result
+
+    def state(self) -> Dict[str, Any]:
+        return {
+            "breaker": {
+                "state": self.breaker.state,
+                "consecutive_failures": self.breaker.failures,
+                "retry_in": round(self.breaker.retry_in(), 1),
+            },
+            "queue": self.scheduler.state(),
+        }
@@ -1,58 +1,29 @@
 import json
+import logging
 import re
 import os
-from typing import Dict, Any
-from groq import Groq
+from typing import Dict, Any, Optional, Tuple
+from backend.services.llm_providers import get_provider, resolve_model, LLMProvider
+from backend.utils.metrics import NON_CV_REJECTIONS
+from backend.utils.logging_config import log_payload
+from backend.utils import tracing
+from backend.services.heuristic_service import EMAIL_RE, PHONE_RE, FAST_PATH_MIN_CONFIDENCE, extract_cv_fields
 
-# Initialiser le client Groq
-client = Groq(api_key=os.getenv("GROQ_API_KEY"))
+# Mode d'analyse par défaut : llm (toujours l'IA) | fast (extraction locale seule) | hybrid
+ANALYSIS_MODE = os.getenv("ANALYSIS_MODE", "llm")
 
-async def analyze_cv(text: str) -> Dict[str, Any]:
-    """
-    Analyse un texte de CV avec IA Groq pour extraire les informations structurées.
-    
-    Args:
-        text (str): Le texte du CV
-        
-    Returns:
-        dict: Informations structurées du CV au format JSON propre
-    """
-    if not text or not text.strip():
-        return _get_empty_result("Aucun texte à analyser")
-    
-    try:
-        # Nettoyer le texte
-        cleaned_text = _clean_text(text)
-        
-        if len(cleaned_text) < 20:
-            return _get_empty_result("Texte trop court pour l'analyse")
-        
-        # Appel direct à l'IA Groq sans validation préalable
-        result = await _analyze_with_groq(cleaned_text)
-        
-        # Log pour debug
-        print(f"Résultat brut de l'IA: {result}")
-        
-        cleaned_result = _validate_and_clean_result(result)
-        
-        # Log pour debug
-        print(f"Résultat nettoyé: {cleaned_result}")
-        
-        # Validation post-analyse pour déterminer si c'est un CV
-        if _is_empty_cv_result(cleaned_result):
-            return _get_not_cv_result()
-        
-        return cleaned_result
-        
-    except Exception as e:
-        print(f"Erreur analyse IA: {e}")
-        return _get_fallback_result(text, str(e))
+# Filtre pré-IA des documents qui ne sont pas des CV (score de _is_likely_cv)
+CV_GATE_ENABLED = os.getenv("CV_GATE_ENABLED", "true").lower() in ("1", "true", "yes")
+CV_GATE_THRESHOLD = int(os.getenv("CV_GATE_THRESHOLD", "3"))
+CV_FILENAME_INDICATORS = ('cv', 'curriculum', 'vitae', 'resume')
+
+logger = logging.getLogger(__name__)
 
-async def _analyze_with_groq(text: str) -> Dict[str, Any]:
+def _build_prompt(text: str) -> str:
     """
-    Analyse avec Groq Llama 3.3 (modèle actuel)
+    Construit le prompt d'extraction envoyé au modèle
     """
-    prompt = f"""
+    return f"""
     Tu es un expert en analyse de CV. Analyse ce texte et extrait les informations suivantes au format JSON strict et valide:
 
     {{
@@ -82,30 +53,156 @@ async def _analyze_with_groq(text: str) -> Dict[str, Any]:
     Texte du CV à analyser:
     {text}
     """
+
+def _get_llm(provider: Optional[str] = None, model: Optional[str] = None) -> Tuple[LLMProvider, str]:
+    """
+    Fournisseur LLM et modèle effectifs pour une requête
+    """
+    name, model = resolve_model(provider, model)
+    return get_provider(name), model
+
+def _cv_gate(text: str, filename: Optional[str] = None) -> str:
+    """
+    Filtre pré-IA : "pass" si le texte ressemble à un CV, "reject" sinon.
+    "override" : score insuffisant mais nom de fichier explicite (cv, curriculum...) ;
+    le document est envoyé à l'IA et journalisé comme faux négatif possible.
+    """
+    if not CV_GATE_ENABLED:
+        return "pass"
     
-    try:
-        response = client.chat.completions.create(
-            model="llama-3.3-70b-versatile",
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.1,
-            max_tokens=1500
-        )
+    score = _cv_likelihood_score(text)
+    if score >= CV_GATE_THRESHOLD:
+        return "pass"
+    
+    name = (filename or "").lower()
+    if any(indicator in name for indicator in CV_FILENAME_INDICATORS):
+        logger.info("Filtre CV levé par le nom de fichier: faux négatif possible",
+                    extra={"upload_name": filename, "score": score, "threshold": CV_GATE_THRESHOLD})
+        return "override"
+    
+    logger.info("Document rejeté avant appel IA", extra={"score": score, "threshold": CV_GATE_THRESHOLD})
+    NON_CV_REJECTIONS.labels("gate").inc()
+    return "reject"
+
+def _fast_path(text: str, mode: str) -> Optional[Dict[str, Any]]:
+    """
+    Modes fast/hybrid : extraction locale déterministe.
+    Retourne le résultat final si l'appel IA peut être évité, sinon None.
+    """
+    if mode not in ("fast", "hybrid"):
+        return None
+    
+    local_result = extract_cv_fields(text)
+    if mode == "fast" or local_result["confidence"] >= FAST_PATH_MIN_CONFIDENCE:
+        return local_result
+    return None
+
+class _FieldScanner:
+    """
+    Champs de premier niveau d'un JSON en cours de génération, analysé au fil des fragments :
+    l'état (position, profondeur, chaîne, échappement, début de valeur) est conservé entre
+    deux appels à feed, seuls les nouveaux caractères sont parcourus
+    """
+
+    def __init__(self):
+        self.text = ""
+        self._pos = 0
+        self._started = False
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._value_start = None
+
+    def feed(self, delta: str) -> Dict[str, Any]:
+        """
+        Ajoute un fragment ; retourne les champs complétés par ce fragment
+        """
+        self.text += delta
+        buffer = self.text
+        if not self._started:
+            start = buffer.find('{', self._pos)
+            if start == -1:
+                self._pos = len(buffer)
+                return {}
+            self._started = True
+            self._pos = start
+        
+        fields = {}
+        depth = self._depth
+        in_string = self._in_string
+        escaped = self._escaped
+        value_start = self._value_start
+        
+        for i in range(self._pos, len(buffer)):
+            char = buffer[i]
+            if in_string:
+                if escaped:
+                    escaped = False
+                elif char == '\\':
+                    escaped = True
+                elif char == '"':
+                    in_string = False
+                continue
+            
+            if char == '"':
+                in_string = True
+            elif char in '{[':
+                depth += 1
+                if depth == 1:
+                    value_start = i + 1
+            elif char in '}]' or (char == ',' and depth == 1):
+                if depth == 1:
+                    # Fin d'une paire "clé": valeur au premier niveau
+                    pair = buffer[value_start:i]
+                    key_text, sep, value_text = pair.partition(':')
+                    if sep:
+                        try:
+                            fields[json.loads(key_text.strip())] = json.loads(value_text.strip())
+                        except ValueError:
+                            pass
+                    value_start = i + 1
+                if char != ',':
+                    depth -= 1
         
-        result_text = response.choices[0].message.content.strip()
+        self._pos = len(buffer)
+        self._depth, self._in_string, self._escaped, self._value_start = depth, in_string, escaped, value_start
+        return fields
+
+def _completed_fields(buffer: str) -> Dict[str, Any]:
+    """
+    Extrait les champs de premier niveau déjà complets d'un JSON en cours de génération
+    (réponse entière ; en flux, _FieldScanner n'analyse que les nouveaux fragments)
+    """
+    return _FieldScanner().feed(buffer)
+
+async def _analyze_with_llm(
+    llm: LLMProvider, model: str, text: str, max_tokens: int = 1500, sampled: bool = False
+) -> Tuple[Dict[str, Any], Dict[str, int]]:
+    """
+    Analyse avec le fournisseur LLM configuré ; retourne (JSON extrait, tokens consommés)
+    """
+    prompt = _build_prompt(text)
+    
+    try:
+        with tracing.span("analyze_with_llm", **{
+            "llm.provider": llm.name, "llm.model": model, "llm.max_tokens": max_tokens, "llm.prompt_chars": len(prompt),
+        }) as span:
+            result_text, usage = await llm.complete(prompt, model, max_tokens)
+            span.set_attributes({"llm." + key: value for key, value in usage.items()})
+        result_text = result_text.strip()
         
         # Extraire le JSON proprement
         json_text = _extract_json_from_response(result_text)
         
-        print(f"Texte brut de l'IA: {result_text}")
-        print(f"JSON extrait: {json_text}")
+        log_payload(logger, "Texte brut de l'IA", result_text, sampled)
         
         if json_text:
-            return json.loads(json_text)
+            return json.loads(json_text), usage
         else:
             raise Exception("Impossible d'extraire le JSON de la réponse")
             
     except Exception as e:
-        print(f"Erreur Groq: {e}")
+        logger.debug("Erreur %s: %s", llm.name, e, extra={"model": model})
         raise e
 
 def _extract_json_from_response(text: str) -> str:
@@ -209,10 +306,16 @@ def _is_empty_cv_result(result: Dict[str, Any]) -> bool:
         len(result.get("formations", [])) == 0
     )
 
-def _is_likely_cv(text: str) -> bool:
+def _is_likely_cv(text: str, threshold: int = CV_GATE_THRESHOLD) -> bool:
     """
     Vérifie si le texte ressemble à un CV
     """
+    return _cv_likelihood_score(text) >= threshold
+
+def _cv_likelihood_score(text: str) -> int:
+    """
+    Score de ressemblance à un CV (mots-clés, email, téléphone, longueur)
+    """
     # Mots-clés typiques des CV
     cv_keywords = [
         'expérience', 'expériences', 'experience', 'experiences',
@@ -223,17 +326,14 @@ def _is_likely_cv(text: str) -> bool:
         'curriculum', 'vitae', 'cv', 'resume'
     ]
     
-    # Vérifier si le nom du fichier contient "cv"
-    filename_indicators = ['cv', 'curriculum', 'vitae', 'resume']
-    
     text_lower = text.lower()
     
     # Compter les mots-clés trouvés
     keyword_count = sum(1 for keyword in cv_keywords if keyword in text_lower)
     
     # Vérifier la structure (email, téléphone)
-    has_email = bool(re.search(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', text))
-    has_phone = bool(re.search(r'(\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}', text))
+    has_email = bool(EMAIL_RE.search(text))
+    has_phone = bool(PHONE_RE.search(text))
     
     # Score de confiance
     confidence_score = 0
@@ -248,8 +348,7 @@ def _is_likely_cv(text: str) -> bool:
     if len(text) > 200:
         confidence_score += 1
     
-    # Seuil minimum pour considérer que c'est un CV
-    return confidence_score >= 3
+    return confidence_score
 
 def _get_not_cv_result() -> Dict[str, Any]:
     """
@@ -271,8 +370,8 @@ def _get_fallback_result(text: str, error: str) -> Dict[str, Any]:
     Résultat de fallback avec extraction simple
     """
     # Extraction simple avec regex
-    email_match = re.search(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', text)
-    phone_match = re.search(r'(\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}', text)
+    email_match = EMAIL_RE.search(text)
+    phone_match = PHONE_RE.search(text)
     
     return {
         "nom": "Non trouvé",
@@ -1,54 +1,177 @@
 import subprocess
-from PIL import Image
 import io
+import logging
 import os
 import tempfile
+import threading
+import time
+from typing import TYPE_CHECKING
 
-def extract_text_from_image(image_data):
+from backend.utils import tracing
+
+if TYPE_CHECKING:
+    from PIL import Image
+
+# Nombre maximal de reconnaissances tesseract simultanées
+OCR_CONCURRENCY = int(os.getenv("OCR_CONCURRENCY", str(os.cpu_count() or 2)))
+
+# Moteur OCR : auto (tesserocr si installé, sinon sous-processus) | tesserocr | subprocess
+OCR_ENGINE = os.getenv("OCR_ENGINE", "auto")
+OCR_LANG = os.getenv("OCR_LANG", "fra")
+
+logger = logging.getLogger(__name__)
+
+# Sémaphore limitant tesseract (remplacé par un sémaphore inter-processus dans les workers)
+_tesseract_slots = threading.BoundedSemaphore(OCR_CONCURRENCY)
+
+
+def set_tesseract_slots(slots) -> None:
     """
-    Extrait le texte d'une image en utilisant Tesseract OCR
-    Retourne le texte extrait ou lève une exception en cas d'erreur
+    Remplace le sémaphore tesseract (partagé entre les processus du pool d'extraction)
     """
-    try:
+    global _tesseract_slots
+    _tesseract_slots = slots
+
+
+class OCREngine:
+    """
+    Interface d'un moteur OCR : image PIL -> texte
+    """
+    name = "base"
+
+    def recognize(self, image: "Image.Image") -> str:
+        raise NotImplementedError
+
+
+class SubprocessEngine(OCREngine):
+    """
+    Tesseract en ligne de commande : PNG temporaire + nouveau processus par image
+    """
+    name = "subprocess"
+
+    def __init__(self, lang: str = OCR_LANG):
+        self.lang = lang
+
+    def recognize(self, image: "Image.Image") -> str:
         # Créer un fichier temporaire
         with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as temp_file:
             temp_path = temp_file.name
-            
-            # Sauvegarder l'image
-            if isinstance(image_data, bytes):
-                image = Image.open(io.BytesIO(image_data))
-            else:
-                image = image_data
-            
+
+        try:
             image.save(temp_path)
-            
-            # Utiliser tesseract directement
             result = subprocess.run(
-                ['tesseract', temp_path, 'stdout', '-l', 'fra'],
+                ['tesseract', temp_path, 'stdout', '-l', self.lang],
                 capture_output=True,
                 text=True,
                 check=True
             )
-            
-            # Nettoyer
-            os.unlink(temp_path)
-            
-            text = result.stdout.strip()
-            return text if text else ""
-            
-    except subprocess.CalledProcessError as e:
-        # Nettoyer en cas d'erreur
-        if 'temp_path' in locals():
+            return result.stdout
+        except subprocess.CalledProcessError as e:
+            raise Exception(f"Erreur Tesseract: {e.stderr}")
+        finally:
             try:
                 os.unlink(temp_path)
-            except:
+            except OSError:
                 pass
-        raise Exception(f"Erreur Tesseract: {e.stderr}")
+
+
+class TesserocrEngine(OCREngine):
+    """
+    API tesseract persistante (tesserocr) : modèle de langue chargé une seule fois
+    par thread (threads d'OCR persistants du processus), l'image est passée directement en mémoire
+    """
+    name = "tesserocr"
+
+    def __init__(self, lang: str = OCR_LANG):
+        import tesserocr
+
+        self._tesserocr = tesserocr
+        self.lang = lang
+        self._local = threading.local()  # PyTessBaseAPI n'est pas thread-safe
+
+    def _api(self):
+        api = getattr(self._local, "api", None)
+        if api is None:
+            api = self._tesserocr.PyTessBaseAPI(lang=self.lang)
+            self._local.api = api
+        return api
+
+    def recognize(self, image: "Image.Image") -> str:
+        api = self._api()
+        api.SetImage(image)
+        try:
+            return api.GetUTF8Text()
+        finally:
+            api.Clear()
+
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def create_engine(name: str = OCR_ENGINE) -> OCREngine:
+    """
+    Construit le moteur OCR demandé (auto : tesserocr si disponible, sinon sous-processus)
+    """
+    if name in ("auto", "tesserocr"):
+        try:
+            return TesserocrEngine()
+        except Exception as e:
+            if name == "tesserocr":
+                raise
+            logger.warning("tesserocr indisponible, repli sur tesseract en sous-processus: %s", e)
+    return SubprocessEngine()
+
+
+def get_engine() -> OCREngine:
+    """
+    Moteur OCR partagé du processus (construit au premier usage)
+    """
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = create_engine()
+    return _engine
+
+
+def extract_text_from_image(image_data, engine=None):
+    """
+    Extrait le texte d'une image en utilisant Tesseract OCR
+    Retourne le texte extrait ou lève une exception en cas d'erreur
+    """
+    # PIL importé à la première image, pas au démarrage de l'application
+    from PIL import Image
+
+    try:
+        with tracing.span("extract_text_from_image") as span:
+            if isinstance(image_data, bytes):
+                span.set_attribute("image.bytes", len(image_data))
+                image = Image.open(io.BytesIO(image_data))
+            else:
+                image = image_data
+
+            engine = engine or get_engine()
+            span.set_attributes({"image.width": image.width, "image.height": image.height, "ocr.engine": engine.name})
+
+            # Concurrence bornée, quel que soit le moteur
+            waited = time.perf_counter()
+            with _tesseract_slots:
+                span.set_attribute("ocr.slot_wait_ms", round((time.perf_counter() - waited) * 1000, 1))
+                text = engine.recognize(image)
+
+            text = text.strip() if text else ""
+            span.set_attribute("text.chars", len(text))
+            return text
+
     except Exception as e:
-        # Nettoyer en cas d'erreur
-        if 'temp_path' in locals():
-            try:
-                os.unlink(temp_path)
-            except:
-                pass
         raise Exception(f"Erreur OCR: {str(e)}")
+
+
+def warm_up() -> None:
+    """
+    Charge PIL et construit le moteur OCR du processus avant la première image
+    """
+    from PIL import Image  # noqa: F401
+
+    get_engine()
@@ -1,80 +1,256 @@
 import io
+import logging
 import tempfile
+import threading
 import os
-from PyPDF2 import PdfReader
-from pdf2image import convert_from_bytes
+from concurrent.futures import ThreadPoolExecutor
+from backend.services import ocr_service
 from backend.services.ocr_service import extract_text_from_image
+from backend.services.validation_service import IMAGE_TYPES, PDF, InvalidDocument, validate_document
+from backend.services.worker_pool import report_progress
+from backend.utils import metrics, tracing
+
+# Nombre de pages OCRisées en parallèle (tesseract tourne en sous-processus, les threads suffisent)
+OCR_PAGE_WORKERS = int(os.getenv("OCR_PAGE_WORKERS", str(os.cpu_count() or 2)))
+
+# Rendu des pages pour l'OCR : résolution, niveaux de gris et nombre de pages max
+PDF_RENDER_DPI = int(os.getenv("PDF_RENDER_DPI", "200"))
+PDF_RENDER_GRAYSCALE = os.getenv("PDF_RENDER_GRAYSCALE", "true").lower() in ("1", "true", "yes")
+PDF_MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", "20"))
+
+# Nombre minimal de caractères embarqués pour qu'une page ne soit pas OCRisée
+PDF_MIN_PAGE_CHARS = int(os.getenv("PDF_MIN_PAGE_CHARS", "50"))
+
+logger = logging.getLogger(__name__)
+
+# Threads d'OCR des pages, conservés d'une requête à l'autre : chaque thread garde
+# son moteur tesseract (tesserocr : langue chargée une seule fois par thread)
+_ocr_executor = None
+_ocr_executor_lock = threading.Lock()
+
+def _get_ocr_executor():
+    global _ocr_executor
+    if _ocr_executor is None:
+        with _ocr_executor_lock:
+            if _ocr_executor is None:
+                _ocr_executor = ThreadPoolExecutor(max_workers=OCR_PAGE_WORKERS, thread_name_prefix="ocr-page")
+    return _ocr_executor
 
 def extract_text_from_file(file):
     """
     Extrait le texte d'un fichier (PDF ou image)
     Retourne le texte extrait ou lève une exception en cas d'erreur
     """
+    with tracing.span("extract_text_from_file"):
+        return extract_text_from_content(file.file.read(), file.filename)
+
+def extract_text_from_content(content, filename):
+    """
+    Extrait le texte du contenu brut d'un fichier (PDF ou image) selon son nom.
+    Fonction de module sérialisable : exécutable dans le pool d'extraction.
+    """
+    return extract_document(content, filename)["text"]
+
+def extract_document(content, filename):
+    """
+    Extrait le texte d'un fichier (PDF ou image) et indique les pages passées à l'OCR.
+    Le type est déterminé par le contenu (pas par l'extension) et validé avant tout rendu.
+    Retourne {"text": str, "ocr_pages": [numéros de page 1-based], "type": type détecté}.
+    """
     try:
-        content = file.file.read()
-        
-        if not content:
-            raise Exception("Fichier vide")
+        with tracing.span("extract_document", **{"file.bytes": len(content or b""), "file.name": filename}) as span:
+            if not content:
+                raise InvalidDocument("Fichier vide", 400)
             
-        filename = file.filename.lower() if file.filename else ""
-        
-        if filename.endswith(".pdf"):
-            return _extract_from_pdf(content)
-        elif filename.endswith(('.png', '.jpg', '.jpeg')):
-            return extract_text_from_image(content)
-        else:
-            raise Exception(f"Type de fichier non supporté: {filename}")
+            # Contrôles peu coûteux (type réel, pages, dimensions) : rien n'est rendu ni OCRisé si refusé
+            with metrics.timed("validate_upload"):
+                info = validate_document(content, PDF_RENDER_DPI)
+            span.set_attributes({"file.type": info["type"], "pdf.page_count": info.get("pages")})
+            
+            if info["type"] == PDF:
+                text, ocr_pages = _extract_from_pdf(content)
+            elif info["type"] in IMAGE_TYPES:
+                report_progress("ocr_fallback", {"pages": [1]})
+                with metrics.timed("ocr_page"):
+                    text = extract_text_from_image(content)
+                metrics.count("ocr_pages")
+                ocr_pages = [1]
+                report_progress("page_extracted", {"page": 1, "method": "ocr"})
+            else:
+                raise InvalidDocument(f"Type de fichier non supporté: {info['type']}", 415)
+            
+            span.set_attributes({"text.chars": len(text), "ocr.page_count": len(ocr_pages)})
+            return {"text": text, "ocr_pages": ocr_pages, "type": info["type"]}
             
+    except InvalidDocument as e:
+        metrics.count("invalid_documents", labels=(str(e.status_code),))
+        raise
     except Exception as e:
         raise Exception(f"Erreur lors de l'extraction du texte: {str(e)}")
 
-def _extract_from_pdf(content):
+def _read_pdf_pages(content):
     """
-    Extrait le texte d'un PDF avec fallback OCR
+    Lit le texte embarqué page par page.
+    Retourne ({page: texte}, pages à OCRiser) ; pages à OCRiser = None si le PDF est illisible.
     """
+    # Pile PDF importée à la première extraction, pas au démarrage de l'application
+    from PyPDF2 import PdfReader
+
+    page_texts = {}
+    ocr_pages = []
+    
     try:
-        # Essayer l'extraction directe du texte d'abord
-        reader = PdfReader(io.BytesIO(content))
-        text_parts = []
+        with metrics.timed("pdf_text"):
+            reader = PdfReader(io.BytesIO(content))
+            
+            for page_num, page in enumerate(reader.pages, start=1):
+                try:
+                    page_text = (page.extract_text() or "").strip()
+                except Exception as e:
+                    logger.warning("Erreur extraction page %s: %s", page_num, e)
+                    page_text = ""
+                
+                if len(page_text) >= PDF_MIN_PAGE_CHARS:
+                    page_texts[page_num] = page_text
+                else:
+                    ocr_pages.append(page_num)
+                
+    except Exception as e:
+        logger.warning("Erreur extraction PDF directe, OCR de toutes les pages: %s", e)
+        # PDF illisible par PyPDF2 : OCR de toutes les pages
+        return {}, None
+    
+    tracing.current_span().set_attribute("pdf.page_count", len(page_texts) + len(ocr_pages))
+    return page_texts, ocr_pages
+
+def _extract_from_pdf(content):
+    """
+    Extrait le texte d'un PDF, page par page : le texte embarqué est conservé
+    quand il est suffisant, seules les autres pages sont rendues et OCRisées.
+    Retourne (texte, pages OCRisées).
+    """
+    with tracing.span("extract_pdf", **{"file.bytes": len(content)}) as span:
+        page_texts, ocr_pages = _read_pdf_pages(content)
+        span.set_attribute("pdf.embedded_text_pages", len(page_texts))
+        for page_num in sorted(page_texts):
+            report_progress("page_extracted", {"page": page_num, "method": "text"})
         
-        for page_num, page in enumerate(reader.pages):
+        if ocr_pages is None or ocr_pages:
+            metrics.count("ocr_fallbacks")
+            report_progress("ocr_fallback", {"pages": ocr_pages if ocr_pages is not None else "all"})
             try:
-                page_text = page.extract_text()
-                if page_text and page_text.strip():
-                    text_parts.append(page_text.strip())
+                ocr_texts = _ocr_pdf_pages(content, pages=ocr_pages)
             except Exception as e:
-                print(f"Erreur extraction page {page_num}: {e}")
-                continue
+                if not page_texts:
+                    raise Exception(f"Erreur lors du traitement du PDF: {str(e)}")
+                # Garder le texte embarqué des autres pages
+                logger.warning("Erreur OCR des pages sans texte: %s", e)
+                ocr_texts = {}
+            
+            page_texts.update({page_num: text for page_num, text in ocr_texts.items() if text})
+            ocr_pages = sorted(ocr_texts)
         
-        if text_parts:
-            full_text = "\n".join(text_parts)
-            if len(full_text.strip()) > 50:  # Si on a assez de texte
-                return full_text.strip()
+        if not page_texts:
+            raise Exception("Aucun texte trouvé dans le PDF même avec OCR")
         
-        # Fallback: OCR sur les images du PDF
-        return _pdf_ocr_fallback(content)
+        return "\n".join(page_texts[page_num] for page_num in sorted(page_texts)), ocr_pages
+
+def _page_runs(pages):
+    """
+    Regroupe des numéros de page triés en plages contiguës (first, last)
+    """
+    runs = []
+    for page_num in pages:
+        if runs and runs[-1][1] == page_num - 1:
+            runs[-1][1] = page_num
+        else:
+            runs.append([page_num, page_num])
+    return runs
+
+def _render_pages(content, window=1, pages=None):
+    """
+    Rend les pages d'un PDF par fenêtres de `window` pages (générateur).
+    `pages` : numéros 1-based à rendre (toutes si None).
+    Seule une fenêtre d'images est en mémoire à la fois, quel que soit le nombre de pages.
+    """
+    from pdf2image import convert_from_path, pdfinfo_from_path
+
+    with tempfile.NamedTemporaryFile(suffix=".pdf") as pdf_file:
+        # Écrire le PDF une seule fois, chaque fenêtre est rendue depuis ce fichier
+        pdf_file.write(content)
+        pdf_file.flush()
         
+        page_count = pdfinfo_from_path(pdf_file.name)["Pages"]
+        if pages is None:
+            pages = range(1, page_count + 1)
+        pages = [page_num for page_num in pages if page_num <= page_count]
+        tracing.current_span().set_attribute("pdf.page_count", page_count)
+        if len(pages) > PDF_MAX_PAGES:
+            logger.info("%s pages à OCRiser: limité aux %s premières", len(pages), PDF_MAX_PAGES)
+            pages = pages[:PDF_MAX_PAGES]
+        
+        for start in range(0, len(pages), window):
+            rendered = []
+            with metrics.timed("pdf_render"), tracing.span(
+                "pdf_render", **{"pdf.pages": len(pages[start:start + window]), "pdf.dpi": PDF_RENDER_DPI,
+                                 "pdf.grayscale": PDF_RENDER_GRAYSCALE},
+            ):
+                for first_page, last_page in _page_runs(pages[start:start + window]):
+                    images = convert_from_path(
+                        pdf_file.name,
+                        dpi=PDF_RENDER_DPI,
+                        grayscale=PDF_RENDER_GRAYSCALE,
+                        first_page=first_page,
+                        last_page=last_page,
+                    )
+                    rendered.extend(zip(range(first_page, last_page + 1), images))
+            yield rendered
+            del rendered
+
+def _ocr_page(numbered_image):
+    """
+    OCR d'une page rendue ; retourne "" en cas d'échec pour ne pas perdre les autres pages
+    """
+    page_num, image = numbered_image
+    try:
+        with metrics.timed("ocr_page"), tracing.span("ocr_page", **{"pdf.page": page_num}):
+            page_text = extract_text_from_image(image)
+        metrics.count("ocr_pages")
+        return page_text.strip() if page_text else ""
     except Exception as e:
-        print(f"Erreur extraction PDF directe: {e}")
-        # Fallback: OCR
-        return _pdf_ocr_fallback(content)
+        logger.warning("Erreur OCR page %s: %s", page_num, e)
+        return ""
+
+def _ocr_pdf_pages(content, pages=None, parallel=True):
+    """
+    OCR des pages demandées (toutes si None) : rendu fenêtre par fenêtre,
+    pages d'une fenêtre OCRisées en parallèle par les threads persistants du processus
+    (séquentiellement dans le thread appelant si `parallel` est faux). Retourne {page: texte}.
+    Chaque page OCRisée est signalée (report_progress), dans l'ordre des pages.
+    """
+    workers = OCR_PAGE_WORKERS if parallel else 1
+    page_texts = {}
+    
+    with tracing.span("ocr_pdf_pages", **{"pdf.dpi": PDF_RENDER_DPI, "ocr.workers": workers}) as span:
+        # Spans des pages (threads) rattachés à ce span
+        ocr_page = tracing.in_current_context(_ocr_page)
+        ocr_map = _get_ocr_executor().map if parallel else map
+        for window in _render_pages(content, window=workers, pages=pages):
+            for (page_num, _), text in zip(window, ocr_map(ocr_page, window)):
+                page_texts[page_num] = text
+                report_progress("page_extracted", {"page": page_num, "method": "ocr"})
+        span.set_attribute("ocr.page_count", len(page_texts))
+    
+    return page_texts
 
-def _pdf_ocr_fallback(content):
+def _pdf_ocr_fallback(content, parallel=True):
     """
-    Fallback OCR pour les PDF
+    Fallback OCR pour les PDF : toutes les pages, ordre conservé
     """
     try:
-        images = convert_from_bytes(content)
-        text_parts = []
-        
-        for i, image in enumerate(images):
-            try:
-                page_text = extract_text_from_image(image)
-                if page_text and page_text.strip():
-                    text_parts.append(page_text.strip())
-            except Exception as e:
-                print(f"Erreur OCR page {i}: {e}")
-                continue
+        with tracing.span("pdf_ocr_fallback", **{"file.bytes": len(content)}):
+            page_texts = _ocr_pdf_pages(content, parallel=parallel)
+        text_parts = [page_texts[page_num] for page_num in sorted(page_texts) if page_texts[page_num]]
         
         if text_parts:
             return "\n".join(text_parts)
@@ -83,3 +259,14 @@ def _pdf_ocr_fallback(content):
             
     except Exception as e:
         raise Exception(f"Erreur lors du traitement du PDF: {str(e)}")
+
+def warm_up():
+    """
+    Charge la pile PDF/OCR (PyPDF2, pdf2image, PIL, moteur OCR) avant la première extraction.
+    Fonction de module sérialisable : exécutable dans le pool d'extraction.
+    """
+    import PyPDF2  # noqa: F401
+    import pdf2image  # noqa: F401
+
+    ocr_service.warm_up()
+    _get_ocr_executor()
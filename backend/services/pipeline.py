@@ -0,0 +1,465 @@
+import asyncio
+import json
+import logging
+import os
+import time
+from contextlib import contextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
+
+from backend.services.admission import ServiceOverloaded
+from backend.services.cache_service import hash_bytes, hash_text, get_cached_result, store_result
+from backend.services.llm_providers import model_label
+from backend.services.llm_service import (
+    ANALYSIS_MODE, _analyze_with_llm, _build_prompt, _clean_text, _FieldScanner, _cv_gate,
+    _extract_json_from_response, _fast_path, _get_empty_result, _get_fallback_result, _get_llm,
+    _get_not_cv_result, _is_empty_cv_result, _validate_and_clean_result,
+)
+from backend.services import pdf_service
+from backend.services.pdf_service import extract_document
+from backend.services.validation_service import InvalidDocument, check_type
+from backend.services.worker_pool import EXTRACTION_WORKERS, run_extraction, stream_extraction
+from backend.utils import metrics, tracing
+from backend.utils.cleaner import clean_cv_text
+from backend.utils.compactor import compact_cv_text, output_token_budget
+from backend.utils.logging_config import log_payload, sample_payload
+from backend.utils.metrics import NON_CV_REJECTIONS
+
+# Préchargement au démarrage (surchargé via l'environnement) : none | all | liste parmi llm, extraction
+WARMUP = os.getenv("WARMUP", "none")
+WARMUP_TARGETS = ("llm", "extraction")
+
+logger = logging.getLogger(__name__)
+
+Event = Tuple[str, Dict[str, Any]]
+
+
+class AnalysisContext:
+    """
+    État d'une analyse transmis d'une étape à l'autre.
+    Une étape qui renseigne `result` (cache, rejet, erreur) termine l'analyse.
+    """
+
+    def __init__(
+        self,
+        filename: Optional[str] = None,
+        content: Optional[bytes] = None,
+        text: Optional[str] = None,
+        mode: Optional[str] = None,
+        provider: Optional[str] = None,
+        model: Optional[str] = None,
+    ):
+        self.filename = filename
+        self.content = content
+        self.text = text
+        self.mode = mode or ANALYSIS_MODE
+        self.provider = provider
+        self.model = model
+        self.type: Optional[str] = None  # type réel du document (ingest)
+        self.ocr_pages: Optional[List[int]] = None  # pages OCRisées (extract)
+        self.prompt_text: Optional[str] = None  # texte compacté envoyé à l'IA (clean)
+        self.token_stats: Dict[str, int] = {}
+        self.gate: Optional[str] = None  # pass | override (classify)
+        self.analysis: Optional[Dict[str, Any]] = None  # champs bruts, IA ou extraction locale (analyze)
+        self.llm: Optional[str] = None  # "fournisseur/modèle" si l'analyse vient de l'IA
+        self.tokens: Dict[str, int] = {}
+        self.result: Optional[Dict[str, Any]] = None
+        self.cache_keys: List[str] = []
+
+
+class Stage:
+    """
+    Étape du pipeline. Chaque étape est chronométrée (métrique cv_stage_seconds, span "pipeline.<nom>")
+    et peut déclarer une clé de cache : le résultat final y est cherché avant l'étape, puis stocké.
+    """
+
+    name = "stage"
+
+    def cache_key(self, ctx: AnalysisContext) -> Optional[str]:
+        """
+        Clé de cache du résultat final pour l'entrée de cette étape (None : pas de cache)
+        """
+        return None
+
+    async def run(self, ctx: AnalysisContext) -> None:
+        raise NotImplementedError
+
+    async def stream(self, ctx: AnalysisContext) -> AsyncIterator[Event]:
+        """
+        Variante avec événements de progression (par défaut : aucun)
+        """
+        await self.run(ctx)
+        return
+        yield
+
+
+class IngestStage(Stage):
+    """
+    Contenu non vide et de type pris en charge (premiers octets) ; cache par fichier
+    """
+
+    name = "ingest"
+
+    def cache_key(self, ctx):
+        return hash_bytes(ctx.content, model_label(ctx.provider, ctx.model))
+
+    async def run(self, ctx):
+        if not ctx.content:
+            raise InvalidDocument("Fichier vide", 400)
+        # Format non reconnu : refusé avant d'occuper une place du pool d'extraction
+        ctx.type = check_type(ctx.content)
+
+
+class ExtractStage(Stage):
+    """
+    Texte du document (texte embarqué, OCR en repli) extrait dans le pool de workers
+    """
+
+    name = "extract"
+
+    async def run(self, ctx):
+        extraction = await run_extraction(extract_document, ctx.content, ctx.filename)
+        self._extracted(ctx, extraction["text"], extraction["ocr_pages"])
+
+    async def stream(self, ctx):
+        # Une seule tâche d'extraction (validation, texte embarqué, rendu et OCR par fenêtres),
+        # mêmes replis que run ; progression relayée page par page
+        async for event, data in stream_extraction(extract_document, ctx.content, ctx.filename):
+            if event == "result":
+                self._extracted(ctx, data["text"], data["ocr_pages"])
+            else:
+                yield event, data
+
+    @staticmethod
+    def _extracted(ctx, text: str, ocr_pages: List[int]) -> None:
+        if not text or not text.strip():
+            raise InvalidDocument(
+                "Aucun texte extrait du document. Vérifiez que le fichier est lisible (PDF avec texte ou image claire).", 400,
+            )
+        ctx.text = text
+        ctx.ocr_pages = ocr_pages
+
+
+class CleanStage(Stage):
+    """
+    Normalisation du texte (classification, extraction locale) puis version compactée
+    selon le budget de tokens et débarrassée des caractères parasites pour l'IA
+    """
+
+    name = "clean"
+
+    async def run(self, ctx):
+        ctx.text = clean_cv_text(ctx.text or "")
+        if not ctx.text:
+            ctx.result = _get_empty_result("Aucun texte à analyser")
+            return
+
+        # Compacter avant le nettoyage pour l'IA, qui supprime les sauts de ligne
+        compacted_text, ctx.token_stats = compact_cv_text(ctx.text)
+        ctx.prompt_text = _clean_text(compacted_text)
+        tracing.current_span().set_attributes({
+            "text.chars": len(ctx.text),
+            "llm.tokens_before": ctx.token_stats["tokens_before"],
+            "llm.tokens_after": ctx.token_stats["tokens_after"],
+        })
+
+
+class ClassifyStage(Stage):
+    """
+    Rejet des non-CV avant tout appel IA, puis chemin rapide local (modes fast/hybrid)
+    """
+
+    name = "classify"
+
+    async def run(self, ctx):
+        ctx.gate = _cv_gate(ctx.text, ctx.filename)
+        if ctx.gate == "reject":
+            ctx.result = _get_not_cv_result()
+            return
+        # Résultat local sûr : l'étape analyze n'appelle pas l'IA
+        ctx.analysis = _fast_path(ctx.text, ctx.mode)
+
+
+class AnalyzeStage(Stage):
+    """
+    Extraction des champs par le fournisseur LLM ; cache par texte compacté et modèle
+    """
+
+    name = "analyze"
+
+    def cache_key(self, ctx):
+        if ctx.analysis is not None:
+            return None
+        return hash_text(ctx.prompt_text, model_label(ctx.provider, ctx.model))
+
+    def _prepare(self, ctx):
+        """
+        Fournisseur et budget de réponse, ou None si l'appel IA n'a pas lieu
+        """
+        if ctx.analysis is not None:
+            return None
+        if len(ctx.prompt_text) < 20:
+            ctx.result = _get_empty_result("Texte trop court pour l'analyse")
+            return None
+        try:
+            llm, model = _get_llm(ctx.provider, ctx.model)
+        except Exception as e:
+            logger.error("Fournisseur LLM non initialisé: %s", e)
+            ctx.result = _get_empty_result(f"Fournisseur LLM non initialisé: {e}")
+            return None
+        # Réponse dimensionnée selon la taille du CV plutôt qu'un max_tokens fixe
+        max_tokens = output_token_budget(ctx.token_stats["tokens_after"])
+        ctx.llm = f"{llm.name}/{model}"
+        ctx.tokens = {**ctx.token_stats, "max_tokens": max_tokens}
+        return llm, model, max_tokens
+
+    async def run(self, ctx):
+        prepared = self._prepare(ctx)
+        if prepared is None:
+            return
+        llm, model, max_tokens = prepared
+        logger.info("Appel LLM", extra={"provider": llm.name, "model": model, **ctx.tokens})
+
+        # Contenus volumineux (données personnelles) journalisés seulement pour un échantillon de requêtes
+        sampled = sample_payload()
+        try:
+            ctx.analysis, usage = await _analyze_with_llm(llm, model, ctx.prompt_text, max_tokens=max_tokens, sampled=sampled)
+        except ServiceOverloaded:
+            # Surcharge : rejet explicite (503) plutôt qu'un résultat dégradé
+            raise
+        except Exception as e:
+            logger.error("Erreur analyse IA: %s", e)
+            ctx.result = _get_fallback_result(ctx.text, str(e))
+            return
+        ctx.tokens.update(usage)
+        log_payload(logger, "Résultat IA", ctx.analysis, sampled)
+
+    async def stream(self, ctx):
+        prepared = self._prepare(ctx)
+        if prepared is None:
+            return
+        llm, model, max_tokens = prepared
+        yield "llm_started", {"provider": llm.name, "model": model, **ctx.tokens}
+
+        try:
+            scanner = _FieldScanner()
+            emitted = set()
+            async for delta in llm.stream(_build_prompt(ctx.prompt_text), model, max_tokens):
+                # Émettre chaque champ de premier niveau dès qu'il est complet
+                for key, value in scanner.feed(delta).items():
+                    if key not in emitted:
+                        emitted.add(key)
+                        yield "partial", {key: value}
+
+            json_text = _extract_json_from_response(scanner.text)
+            if not json_text:
+                raise Exception("Impossible d'extraire le JSON de la réponse")
+            ctx.analysis = json.loads(json_text)
+        except ServiceOverloaded:
+            raise
+        except Exception as e:
+            logger.error("Erreur analyse IA (flux): %s", e)
+            ctx.result = _get_fallback_result(ctx.text, str(e))
+
+
+class ValidateStage(Stage):
+    """
+    Schéma du résultat garanti, et rejet des résultats sans aucune information de CV
+    """
+
+    name = "validate"
+
+    async def run(self, ctx):
+        if ctx.llm is None:
+            # Extraction locale : déjà au format du résultat
+            result = ctx.analysis
+        else:
+            result = _validate_and_clean_result(ctx.analysis)
+
+        if _is_empty_cv_result(result):
+            if ctx.llm is not None:
+                NON_CV_REJECTIONS.labels("llm").inc()
+            ctx.result = _get_not_cv_result()
+            return
+
+        if ctx.gate == "override":
+            logger.warning("Faux négatif du filtre CV confirmé par l'IA", extra={"upload_name": ctx.filename})
+
+        if ctx.llm is not None:
+            result["llm"] = ctx.llm
+            result["from_cache"] = False
+            result["tokens"] = ctx.tokens
+        ctx.result = result
+
+
+class Limited(Stage):
+    """
+    Étape exécutée au plus par N analyses simultanées (sémaphore partagé, ex: lot de fichiers)
+    """
+
+    def __init__(self, stage: Stage, slots):
+        self.stage = stage
+        self.slots = slots
+        self.name = stage.name
+
+    def cache_key(self, ctx):
+        return self.stage.cache_key(ctx)
+
+    async def run(self, ctx):
+        async with self.slots:
+            await self.stage.run(ctx)
+
+    async def stream(self, ctx):
+        async with self.slots:
+            async for event in self.stage.stream(ctx):
+                yield event
+
+
+@contextmanager
+def _measured(stage: Stage):
+    with metrics.timed(stage.name), tracing.span("pipeline." + stage.name):
+        yield
+
+
+class Pipeline:
+    """
+    Suite d'étapes exécutées dans l'ordre jusqu'au résultat.
+    Une étape est remplaçable par nom (`replace`) sans modifier les autres.
+    """
+
+    def __init__(self, stages: Sequence[Stage]):
+        self.stages = list(stages)
+
+    def stage(self, name: str) -> Stage:
+        for stage in self.stages:
+            if stage.name == name:
+                return stage
+        raise KeyError(f"Étape inconnue: {name}")
+
+    def replace(self, name: str, stage: Stage) -> "Pipeline":
+        """
+        Copie du pipeline où l'étape `name` est remplacée par `stage`
+        """
+        self.stage(name)
+        return Pipeline([stage if current.name == name else current for current in self.stages])
+
+    def limit(self, name: str, slots) -> "Pipeline":
+        """
+        Copie du pipeline où l'étape `name` est bornée par le sémaphore `slots`
+        """
+        return self.replace(name, Limited(self.stage(name), slots))
+
+    def _pending(self, ctx: AnalysisContext):
+        """
+        Étapes restant à exécuter ; consulte au passage le cache déclaré par chaque étape
+        """
+        for stage in self.stages:
+            if ctx.result is not None:
+                return
+            key = stage.cache_key(ctx)
+            if key is not None:
+                cached = get_cached_result(key)
+                if cached is not None:
+                    ctx.result = cached
+                    return
+                ctx.cache_keys.append(key)
+            yield stage
+
+    def _finish(self, ctx: AnalysisContext) -> Dict[str, Any]:
+        if ctx.result is None:
+            raise RuntimeError("Pipeline terminé sans résultat")
+        if ctx.ocr_pages is not None and "error" not in ctx.result:
+            # Pages passées à l'OCR (le reste provient du texte embarqué)
+            ctx.result["ocr_pages"] = ctx.ocr_pages
+        for key in ctx.cache_keys:
+            store_result(key, ctx.result)
+        return ctx.result
+
+    async def run(self, ctx: AnalysisContext) -> Dict[str, Any]:
+        for stage in self._pending(ctx):
+            with _measured(stage):
+                await stage.run(ctx)
+        return self._finish(ctx)
+
+    async def stream(self, ctx: AnalysisContext) -> AsyncIterator[Event]:
+        """
+        Exécution avec événements de progression des étapes, puis ("result", résultat final)
+        """
+        for stage in self._pending(ctx):
+            with _measured(stage):
+                async for event in stage.stream(ctx):
+                    yield event
+        yield "result", self._finish(ctx)
+
+
+# Pipelines partagés par toutes les routes (et par les deux déploiements, Docker et Vercel)
+text_pipeline = Pipeline([CleanStage(), ClassifyStage(), AnalyzeStage(), ValidateStage()])
+document_pipeline = Pipeline([IngestStage(), ExtractStage(), *text_pipeline.stages])
+
+
+async def analyze_text(
+    text: str,
+    mode: Optional[str] = None,
+    filename: Optional[str] = None,
+    provider: Optional[str] = None,
+    model: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Analyse un texte de CV : clean → classify → analyze → validate
+    """
+    return await text_pipeline.run(AnalysisContext(filename, text=text, mode=mode, provider=provider, model=model))
+
+
+async def analyze_file(
+    filename: str,
+    content: bytes,
+    mode: Optional[str] = None,
+    provider: Optional[str] = None,
+    model: Optional[str] = None,
+    pipeline: Pipeline = document_pipeline,
+) -> Dict[str, Any]:
+    """
+    Analyse un fichier (PDF ou image) : ingest → extract → clean → classify → analyze → validate.
+    Lève InvalidDocument (fichier refusé ou sans texte) et ServiceOverloaded.
+    """
+    return await pipeline.run(AnalysisContext(filename, content, mode=mode, provider=provider, model=model))
+
+
+def stream_file(
+    filename: str,
+    content: bytes,
+    mode: Optional[str] = None,
+    provider: Optional[str] = None,
+    model: Optional[str] = None,
+) -> AsyncIterator[Event]:
+    """
+    Variante en flux d'analyze_file : page_extracted, ocr_fallback, llm_started, partial, puis result
+    """
+    return document_pipeline.stream(AnalysisContext(filename, content, mode=mode, provider=provider, model=model))
+
+
+async def warm_up(targets: str = WARMUP) -> Dict[str, Any]:
+    """
+    Charge à l'avance ce que la première requête paierait sinon : "llm" (SDK et client
+    du fournisseur par défaut, sans appel réseau), "extraction" (pile PDF/OCR de chaque worker).
+    Sans warm-up, ces modules ne sont importés qu'à la première requête qui en a besoin.
+    Retourne la durée (ms) ou l'erreur de chaque cible.
+    """
+    names = WARMUP_TARGETS if targets == "all" else [name.strip() for name in targets.split(",") if name.strip() not in ("", "none")]
+    report: Dict[str, Any] = {}
+    for name in names:
+        started = time.perf_counter()
+        try:
+            if name == "llm":
+                _get_llm()
+            elif name == "extraction":
+                # Une tâche par worker : chaque processus du pool charge sa propre pile
+                await asyncio.gather(*(run_extraction(pdf_service.warm_up) for _ in range(EXTRACTION_WORKERS)))
+            else:
+                raise ValueError(f"Cible de warm-up inconnue: {name}")
+            report[name] = {"ms": round((time.perf_counter() - started) * 1000, 1)}
+        except Exception as e:
+            logger.warning("Warm-up '%s' échoué: %s", name, e)
+            report[name] = {"error": str(e)}
+    if report:
+        logger.info("Warm-up terminé", extra={"warmup": report})
+    return report
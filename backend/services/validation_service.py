@@ -0,0 +1,141 @@
+import io
+import os
+import zipfile
+from typing import Any, Dict, Optional
+
+# Budgets vérifiés avant toute extraction (surchargés via l'environnement)
+DOCUMENT_MAX_PAGES = int(os.getenv("DOCUMENT_MAX_PAGES", "50"))  # pages max d'un PDF accepté
+IMAGE_MAX_PIXELS = int(os.getenv("IMAGE_MAX_PIXELS", str(50_000_000)))  # ~ A4 à 600 DPI : 35 Mpx
+# Pixels max d'une page PDF une fois rendue pour l'OCR (page géante = bombe de rendu)
+PDF_MAX_PAGE_PIXELS = int(os.getenv("PDF_MAX_PAGE_PIXELS", str(IMAGE_MAX_PIXELS)))
+
+# Types détectés par leurs premiers octets, pas par l'extension du nom de fichier
+PDF, PNG, JPEG, TIFF, DOCX = "pdf", "png", "jpeg", "tiff", "docx"
+IMAGE_TYPES = (PNG, JPEG, TIFF)
+
+# Le marqueur %PDF- peut être précédé d'octets parasites (toléré par les lecteurs)
+_PDF_HEADER_WINDOW = 1024
+
+
+class InvalidDocument(ValueError):
+    """
+    Document refusé avant extraction : format non reconnu, corrompu ou hors budget
+    """
+
+    def __init__(self, message: str, status_code: int = 422):
+        super().__init__(message)
+        self.status_code = status_code
+
+    def __reduce__(self):
+        # Sérialisable tel quel depuis un processus du pool d'extraction
+        return (InvalidDocument, (str(self), self.status_code))
+
+
+def sniff_type(content: bytes) -> Optional[str]:
+    """
+    Type réel du document d'après ses premiers octets (None si non reconnu)
+    """
+    head = bytes(content[:8])
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return PNG
+    if head.startswith(b"\xff\xd8\xff"):
+        return JPEG
+    if head.startswith((b"II*\x00", b"MM\x00*")):
+        return TIFF
+    if head.startswith(b"PK\x03\x04"):
+        try:
+            with zipfile.ZipFile(io.BytesIO(content)) as archive:
+                if "word/document.xml" in archive.namelist():
+                    return DOCX
+        except zipfile.BadZipFile:
+            pass
+        return None
+    if b"%PDF-" in content[:_PDF_HEADER_WINDOW]:
+        return PDF
+    return None
+
+
+def check_type(content: bytes) -> str:
+    """
+    Type réel d'un document pris en charge ; lève InvalidDocument (415) sinon.
+    Quelques octets lus : utilisable dans les routes avant la mise en file d'extraction.
+    """
+    kind = sniff_type(content)
+    if kind is None:
+        raise InvalidDocument("Format de fichier non reconnu (PDF, PNG, JPEG ou TIFF attendu)", 415)
+    if kind == DOCX:
+        raise InvalidDocument("Documents Word non pris en charge : exportez le CV en PDF", 415)
+    return kind
+
+
+def validate_document(content: bytes, render_dpi: int) -> Dict[str, Any]:
+    """
+    Contrôles peu coûteux avant extraction : type réel, pages, dimensions et budget de rendu.
+    Retourne {"type", "pages"} (PDF) ou {"type", "width", "height"} (image) ;
+    lève InvalidDocument sans rien rendre ni OCRiser.
+    """
+    kind = check_type(content)
+    if kind == PDF:
+        return {"type": PDF, "pages": _check_pdf(content, render_dpi)}
+    width, height = _check_image(content)
+    return {"type": kind, "width": width, "height": height}
+
+
+def _check_pdf(content: bytes, render_dpi: int) -> int:
+    """
+    Nombre de pages et taille de chaque page, lus dans l'arbre des pages (sans décoder leur contenu)
+    """
+    # Importés au premier document : sniff_type/check_type restent utilisables sans la pile PDF/image
+    from PyPDF2 import PdfReader
+
+    try:
+        reader = PdfReader(io.BytesIO(content))
+        if reader.is_encrypted and not reader.decrypt(""):
+            raise InvalidDocument("PDF protégé par mot de passe")
+        pages = reader.pages
+        page_count = len(pages)
+    except InvalidDocument:
+        raise
+    except Exception as e:
+        raise InvalidDocument(f"PDF illisible ou corrompu: {e}")
+
+    if page_count == 0:
+        raise InvalidDocument("PDF sans aucune page")
+    if page_count > DOCUMENT_MAX_PAGES:
+        raise InvalidDocument(f"PDF trop long ({page_count} pages, max {DOCUMENT_MAX_PAGES})", 413)
+
+    scale = render_dpi / 72
+    for page_num, page in enumerate(pages, start=1):
+        try:
+            box = page.mediabox
+            pixels = float(box.width) * scale * float(box.height) * scale
+        except Exception:
+            # Boîte absente ou invalide : poppler applique le format par défaut
+            continue
+        if pixels > PDF_MAX_PAGE_PIXELS:
+            raise InvalidDocument(
+                f"Page {page_num} trop grande pour être rendue ({pixels / 1e6:.0f} Mpx à {render_dpi} DPI)", 413,
+            )
+    return page_count
+
+
+def _check_image(content: bytes):
+    """
+    Dimensions lues dans l'en-tête de l'image (aucun pixel décodé) : refus des bombes de décompression
+    """
+    from PIL import Image
+
+    try:
+        with Image.open(io.BytesIO(content)) as image:
+            width, height = image.size
+            frames = getattr(image, "n_frames", 1)
+    except Image.DecompressionBombError as e:
+        raise InvalidDocument(f"Image trop grande: {e}", 413)
+    except Exception as e:
+        raise InvalidDocument(f"Image illisible ou corrompue: {e}")
+
+    if width * height > IMAGE_MAX_PIXELS:
+        raise InvalidDocument(f"Image trop grande ({width}x{height}, max {IMAGE_MAX_PIXELS / 1e6:.0f} Mpx)", 413)
+    if frames > 1:
+        raise InvalidDocument("Images multipages non prises en charge : exportez le CV en PDF", 415)
+    return width, height
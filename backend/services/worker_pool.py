@@ -0,0 +1,254 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+import threading
+import uuid
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Callable, Dict, Optional, Tuple
+
+from backend.services import ocr_service
+from backend.services.admission import AdmissionGate, ServiceOverloaded
+from backend.utils import metrics, tracing
+from backend.utils.logging_config import setup_logging
+
+# Configuration du pool d'extraction (surchargée via l'environnement)
+EXTRACTION_POOL = os.getenv("EXTRACTION_POOL", "process")  # process | thread
+EXTRACTION_WORKERS = int(os.getenv("EXTRACTION_WORKERS", str(os.cpu_count() or 2)))
+EXTRACTION_QUEUE_SIZE = int(os.getenv("EXTRACTION_QUEUE_SIZE", "32"))  # tâches en attente max
+
+# Attente des derniers événements de progression une fois le résultat reçu (secondes)
+_PROGRESS_DRAIN_TIMEOUT = 5
+
+_executor: Optional[Executor] = None
+_executor_lock = threading.Lock()
+# Événements de progression des processus workers vers le parent (file partagée à la création du pool)
+_progress_queue = None
+_progress_thread: Optional[threading.Thread] = None
+# Destinataires des événements de progression, par tâche (stream_extraction)
+_progress_listeners: Dict[str, Callable[[str, Any], None]] = {}
+# Émetteur de la tâche en cours d'exécution (report_progress)
+_progress_sink: ContextVar[Optional[Callable[[str, Any], None]]] = ContextVar("extraction_progress", default=None)
+
+logger = logging.getLogger(__name__)
+
+
+class ExtractionQueueFull(ServiceOverloaded):
+    """
+    Levée quand la file d'attente d'extraction est pleine
+    """
+
+
+# Extractions en cours ou en attente d'un worker
+extraction_gate = AdmissionGate("extraction", EXTRACTION_WORKERS + EXTRACTION_QUEUE_SIZE, ExtractionQueueFull)
+
+
+def report_progress(event: str, data: Any) -> None:
+    """
+    Émet un événement de progression depuis une fonction d'extraction
+    (transmis par stream_extraction ; sans effet sinon)
+    """
+    sink = _progress_sink.get()
+    if sink is not None:
+        sink(event, data)
+
+
+@contextmanager
+def _reporting(progress_id: Optional[str], send: Callable[[Tuple[str, Optional[str], Any]], None]):
+    """
+    Branche report_progress sur `send` pendant la tâche, puis envoie le marqueur de fin (événement None)
+    """
+    if progress_id is None:
+        yield
+        return
+    token = _progress_sink.set(lambda event, data: send((progress_id, event, data)))
+    try:
+        yield
+    finally:
+        _progress_sink.reset(token)
+        send((progress_id, None, None))
+
+
+def _dispatch_progress(item: Tuple[str, Optional[str], Any]) -> None:
+    progress_id, event, data = item
+    listener = _progress_listeners.get(progress_id)
+    if listener is not None:
+        listener(event, data)
+
+
+def _forward_progress(progress_queue) -> None:
+    """
+    Thread du parent : relaie les événements des processus workers jusqu'à l'arrêt du pool (None)
+    """
+    while True:
+        item = progress_queue.get()
+        if item is None:
+            return
+        _dispatch_progress(item)
+
+
+def _init_worker(tesseract_slots, progress_queue) -> None:
+    """
+    Initialisation d'un processus worker : sémaphore tesseract partagé entre processus, file de
+    progression, logs JSON, traces
+    """
+    global _progress_queue
+    setup_logging()
+    tracing.setup_tracing()
+    ocr_service.set_tesseract_slots(tesseract_slots)
+    _progress_queue = progress_queue
+
+
+def _run_recorded(func: Callable, trace_context: Dict[str, str], progress_id: Optional[str], *args: Any):
+    """
+    Exécuté dans un processus worker : retourne le résultat et les mesures à publier dans le parent ;
+    les spans sont rattachés à la requête d'origine et exportés par le worker
+    """
+    try:
+        with metrics.recording() as events, tracing.extracted(trace_context), _reporting(progress_id, _progress_queue.put):
+            result = func(*args)
+    finally:
+        tracing.flush()
+    return result, events
+
+
+def _run_reporting(func: Callable, progress_id: str, *args: Any):
+    """
+    Exécuté dans un thread du pool : événements de progression remis directement aux destinataires
+    """
+    with _reporting(progress_id, _dispatch_progress):
+        return func(*args)
+
+
+def _create_executor() -> Executor:
+    """
+    Crée le pool configuré (process par défaut, thread si indisponible, ex: serverless sans /dev/shm)
+    """
+    global _progress_queue, _progress_thread
+    if EXTRACTION_POOL == "process":
+        try:
+            ctx = multiprocessing.get_context("spawn")
+            # File de progression conservée quand un pool cassé est remplacé
+            progress_queue = _progress_queue if _progress_queue is not None else ctx.Queue()
+            executor = ProcessPoolExecutor(
+                max_workers=EXTRACTION_WORKERS,
+                mp_context=ctx,
+                initializer=_init_worker,
+                initargs=(ctx.BoundedSemaphore(ocr_service.OCR_CONCURRENCY), progress_queue),
+            )
+            if _progress_queue is None:
+                _progress_queue = progress_queue
+                _progress_thread = threading.Thread(
+                    target=_forward_progress, args=(progress_queue,), name="extraction-progress", daemon=True,
+                )
+                _progress_thread.start()
+            return executor
+        except Exception as e:
+            logger.warning("Process pool indisponible, repli sur threads: %s", e)
+
+    return ThreadPoolExecutor(max_workers=EXTRACTION_WORKERS, thread_name_prefix="extraction")
+
+
+def _get_executor() -> Executor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = _create_executor()
+        return _executor
+
+
+def _reset_executor(broken: Executor) -> None:
+    """
+    Abandonne un pool de processus cassé (worker tué : OOM, crash de poppler ou tesseract) ;
+    le suivant est créé à la prochaine extraction
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is broken:
+            _executor = None
+    broken.shutdown(wait=False, cancel_futures=True)
+
+
+async def run_extraction(func: Callable, *args: Any, progress: Optional[str] = None) -> Any:
+    """
+    Exécute une fonction d'extraction (OCR, PDF) hors de la boucle d'événements.
+    `func` doit être une fonction de module (sérialisable pour le pool de processus).
+    `progress` : identifiant de stream_extraction recevant les événements de report_progress.
+    """
+    # Rejet immédiat si la file (workers + attente) est saturée (sauf tâches d'arrière-plan)
+    async with extraction_gate.admit():
+        loop = asyncio.get_running_loop()
+        executor = _get_executor()
+        if not isinstance(executor, ProcessPoolExecutor):
+            if progress is not None:
+                return await loop.run_in_executor(executor, tracing.in_current_context(_run_reporting), func, progress, *args)
+            return await loop.run_in_executor(executor, tracing.in_current_context(func), *args)
+        # Les métriques d'un processus worker ne sont pas visibles du parent : elles sont rejouées ici
+        trace_context = tracing.inject()
+        try:
+            result, events = await loop.run_in_executor(executor, _run_recorded, func, trace_context, progress, *args)
+        except BrokenProcessPool as e:
+            # Toutes les tâches d'un pool cassé échouent : une nouvelle tentative dans un pool neuf
+            logger.warning("Pool d'extraction cassé, recréé: %s", e)
+            _reset_executor(executor)
+            executor = _get_executor()
+            try:
+                result, events = await loop.run_in_executor(executor, _run_recorded, func, trace_context, progress, *args)
+            except BrokenProcessPool as e:
+                _reset_executor(executor)
+                raise ServiceOverloaded("Extraction interrompue (processus worker arrêté)") from e
+        metrics.replay(events)
+        return result
+
+
+async def stream_extraction(func: Callable, *args: Any) -> AsyncIterator[Tuple[str, Any]]:
+    """
+    Comme run_extraction, en une seule tâche dont les événements de progression (report_progress)
+    sont générés au fil de l'eau : (événement, données)..., puis ("result", valeur retournée par func).
+    """
+    loop = asyncio.get_running_loop()
+    events: asyncio.Queue = asyncio.Queue()
+    progress_id = uuid.uuid4().hex
+    _progress_listeners[progress_id] = lambda event, data: loop.call_soon_threadsafe(events.put_nowait, (event, data))
+    task = asyncio.ensure_future(run_extraction(func, *args, progress=progress_id))
+    try:
+        while True:
+            getter = asyncio.ensure_future(events.get())
+            if task.done():
+                # Résultat reçu par un autre canal que les événements : attente du marqueur de fin
+                done, _ = await asyncio.wait({getter}, timeout=_PROGRESS_DRAIN_TIMEOUT)
+            else:
+                done, _ = await asyncio.wait({getter, task}, return_when=asyncio.FIRST_COMPLETED)
+            if getter not in done:
+                getter.cancel()
+                if task.done() and (not done or task.cancelled() or task.exception() is not None):
+                    break
+                continue
+            event, data = getter.result()
+            if event is None:
+                break
+            yield event, data
+        yield "result", await task
+    finally:
+        _progress_listeners.pop(progress_id, None)
+        if not task.done():
+            task.cancel()
+
+
+def shutdown_pool() -> None:
+    """
+    Arrête le pool d'extraction (à appeler à l'arrêt de l'application)
+    """
+    global _executor, _progress_queue, _progress_thread
+    if _executor is not None:
+        _executor.shutdown(wait=True, cancel_futures=True)
+        _executor = None
+    if _progress_queue is not None:
+        # Arrêt du thread de relais des événements
+        _progress_queue.put(None)
+        _progress_thread.join()
+        _progress_queue.close()
+        _progress_queue = _progress_thread = None
@@ -1,8 +1,5 @@
 import re
 
-# Taille max raisonnable pour l'API (éviter timeouts / limites Groq)
-MAX_TEXT_LENGTH = 15000
-
 
 def clean_cv_text(raw: str) -> str:
     """
@@ -20,8 +17,7 @@ def clean_cv_text(raw: str) -> str:
     # Supprimer caractères de contrôle / bizarres
     text = "".join(c for c in text if c.isprintable() or c in "\n\t")
 
-    # Tronquer si trop long (garder le début, souvent le plus informatif)
-    if len(text) > MAX_TEXT_LENGTH:
-        text = text[:MAX_TEXT_LENGTH] + "\n[... texte tronqué ...]"
+    # Pas de troncature ici : le budget de tokens est appliqué par section
+    # juste avant l'appel IA (voir utils/compactor.py)
 
     return text.strip()
@@ -0,0 +1,128 @@
+import os
+import re
+from typing import Dict, List, Optional, Tuple
+
+# Budget de tokens du texte de CV envoyé au modèle (hors prompt)
+LLM_INPUT_TOKEN_BUDGET = int(os.getenv("LLM_INPUT_TOKEN_BUDGET", "3000"))
+
+# Bornes du max_tokens de la réponse, dimensionné selon la taille de l'entrée
+LLM_MIN_OUTPUT_TOKENS = int(os.getenv("LLM_MIN_OUTPUT_TOKENS", "600"))
+LLM_MAX_OUTPUT_TOKENS = int(os.getenv("LLM_MAX_OUTPUT_TOKENS", "1500"))
+
+try:
+    import tiktoken
+
+    # Vocabulaire BPE proche de celui de Llama 3 : estimation fidèle du coût
+    _encoding = tiktoken.get_encoding("cl100k_base")
+except Exception:
+    _encoding = None
+
+_WORD_RE = re.compile(r"\w+|[^\w\s]")
+_DIGITS_RE = re.compile(r"\d+")
+_SPACES_RE = re.compile(r"[ \t]+")
+_PAGE_NUMBER_RE = re.compile(r"^(page\s*)?[-–—]?\s*\d+\s*([/|]\s*\d+|sur\s+\d+)?\s*[-–—]?$", re.IGNORECASE)
+
+# Sections de CV reconnues : (nom, motif du titre, priorité ; 0 = conservée en dernier lors de la réduction)
+SECTIONS = [
+    ("experiences", re.compile(r"^(exp[ée]riences?|parcours professionnel|emplois?|work experience|professional experience)\b", re.IGNORECASE), 0),
+    ("formations", re.compile(r"^(formations?|[ée]ducation|dipl[ôo]mes?|[ée]tudes|cursus)\b", re.IGNORECASE), 1),
+    ("competences", re.compile(r"^(comp[ée]tences?|skills|savoir[- ]faire|technologies|outils)\b", re.IGNORECASE), 1),
+    ("langues", re.compile(r"^(langues?|languages)\b", re.IGNORECASE), 2),
+    ("projets", re.compile(r"^(certifications?|projets?|projects)\b", re.IGNORECASE), 2),
+    ("loisirs", re.compile(r"^(centres? d'int[ée]r[êe]ts?|loisirs|hobbies|int[ée]r[êe]ts|r[ée]f[ée]rences?|divers|activit[ée]s)\b", re.IGNORECASE), 3),
+]
+_HEADING_MAX_LENGTH = 40
+
+
+def count_tokens(text: str) -> int:
+    """
+    Compte (ou estime sans tiktoken) le nombre de tokens d'un texte
+    """
+    if not text:
+        return 0
+    if _encoding is not None:
+        return len(_encoding.encode(text))
+    # Estimation : ~1 token par mot court, les mots longs comptent pour plusieurs
+    return sum(max(1, (len(piece) + 3) // 4) for piece in _WORD_RE.findall(text))
+
+
+def output_token_budget(input_tokens: int) -> int:
+    """
+    max_tokens de la réponse : proportionnel à la taille du CV, dans les bornes configurées
+    """
+    return max(LLM_MIN_OUTPUT_TOKENS, min(LLM_MAX_OUTPUT_TOKENS, 200 + int(input_tokens * 0.6)))
+
+
+def section_of(line: str) -> Tuple[Optional[str], int]:
+    """
+    (nom, priorité) de la section ouverte par cette ligne, ou (None, -1) si ce n'est pas un titre
+    """
+    if len(line) > _HEADING_MAX_LENGTH:
+        return None, -1
+    for name, pattern, priority in SECTIONS:
+        if pattern.match(line.strip(" :-•*#")):
+            return name, priority
+    return None, -1
+
+
+def _remove_furniture(lines: List[str]) -> List[str]:
+    """
+    Supprime numéros de page, en-têtes/pieds de page répétés et lignes dupliquées
+    (la première occurrence d'un en-tête est gardée : il contient souvent le nom)
+    """
+    kept = []
+    seen = set()
+    for line in lines:
+        if _PAGE_NUMBER_RE.match(line):
+            continue
+        key = line.lower()
+        # En-tête/pied qui ne diffère que par le numéro de page (ex: "CV Dupont - page 2")
+        if "page" in key:
+            key = _DIGITS_RE.sub("#", key)
+        if key in seen:
+            continue
+        seen.add(key)
+        kept.append(line)
+    return kept
+
+
+def _split_sections(lines: List[str]) -> List[Tuple[int, List[str]]]:
+    """
+    Découpe le CV en sections (priorité, lignes) ; l'en-tête (contact) est prioritaire
+    """
+    sections = [(0, [])]
+    for line in lines:
+        _, priority = section_of(line)
+        if priority >= 0:
+            sections.append((priority, [line]))
+        else:
+            sections[-1][1].append(line)
+    return [section for section in sections if section[1]]
+
+
+def compact_cv_text(text: str, budget: int = LLM_INPUT_TOKEN_BUDGET) -> Tuple[str, Dict[str, int]]:
+    """
+    Compacte le texte d'un CV pour tenir dans le budget de tokens :
+    suppression du mobilier de page et des doublons, puis réduction
+    des sections les moins prioritaires (en partant de leur fin).
+    Retourne (texte compacté, {"tokens_before", "tokens_after"}).
+    """
+    tokens_before = count_tokens(text)
+
+    lines = [_SPACES_RE.sub(" ", line).strip() for line in text.splitlines()]
+    lines = _remove_furniture([line for line in lines if line])
+
+    sections = _split_sections(lines)
+    line_tokens = {line: count_tokens(line) + 1 for _, section in sections for line in section}
+    total = sum(line_tokens[line] for _, section in sections for line in section)
+
+    # Réduction par priorité : la section la moins importante (et la plus tardive) perd ses dernières lignes
+    while total > budget and sections:
+        index = max(range(len(sections)), key=lambda i: (sections[i][0], i))
+        priority, section = sections[index]
+        total -= line_tokens[section.pop()]
+        if not section:
+            sections.pop(index)
+
+    compacted = "\n".join(line for _, section in sections for line in section)
+    return compacted, {"tokens_before": tokens_before, "tokens_after": count_tokens(compacted)}
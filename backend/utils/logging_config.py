@@ -0,0 +1,150 @@
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+import time
+import uuid
+from contextvars import ContextVar
+from typing import Any, Optional
+
+# Configuration des logs (surchargée via l'environnement)
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json")  # json | text
+# Fraction des requêtes dont les contenus volumineux (réponse brute de l'IA, résultat) sont journalisés en DEBUG
+LOG_PAYLOAD_SAMPLE_RATE = float(os.getenv("LOG_PAYLOAD_SAMPLE_RATE", "0"))
+LOG_PAYLOAD_MAX_CHARS = int(os.getenv("LOG_PAYLOAD_MAX_CHARS", "2000"))
+
+# Identifiant de la requête HTTP en cours (repris de X-Request-ID ou généré)
+request_id: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+# Attributs standard d'un LogRecord : le reste provient de `extra=` et est sérialisé tel quel
+_RECORD_FIELDS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_fork_hook = False
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Une ligne JSON par événement : horodatage, niveau, logger, message, request_id et champs `extra`
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(record.created)) + f".{int(record.msecs):03d}Z",
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_FIELDS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class _RequestIdFilter(logging.Filter):
+    """
+    Ajoute l'identifiant de requête courant (évalué dans le contexte de l'appelant, avant la file)
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if getattr(record, "request_id", None) is None:
+            record.request_id = request_id.get()
+        return True
+
+
+def setup_logging() -> None:
+    """
+    Configure le logger racine : émission non bloquante (QueueHandler),
+    écriture sur stdout dans un thread dédié (QueueListener). Idempotent.
+    """
+    global _listener, _fork_hook
+    if _listener is not None:
+        return
+
+    output = logging.StreamHandler(sys.stdout)
+    if LOG_FORMAT == "json":
+        output.setFormatter(JsonFormatter())
+    else:
+        output.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s [%(request_id)s] %(message)s"))
+
+    log_queue: queue.Queue = queue.Queue(-1)
+    handler = logging.handlers.QueueHandler(log_queue)
+    handler.addFilter(_RequestIdFilter())
+
+    root = logging.getLogger()
+    root.handlers = [handler]
+    root.setLevel(LOG_LEVEL)
+
+    _listener = logging.handlers.QueueListener(log_queue, output, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
+    if not _fork_hook and hasattr(os, "register_at_fork"):
+        os.register_at_fork(after_in_child=_restart_after_fork)
+        _fork_hook = True
+
+
+def _restart_after_fork() -> None:
+    """
+    Processus forké (worker gunicorn après préchargement) : le thread d'écriture du parent
+    n'existe plus, une nouvelle file et un nouveau thread sont créés
+    """
+    global _listener
+    if _listener is None:
+        return
+    _listener = None
+    setup_logging()
+
+
+def sample_payload() -> bool:
+    """
+    Tirage de l'échantillonnage des contenus volumineux (une fois par requête analysée)
+    """
+    return LOG_PAYLOAD_SAMPLE_RATE > 0 and random.random() < LOG_PAYLOAD_SAMPLE_RATE
+
+
+def log_payload(logger: logging.Logger, message: str, payload: Any, sampled: bool) -> None:
+    """
+    Journalise un contenu volumineux (texte brut de l'IA, résultat) en DEBUG, tronqué,
+    uniquement pour les requêtes échantillonnées : ces contenus sont des données personnelles
+    """
+    if not sampled or not logger.isEnabledFor(logging.DEBUG):
+        return
+    text = payload if isinstance(payload, str) else json.dumps(payload, ensure_ascii=False, default=str)
+    logger.debug(message, extra={"payload": text[:LOG_PAYLOAD_MAX_CHARS], "payload_chars": len(text)})
+
+
+class RequestIdMiddleware:
+    """
+    Middleware ASGI : identifiant par requête (en-tête X-Request-ID repris ou généré),
+    disponible dans les logs et renvoyé dans la réponse
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        incoming = dict(scope["headers"]).get(b"x-request-id", b"").decode("latin-1")[:64]
+        current = incoming or uuid.uuid4().hex
+        token = request_id.set(current)
+
+        async def send_with_id(message):
+            if message["type"] == "http.response.start":
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [(b"x-request-id", current.encode("latin-1"))]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            request_id.reset(token)
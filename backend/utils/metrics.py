@@ -0,0 +1,137 @@
+import os
+import time
+from contextlib import contextmanager
+from typing import List, Optional, Tuple
+
+try:
+    from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram, generate_latest
+    from prometheus_client import multiprocess
+except ImportError:
+    Counter = Gauge = Histogram = None
+
+# Mode multi-processus (plusieurs workers uvicorn/gunicorn) : répertoire partagé des mesures
+PROMETHEUS_MULTIPROC_DIR = os.getenv("PROMETHEUS_MULTIPROC_DIR") or None
+
+# Bornes des histogrammes : de l'étape de nettoyage (ms) à l'appel LLM (dizaines de secondes)
+STAGE_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 40, 80)
+
+
+class _NoopMetric:
+    """
+    Métrique inerte quand prometheus_client n'est pas installé
+    """
+
+    def labels(self, *args, **kwargs):
+        return self
+
+    def observe(self, value: float) -> None:
+        pass
+
+    def inc(self, amount: float = 1) -> None:
+        pass
+
+    def dec(self, amount: float = 1) -> None:
+        pass
+
+
+def _metric(kind, name: str, documentation: str, labels: Tuple[str, ...], **kwargs):
+    if kind is None:
+        return _NoopMetric()
+    return kind(name, documentation, labels, **kwargs)
+
+
+STAGE_SECONDS = _metric(
+    Histogram, "cv_stage_duration_seconds", "Durée de chaque étape du pipeline d'analyse",
+    ("stage",), buckets=STAGE_BUCKETS,
+)
+CACHE_LOOKUPS = _metric(Counter, "cv_cache_lookups_total", "Consultations du cache de résultats", ("level", "result"))
+OCR_FALLBACKS = _metric(Counter, "cv_ocr_fallbacks_total", "Documents dont au moins une page est passée à l'OCR", ())
+OCR_PAGES = _metric(Counter, "cv_ocr_pages_total", "Pages OCRisées", ())
+NON_CV_REJECTIONS = _metric(Counter, "cv_non_cv_rejections_total", "Documents rejetés comme non-CV", ("stage",))
+INVALID_DOCUMENTS = _metric(
+    Counter, "cv_invalid_documents_total", "Documents refusés avant extraction (format, corruption, budget)", ("status",),
+)
+LLM_ERRORS = _metric(Counter, "cv_llm_errors_total", "Échecs d'appel LLM (par tentative)", ("provider", "kind"))
+LLM_TOKENS = _metric(Counter, "cv_llm_tokens_total", "Tokens consommés par les appels LLM", ("provider", "model", "type"))
+IN_FLIGHT = _metric(
+    Gauge, "cv_in_flight", "Traitements en cours par type", ("kind",),
+    **({"multiprocess_mode": "livesum"} if Gauge is not None else {}),
+)
+
+_METRICS = {
+    "stage": STAGE_SECONDS,
+    "ocr_fallbacks": OCR_FALLBACKS,
+    "ocr_pages": OCR_PAGES,
+    "invalid_documents": INVALID_DOCUMENTS,
+}
+
+# Mesures prises dans un processus worker du pool d'extraction, rejouées dans le processus parent
+_recorded: Optional[List[Tuple[str, Tuple[str, ...], float]]] = None
+
+
+def _emit(name: str, labels: Tuple[str, ...], value: float) -> None:
+    if _recorded is not None:
+        _recorded.append((name, labels, value))
+        return
+    metric = _METRICS[name].labels(*labels) if labels else _METRICS[name]
+    if name == "stage":
+        metric.observe(value)
+    else:
+        metric.inc(value)
+
+
+@contextmanager
+def recording():
+    """
+    Dans un processus worker : accumule les mesures (voir replay) au lieu de les publier localement
+    """
+    global _recorded
+    _recorded = []
+    try:
+        yield _recorded
+    finally:
+        _recorded = None
+
+
+def replay(events: List[Tuple[str, Tuple[str, ...], float]]) -> None:
+    """
+    Publie dans ce processus les mesures enregistrées par un worker
+    """
+    for name, labels, value in events:
+        _emit(name, labels, value)
+
+
+def observe_stage(stage: str, seconds: float) -> None:
+    _emit("stage", (stage,), seconds)
+
+
+@contextmanager
+def timed(stage: str):
+    """
+    Mesure la durée du bloc dans l'histogramme des étapes
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe_stage(stage, time.perf_counter() - start)
+
+
+def count(name: str, amount: float = 1, labels: Tuple[str, ...] = ()) -> None:
+    """
+    Incrémente un compteur (utilisable dans les workers d'extraction)
+    """
+    _emit(name, labels, amount)
+
+
+def render() -> Tuple[bytes, str]:
+    """
+    Exposition au format texte Prometheus : (contenu, type MIME)
+    """
+    if Counter is None:
+        return b"# prometheus_client non installe\n", "text/plain; version=0.0.4; charset=utf-8"
+    if PROMETHEUS_MULTIPROC_DIR:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(), CONTENT_TYPE_LATEST
@@ -0,0 +1,160 @@
+import functools
+import os
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Optional
+
+try:
+    from opentelemetry import context as otel_context
+    from opentelemetry import propagate, trace
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter
+except ImportError:
+    trace = None
+
+# Export des traces (surchargé via l'environnement) : none | console | file | otlp
+OTEL_TRACES_EXPORTER = os.getenv("OTEL_TRACES_EXPORTER", "none")
+OTEL_SERVICE_NAME = os.getenv("OTEL_SERVICE_NAME", "pfa-cv")
+# Exporteur file : une ligne JSON par span (utilisable hors ligne, partagé entre processus)
+OTEL_TRACES_FILE = os.getenv("OTEL_TRACES_FILE", "traces.jsonl")
+# Exporteur otlp : OTEL_EXPORTER_OTLP_ENDPOINT (ex: http://localhost:4318) est lu par l'exporteur lui-même
+
+_tracer = None
+
+
+class _NoopSpan:
+    """
+    Span inerte quand le traçage est désactivé ou opentelemetry non installé
+    """
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def set_attributes(self, attributes: Dict[str, Any]) -> None:
+        pass
+
+    def add_event(self, name: str, attributes: Optional[Dict[str, Any]] = None) -> None:
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+def enabled() -> bool:
+    return trace is not None and OTEL_TRACES_EXPORTER != "none"
+
+
+def _create_exporter():
+    if OTEL_TRACES_EXPORTER == "otlp":
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        return OTLPSpanExporter()
+    if OTEL_TRACES_EXPORTER == "file":
+        # Ajout ligne par ligne : plusieurs processus (workers d'extraction) écrivent le même fichier
+        out = open(OTEL_TRACES_FILE, "a", encoding="utf-8", buffering=1)
+        return ConsoleSpanExporter(out=out, formatter=lambda span: span.to_json(indent=None) + "\n")
+    return ConsoleSpanExporter()
+
+
+def setup_tracing() -> None:
+    """
+    Installe le fournisseur de traces et l'exporteur configuré. Idempotent ;
+    à appeler au démarrage de l'application et dans chaque processus worker.
+    """
+    global _tracer
+    if _tracer is not None or not enabled():
+        return
+    provider = TracerProvider(resource=Resource.create({"service.name": OTEL_SERVICE_NAME}))
+    provider.add_span_processor(BatchSpanProcessor(_create_exporter()))
+    trace.set_tracer_provider(provider)
+    _tracer = trace.get_tracer("pfa-cv")
+
+
+def instrument_app(app) -> None:
+    """
+    Un span par requête HTTP (opentelemetry-instrumentation-fastapi), parent des spans du pipeline
+    """
+    if not enabled():
+        return
+    try:
+        from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
+    except ImportError:
+        return
+    FastAPIInstrumentor.instrument_app(app)
+
+
+@contextmanager
+def span(name: str, **attributes: Any):
+    """
+    Span enfant du span courant ; les exceptions y sont enregistrées puis propagées
+    """
+    if _tracer is None:
+        yield _NOOP_SPAN
+        return
+    with _tracer.start_as_current_span(name, attributes=_clean(attributes)) as current:
+        yield current
+
+
+def current_span():
+    """
+    Span courant (pour ajouter attributs et événements sans en créer un nouveau)
+    """
+    if _tracer is None:
+        return _NOOP_SPAN
+    return trace.get_current_span()
+
+
+def _clean(attributes: Dict[str, Any]) -> Dict[str, Any]:
+    return {key: value for key, value in attributes.items() if value is not None}
+
+
+def in_current_context(func: Callable) -> Callable:
+    """
+    Capture le contexte de trace courant pour exécuter `func` dans un autre thread
+    (les spans créés dans le thread restent enfants du span courant)
+    """
+    if _tracer is None:
+        return func
+    captured = otel_context.get_current()
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        token = otel_context.attach(captured)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            otel_context.detach(token)
+    return wrapper
+
+
+def inject() -> Dict[str, str]:
+    """
+    Contexte de trace courant sérialisé (traceparent) pour un processus worker
+    """
+    carrier: Dict[str, str] = {}
+    if _tracer is not None:
+        propagate.inject(carrier)
+    return carrier
+
+
+@contextmanager
+def extracted(carrier: Dict[str, str]):
+    """
+    Dans un processus worker : rattache les spans au contexte transmis par `inject`
+    """
+    if _tracer is None or not carrier:
+        yield
+        return
+    token = otel_context.attach(propagate.extract(carrier))
+    try:
+        yield
+    finally:
+        otel_context.detach(token)
+
+
+def flush() -> None:
+    """
+    Exporte les spans en attente (fin de tâche dans un worker, arrêt de l'application)
+    """
+    if _tracer is not None:
+        trace.get_tracer_provider().force_flush()
+
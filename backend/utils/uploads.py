@@ -0,0 +1,142 @@
+import json
+import os
+from typing import Dict, Optional
+
+from fastapi import Request
+from fastapi.responses import JSONResponse
+
+# Taille maximale d'un fichier analysé (surchargée via l'environnement)
+MAX_FILE_SIZE = int(os.getenv("MAX_FILE_SIZE", str(10 * 1024 * 1024)))  # 10 Mo
+# Corps max d'une requête /api/analyze/batch (tous fichiers et archives ZIP du lot)
+BATCH_MAX_BODY_SIZE = int(os.getenv("BATCH_MAX_BODY_SIZE", str(100 * 1024 * 1024)))  # 100 Mo
+# Lecture des fichiers reçus par blocs (octets)
+UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", str(1024 * 1024)))
+# Marge du corps multipart autour du fichier (en-têtes des parties, autres champs du formulaire)
+MULTIPART_OVERHEAD = 64 * 1024
+
+# Routes à fichier unique : corps de requête borné avant même l'analyse du formulaire
+SINGLE_UPLOAD_ROUTES = (
+    "/api/analyze",
+    "/api/cv/analyze/file",
+    "/api/cv/analyze/file/stream",
+    "/api/cv/analyze/image",
+    "/api/jobs",
+)
+BATCH_UPLOAD_ROUTE = "/api/analyze/batch"
+
+
+class UploadTooLarge(Exception):
+    """
+    Fichier ou corps de requête au-delà de la taille autorisée (HTTP 413)
+    """
+
+    def __init__(self, max_size: int):
+        super().__init__(f"Fichier trop volumineux (max {max_size // (1024 * 1024)} Mo)")
+        self.max_size = max_size
+
+
+async def read_upload(file, max_size: int = MAX_FILE_SIZE) -> bytes:
+    """
+    Lit un fichier reçu (UploadFile) en une seule copie en mémoire.
+    Rejet avant lecture si sa taille (connue après réception) dépasse `max_size`,
+    sinon lecture par blocs interrompue dès le dépassement.
+    """
+    size = getattr(file, "size", None)
+    if size is not None:
+        if size > max_size:
+            raise UploadTooLarge(max_size)
+        # Taille connue : un seul read, sans blocs intermédiaires à concaténer
+        return await file.read()
+
+    chunks = []
+    total = 0
+    while True:
+        chunk = await file.read(UPLOAD_CHUNK_SIZE)
+        if not chunk:
+            break
+        total += len(chunk)
+        if total > max_size:
+            raise UploadTooLarge(max_size)
+        chunks.append(chunk)
+    return chunks[0] if len(chunks) == 1 else b"".join(chunks)
+
+
+class MaxBodySizeMiddleware:
+    """
+    Middleware ASGI : rejette (413) le corps d'une requête d'upload trop volumineux
+    dès l'en-tête Content-Length, ou en cours de réception pour un corps envoyé par blocs,
+    avant qu'il ne soit écrit en mémoire ou sur disque par l'analyse du formulaire
+    """
+
+    def __init__(self, app, limits: Optional[Dict[str, int]] = None):
+        self.app = app
+        self.limits = limits if limits is not None else {
+            **{path: MAX_FILE_SIZE + MULTIPART_OVERHEAD for path in SINGLE_UPLOAD_ROUTES},
+            BATCH_UPLOAD_ROUTE: BATCH_MAX_BODY_SIZE + MULTIPART_OVERHEAD,
+        }
+
+    async def __call__(self, scope, receive, send):
+        limit = self.limits.get(scope["path"].rstrip("/")) if scope["type"] == "http" and scope["method"] == "POST" else None
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+
+        declared = dict(scope["headers"]).get(b"content-length")
+        if declared is not None and declared.isdigit() and int(declared) > limit:
+            await self._reject(send, limit)
+            return
+
+        received = 0
+        exceeded = False
+        rejected = False
+
+        async def limited_receive():
+            nonlocal received, exceeded
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    exceeded = True
+                    raise UploadTooLarge(limit - MULTIPART_OVERHEAD)
+            return message
+
+        async def guarded_send(message):
+            nonlocal rejected
+            if not exceeded:
+                await send(message)
+            elif message["type"] == "http.response.start" and not rejected:
+                # Erreur d'analyse du formulaire produite par l'application : remplacée par le 413
+                rejected = True
+                await self._reject(send, limit)
+
+        try:
+            await self.app(scope, limited_receive, guarded_send)
+        except UploadTooLarge:
+            if not exceeded or rejected:
+                raise
+            rejected = True
+            await self._reject(send, limit)
+
+    @staticmethod
+    async def _reject(send, limit: int) -> None:
+        detail = str(UploadTooLarge(limit - MULTIPART_OVERHEAD))
+        body = json.dumps({"detail": detail}, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": 413,
+            "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode()),
+                        (b"connection", b"close")],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+
+def upload_too_large_handler(request: Request, exc: UploadTooLarge) -> JSONResponse:
+    return JSONResponse(status_code=413, content={"detail": str(exc)})
+
+
+def install(app) -> None:
+    """
+    Branche la limite de taille des uploads (middleware et réponses 413) sur l'application
+    """
+    app.add_middleware(MaxBodySizeMiddleware)
+    app.add_exception_handler(UploadTooLarge, upload_too_large_handler)
@@ -0,0 +1,79 @@
+"""
+Évaluation du filtre pré-IA des non-CV sur un corpus local étiqueté.
+
+    python -m benchmarks.cv_gate_eval --corpus chemin/vers/corpus
+
+Le corpus contient deux dossiers : `cv/` et `non_cv/` (fichiers .txt, .pdf,
+.png, .jpg). Sans --corpus, un petit corpus synthétique intégré est utilisé.
+Pour chaque seuil : précision/rappel de la classe « CV accepté » et appels
+IA évités (documents rejetés avant l'appel).
+"""
+import argparse
+import os
+
+from backend.services.llm_service import CV_GATE_THRESHOLD, _cv_likelihood_score
+
+BUILTIN_CORPUS = {
+    "cv": [
+        "CURRICULUM VITAE\nDupont Jean\nEmail: jean.dupont@email.com | Tel: 06 12 34 56 78\n"
+        "EXPERIENCES\n2022-2024 : Développeur Fullstack chez TechCorp.\nCOMPETENCES\nPython, Docker, SQL\n"
+        "FORMATION\nMaster Informatique - Université de Paris (2020)",
+        "Sara El Amrani\nsara.elamrani@mail.ma\nProfil : ingénieure data, 5 ans d'expérience.\n"
+        "Parcours professionnel\n2019-2024 Data Engineer chez Orange\nFormation\nDiplôme d'ingénieur ENSA 2019",
+        "Resume\nJohn Smith - john@smith.io - +1 415 555 0100\nExperience\nSoftware Engineer at Acme 2018-2023\n"
+        "Education\nBSc Computer Science, MIT",
+        "Marie Curie\nCompétences: recherche, radioactivité, physique\nExpériences: Sorbonne 1906-1934",
+    ],
+    "non_cv": [
+        "FACTURE N° 2024-118\nClient: Société ABC\nMontant HT: 1 200,00 EUR\nTVA 20%: 240,00 EUR\nTotal TTC: 1 440,00 EUR",
+        "Compte rendu de réunion du 12 mars\nOrdre du jour: budget, planning, recrutement.\nProchaine réunion le 19 mars.",
+        "Bon de livraison\nRéférence 55-AX\nQuantité: 12\nAdresse: 3 rue des Lilas, 75011 Paris",
+        "Lorem ipsum dolor sit amet, consectetur adipiscing elit. Contactez-nous: contact@example.com",
+        "Offre d'emploi : poste de développeur Python. Formation Bac+5 exigée. Expérience de 3 ans.",
+    ],
+}
+
+
+def _load_corpus(path: str):
+    from backend.services.pdf_service import extract_text_from_content
+
+    corpus = {"cv": [], "non_cv": []}
+    for label in corpus:
+        folder = os.path.join(path, label)
+        for name in sorted(os.listdir(folder)):
+            with open(os.path.join(folder, name), "rb") as handle:
+                content = handle.read()
+            if name.lower().endswith(".txt"):
+                corpus[label].append(content.decode("utf-8", errors="replace"))
+            else:
+                try:
+                    corpus[label].append(extract_text_from_content(content, name))
+                except Exception as e:
+                    print(f"Ignoré {label}/{name}: {e}")
+    return corpus
+
+
+def main(corpus_path, thresholds) -> None:
+    corpus = _load_corpus(corpus_path) if corpus_path else BUILTIN_CORPUS
+    scores = [(_cv_likelihood_score(text), label == "cv") for label, texts in corpus.items() for text in texts]
+    total = len(scores)
+
+    print(f"{len(corpus['cv'])} CV, {len(corpus['non_cv'])} non-CV ; seuil actuel: {CV_GATE_THRESHOLD}")
+    print(f"{'seuil':>6} {'précision':>10} {'rappel':>7} {'faux nég.':>10} {'appels IA évités':>17}")
+    for threshold in thresholds:
+        tp = sum(1 for score, is_cv in scores if score >= threshold and is_cv)
+        fp = sum(1 for score, is_cv in scores if score >= threshold and not is_cv)
+        fn = sum(1 for score, is_cv in scores if score < threshold and is_cv)
+        rejected = sum(1 for score, _ in scores if score < threshold)
+        precision = tp / (tp + fp) if tp + fp else 1.0
+        recall = tp / (tp + fn) if tp + fn else 1.0
+        marker = " *" if threshold == CV_GATE_THRESHOLD else ""
+        print(f"{threshold:>6} {precision:>10.2f} {recall:>7.2f} {fn:>10} {rejected:>9} ({rejected / total:.0%}){marker}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Évaluation du filtre non-CV")
+    parser.add_argument("--corpus", help="dossier contenant cv/ et non_cv/")
+    parser.add_argument("--thresholds", type=int, nargs="+", default=list(range(1, 9)))
+    args = parser.parse_args()
+    main(args.corpus, args.thresholds)
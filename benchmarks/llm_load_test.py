@@ -0,0 +1,84 @@
+"""
+Test de charge : débit des routes d'analyse en fonction de la concurrence,
+contre un LLM factice (aucun appel réseau externe) : serveur HTTP local
+compatible OpenAI derrière le client Groq, ou fournisseur « stub » en mémoire.
+
+    python -m benchmarks.llm_load_test --latency 0.5 --requests 32
+    python -m benchmarks.llm_load_test --provider stub
+
+Avec un client LLM réellement asynchrone, le débit doit croître à peu près
+linéairement avec la concurrence (les attentes réseau se chevauchent).
+"""
+import argparse
+import asyncio
+import os
+import time
+
+from benchmarks.stub_llm_server import start_stub_server
+
+SAMPLE_CV = """
+CURRICULUM VITAE
+Dupont Jean - Ingénieur Logiciel
+Email: jean.dupont@email.com | Tel: 06 12 34 56 78
+EXPERIENCES
+2022-2024 : Développeur Fullstack chez TechCorp. Python et React.
+COMPETENCES
+Python, Java, Docker, SQL
+FORMATION
+Master Informatique - Université de Paris (2020)
+"""
+
+
+async def _run_level(client, concurrency: int, total: int) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            response = await client.post("/api/cv/analyze/text", data={"text": SAMPLE_CV})
+            response.raise_for_status()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(total)))
+    return time.perf_counter() - start
+
+
+async def main(latency: float, total: int, levels, provider: str = "http") -> None:
+    server = None
+    if provider == "stub":
+        os.environ["LLM_PROVIDER"] = "stub"
+        os.environ["STUB_LLM_LATENCY"] = str(latency)
+    else:
+        server = start_stub_server(latency=latency)
+        os.environ["LLM_PROVIDER"] = "groq"
+        os.environ["GROQ_BASE_URL"] = f"http://127.0.0.1:{server.server_address[1]}"
+        os.environ.setdefault("GROQ_API_KEY", "stub")
+    # Même CV à chaque requête : sans cache désactivé, seul le premier appel atteindrait le LLM
+    os.environ["CACHE_BACKEND"] = "none"
+    # Toutes les requêtes viennent du même client : limites de débit désactivées pour la mesure
+    os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+
+    # Import après configuration de l'environnement (le client est construit à l'import)
+    import httpx
+    from backend.main import app
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        print(f"LLM factice ({provider}), latence simulée: {latency}s, {total} requêtes par niveau")
+        print(f"{'concurrence':>12} {'durée (s)':>10} {'req/s':>8}")
+        for level in levels:
+            elapsed = await _run_level(client, level, total)
+            print(f"{level:>12} {elapsed:>10.2f} {total / elapsed:>8.2f}")
+
+    if server is not None:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Test de charge LLM asynchrone")
+    parser.add_argument("--latency", type=float, default=0.5)
+    parser.add_argument("--requests", type=int, default=32)
+    parser.add_argument("--levels", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--provider", choices=["http", "stub"], default="http",
+                        help="http: serveur factice via le client Groq ; stub: fournisseur en mémoire")
+    args = parser.parse_args()
+    asyncio.run(main(args.latency, args.requests, args.levels, args.provider))
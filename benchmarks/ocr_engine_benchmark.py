@@ -0,0 +1,44 @@
+"""
+Micro-benchmark des moteurs OCR : tesseract en sous-processus (PNG temporaire
++ démarrage de processus par image) vs API tesseract persistante (tesserocr).
+
+    python -m benchmarks.ocr_engine_benchmark --images 10
+
+Nécessite tesseract (langue fra) ; le moteur tesserocr est ignoré s'il n'est pas installé.
+"""
+import argparse
+import time
+
+from backend.services.ocr_service import SubprocessEngine, TesserocrEngine, extract_text_from_image
+from benchmarks.synthetic import render_page
+
+
+def _per_image(engine, images) -> float:
+    # Premier appel hors mesure : chargement du modèle pour le moteur persistant
+    extract_text_from_image(images[0], engine=engine)
+    start = time.perf_counter()
+    for image in images:
+        extract_text_from_image(image, engine=engine)
+    return (time.perf_counter() - start) / len(images)
+
+
+def main(count: int, dpi: int) -> None:
+    images = [render_page(i, dpi) for i in range(count)]
+    engines = [SubprocessEngine()]
+    try:
+        engines.append(TesserocrEngine())
+    except Exception as e:
+        print(f"tesserocr non disponible: {e}")
+
+    print(f"{count} images à {dpi} DPI")
+    print(f"{'moteur':>12} {'ms / image':>11}")
+    for engine in engines:
+        print(f"{engine.name:>12} {_per_image(engine, images) * 1000:>11.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark des moteurs OCR")
+    parser.add_argument("--images", type=int, default=10)
+    parser.add_argument("--dpi", type=int, default=150)
+    args = parser.parse_args()
+    main(args.images, args.dpi)
@@ -0,0 +1,40 @@
+"""
+Benchmark de l'OCR des PDF scannés : pages séquentielles vs parallèles.
+
+    python -m benchmarks.ocr_pages_benchmark --pages 2 4 8 --repeat 3
+
+Nécessite tesseract (langue fra) et poppler installés.
+"""
+import argparse
+import time
+
+from backend.services.pdf_service import OCR_PAGE_WORKERS, _pdf_ocr_fallback
+from benchmarks.synthetic import scanned_pdf
+
+
+def _best_of(repeat: int, fn) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main(page_counts, repeat: int, dpi: int) -> None:
+    print(f"Workers OCR par PDF: {OCR_PAGE_WORKERS}, DPI du scan: {dpi}")
+    print(f"{'pages':>6} {'séquentiel (s)':>15} {'parallèle (s)':>14} {'gain':>6}")
+    for pages in page_counts:
+        content = scanned_pdf(pages, dpi=dpi)
+        sequential = _best_of(repeat, lambda: _pdf_ocr_fallback(content, parallel=False))
+        parallel = _best_of(repeat, lambda: _pdf_ocr_fallback(content, parallel=True))
+        print(f"{pages:>6} {sequential:>15.2f} {parallel:>14.2f} {sequential / parallel:>5.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark OCR multi-pages")
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--dpi", type=int, default=150)
+    args = parser.parse_args()
+    main(args.pages, args.repeat, args.dpi)
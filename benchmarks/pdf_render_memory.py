@@ -0,0 +1,67 @@
+"""
+Pic de mémoire (RSS) du rendu des pages d'un PDF scanné :
+rendu complet en mémoire (`convert_from_bytes`) vs rendu fenêtré en flux.
+
+    python -m benchmarks.pdf_render_memory --pages 5 10 20
+
+Chaque mesure tourne dans un processus neuf pour isoler le pic RSS.
+Nécessite poppler installé.
+"""
+import argparse
+import multiprocessing
+import resource
+
+
+def _render_all(content: bytes) -> None:
+    from pdf2image import convert_from_bytes
+    from backend.services.pdf_service import PDF_RENDER_DPI
+
+    images = convert_from_bytes(content, dpi=PDF_RENDER_DPI)
+    for image in images:
+        image.load()
+
+
+def _render_streaming(content: bytes) -> None:
+    from backend.services.pdf_service import OCR_PAGE_WORKERS, _render_pages
+
+    for window in _render_pages(content, window=OCR_PAGE_WORKERS):
+        for _, image in window:
+            image.load()
+
+
+def _measure(target: str, content: bytes, queue) -> None:
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    globals()[target](content)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Le rendu poppler tourne en sous-processus : inclure son pic
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    queue.put((peak - baseline, children))
+
+
+def peak_rss_mb(target: str, content: bytes):
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+    process = ctx.Process(target=_measure, args=(target, content, queue))
+    process.start()
+    delta, children = queue.get()
+    process.join()
+    return delta / 1024, children / 1024
+
+
+def main(page_counts, dpi: int) -> None:
+    from benchmarks.synthetic import scanned_pdf
+
+    print(f"{'pages':>6} {'complet (Mo)':>13} {'flux (Mo)':>10} {'poppler max (Mo)':>17}")
+    for pages in page_counts:
+        content = scanned_pdf(pages, dpi=dpi)
+        full, _ = peak_rss_mb("_render_all", content)
+        streaming, children = peak_rss_mb("_render_streaming", content)
+        print(f"{pages:>6} {full:>13.1f} {streaming:>10.1f} {children:>17.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pic mémoire du rendu PDF")
+    parser.add_argument("--pages", type=int, nargs="+", default=[5, 10, 20])
+    parser.add_argument("--dpi", type=int, default=150)
+    args = parser.parse_args()
+    main(args.pages, args.dpi)
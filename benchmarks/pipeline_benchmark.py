@@ -0,0 +1,346 @@
+"""
+Benchmark reproductible du pipeline d'analyse, étape par étape puis de bout en bout
+(application ASGI, fournisseur LLM « stub » en mémoire : aucun appel réseau).
+
+    python -m benchmarks.pipeline_benchmark --out bench.json
+    python -m benchmarks.pipeline_benchmark --pages 1 3 --dpis 150 300 --repeat 5
+    python -m benchmarks.pipeline_benchmark --out new.json --baseline bench.json
+
+Corpus synthétique déterministe (graine fixe) : PDF texte, PDF scannés (pages x DPI),
+photos PNG/JPEG de CV et documents non-CV. Pour chaque étape : débit, latences
+p50/p95/p99 et pic de mémoire (RSS), chaque étape dans un processus neuf.
+Résultats en JSON pour comparer les commits entre eux (--baseline).
+Nécessite tesseract (langue fra) et poppler pour les documents scannés.
+"""
+import argparse
+import asyncio
+import json
+import math
+import multiprocessing
+import os
+import platform
+import queue as queue_module
+import resource
+import subprocess
+import time
+from typing import Any, Dict, List, Optional
+
+STAGES = ("extract", "clean", "gate", "analyze", "end_to_end")
+
+# Réglages qui influencent les mesures : recopiés dans le rapport
+RECORDED_SETTINGS = (
+    "EXTRACTION_POOL", "EXTRACTION_WORKERS", "OCR_ENGINE", "OCR_CONCURRENCY", "OCR_PAGE_WORKERS",
+    "PDF_RENDER_DPI", "PDF_MAX_PAGES", "LLM_INPUT_TOKEN_BUDGET", "ANALYSIS_MODE", "CV_GATE_THRESHOLD",
+)
+
+
+def build_corpus(page_counts: List[int], dpis: List[int], seed: int) -> List[Dict[str, Any]]:
+    """
+    Documents synthétiques : {"name", "kind", "filename", "content"}
+    """
+    from benchmarks.synthetic import NON_CV_LINES, cv_lines, scanned_image, scanned_pdf, text_pdf
+
+    corpus = []
+    index = 0
+
+    def add(kind: str, filename: str, content: bytes) -> None:
+        corpus.append({"name": filename, "kind": kind, "filename": filename, "content": content})
+
+    for pages in page_counts:
+        index += 1
+        add("text_pdf", f"cv_text_{pages}p.pdf", text_pdf(pages, cv_lines(seed + index)))
+        for dpi in dpis:
+            index += 1
+            add("scanned_pdf", f"cv_scan_{pages}p_{dpi}dpi.pdf", scanned_pdf(pages, dpi, cv_lines(seed + index, extra=8)))
+    for dpi in dpis:
+        index += 1
+        add("photo_png", f"cv_photo_{dpi}dpi.png", scanned_image(dpi, "PNG", cv_lines(seed + index, extra=8)))
+        index += 1
+        add("photo_jpeg", f"cv_photo_{dpi}dpi.jpg", scanned_image(dpi, "JPEG", cv_lines(seed + index, extra=8)))
+    add("non_cv_pdf", "facture.pdf", text_pdf(1, NON_CV_LINES))
+    add("non_cv_scan", "facture.png", scanned_image(dpis[0], "PNG", NON_CV_LINES))
+    return corpus
+
+
+def _percentile(values: List[float], q: float) -> float:
+    """
+    Percentile au rang le plus proche (valeur réellement observée)
+    """
+    ordered = sorted(values)
+    rank = max(1, math.ceil(q / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(latencies: List[float], elapsed: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Latences (ms) et, si la durée totale est fournie, débit en documents par seconde
+    """
+    if not latencies:
+        return {"count": 0}
+    summary = {"count": len(latencies)}
+    if elapsed:
+        summary["throughput_per_s"] = round(len(latencies) / elapsed, 3)
+    return {
+        **summary,
+        "mean_ms": round(sum(latencies) / len(latencies) * 1000, 2),
+        "p50_ms": round(_percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(_percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(_percentile(latencies, 99) * 1000, 2),
+        "max_ms": round(max(latencies) * 1000, 2),
+    }
+
+
+def _timed_samples(items, repeat: int, fn):
+    """
+    Exécute `fn` sur chaque élément, `repeat` fois ; retourne (latences par type, erreurs, durée totale)
+    """
+    by_kind: Dict[str, List[float]] = {}
+    errors: Dict[str, str] = {}
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for item in items:
+            began = time.perf_counter()
+            try:
+                fn(item)
+            except Exception as e:
+                errors[item["name"]] = str(e)
+                continue
+            by_kind.setdefault(item["kind"], []).append(time.perf_counter() - began)
+    return by_kind, errors, time.perf_counter() - start
+
+
+def _stage_extract(corpus, texts, repeat, options):
+    from backend.services.pdf_service import extract_document
+
+    def run(document):
+        texts[document["name"]] = extract_document(document["content"], document["filename"])["text"]
+
+    return _timed_samples(corpus, repeat, run)
+
+
+def _stage_clean(corpus, texts, repeat, options):
+    from backend.services.pipeline import AnalysisContext, CleanStage
+
+    # Étape du pipeline : normalisation puis compaction du texte envoyé à l'IA
+    stage = CleanStage()
+    loop = asyncio.new_event_loop()
+    try:
+        return _timed_samples(
+            _text_items(corpus, texts), repeat,
+            lambda item: loop.run_until_complete(stage.run(AnalysisContext(item["filename"], text=item["text"]))),
+        )
+    finally:
+        loop.close()
+
+
+def _stage_gate(corpus, texts, repeat, options):
+    from backend.services.llm_service import _cv_likelihood_score
+
+    return _timed_samples(_text_items(corpus, texts), repeat, lambda item: _cv_likelihood_score(item["text"]))
+
+
+def _stage_analyze(corpus, texts, repeat, options):
+    from backend.services.pipeline import analyze_text
+
+    # Pipeline texte complet (clean → classify → analyze → validate) sur le texte extrait
+    loop = asyncio.new_event_loop()
+    try:
+        return _timed_samples(
+            _text_items(corpus, texts), repeat,
+            lambda item: loop.run_until_complete(analyze_text(item["text"], filename=item["filename"])),
+        )
+    finally:
+        loop.close()
+
+
+def _stage_end_to_end(corpus, texts, repeat, options):
+    import httpx
+    from backend.main import app
+    from backend.services.worker_pool import shutdown_pool
+
+    by_kind: Dict[str, List[float]] = {}
+    errors: Dict[str, str] = {}
+    statuses: Dict[str, int] = {}
+
+    async def run():
+        semaphore = asyncio.Semaphore(options["concurrency"])
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+
+            async def one(document):
+                async with semaphore:
+                    began = time.perf_counter()
+                    try:
+                        response = await client.post(
+                            "/api/analyze",
+                            files={"file": (document["filename"], document["content"])},
+                        )
+                    except Exception as e:
+                        errors[document["name"]] = str(e)
+                        return
+                    elapsed = time.perf_counter() - began
+                    statuses[str(response.status_code)] = statuses.get(str(response.status_code), 0) + 1
+                    # Non-CV : 502 attendu (rejet) ; le temps de réponse compte quand même
+                    by_kind.setdefault(document["kind"], []).append(elapsed)
+
+            await asyncio.gather(*(one(document) for _ in range(repeat) for document in corpus))
+
+    start = time.perf_counter()
+    try:
+        asyncio.run(run())
+    finally:
+        shutdown_pool()
+    elapsed = time.perf_counter() - start
+    options["statuses"] = statuses
+    return by_kind, errors, elapsed
+
+
+def _text_items(corpus, texts):
+    return [
+        {"name": document["name"], "kind": document["kind"], "filename": document["filename"], "text": texts[document["name"]]}
+        for document in corpus if texts.get(document["name"])
+    ]
+
+
+def _run_stage(stage: str, corpus, texts, repeat: int, options, queue) -> None:
+    """
+    Processus neuf par étape : le pic RSS mesuré est celui de cette étape seule
+    """
+    texts = dict(texts)
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    by_kind, errors, elapsed = globals()[f"_stage_{stage}"](corpus, texts, repeat, options)
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    # tesseract et poppler tournent en sous-processus : pic du plus gros d'entre eux
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+
+    latencies = [value for values in by_kind.values() for value in values]
+    report = summarize(latencies, elapsed)
+    report.update({
+        "by_kind": {kind: summarize(values) for kind, values in sorted(by_kind.items())},
+        "peak_rss_mb": round(usage.ru_maxrss / 1024, 1),
+        "rss_growth_mb": round((usage.ru_maxrss - baseline) / 1024, 1),
+        "children_peak_rss_mb": round(children / 1024, 1),
+        "errors": errors,
+    })
+    if "statuses" in options:
+        report["statuses"] = options["statuses"]
+    queue.put((report, texts))
+
+
+def run_stage(stage: str, corpus, texts, repeat: int, options):
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+    process = ctx.Process(target=_run_stage, args=(stage, corpus, texts, repeat, options, queue))
+    process.start()
+    while True:
+        try:
+            report, texts = queue.get(timeout=1)
+            break
+        except queue_module.Empty:
+            # Étape plantée (dépendance manquante, crash natif) : ne pas attendre indéfiniment
+            if not process.is_alive():
+                report = {"count": 0, "errors": {"stage": f"processus terminé (code {process.exitcode})"}}
+                break
+    process.join()
+    return report, texts
+
+
+def _metadata(args) -> Dict[str, Any]:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "params": {
+            "pages": args.pages, "dpis": args.dpis, "repeat": args.repeat, "seed": args.seed,
+            "concurrency": args.concurrency, "llm_latency": args.llm_latency,
+        },
+        "settings": {name: os.environ[name] for name in RECORDED_SETTINGS if name in os.environ},
+    }
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """
+    Écarts par rapport à un rapport précédent ; retourne les régressions au-delà de la tolérance (%)
+    """
+    regressions = []
+    print(f"\nComparaison avec {baseline['metadata'].get('commit')} (tolérance {tolerance:g}%)")
+    print(f"{'étape':>12} {'mesure':>14} {'avant':>10} {'après':>10} {'écart':>8}")
+    for stage, current in results["stages"].items():
+        previous = baseline.get("stages", {}).get(stage)
+        if not previous:
+            continue
+        for key, higher_is_worse in (("p95_ms", True), ("throughput_per_s", False), ("peak_rss_mb", True)):
+            before, after = previous.get(key), current.get(key)
+            if not before or after is None:
+                continue
+            change = (after - before) / before * 100
+            worse = change > tolerance if higher_is_worse else change < -tolerance
+            marker = "  RÉGRESSION" if worse else ""
+            print(f"{stage:>12} {key:>14} {before:>10.1f} {after:>10.1f} {change:>+7.1f}%{marker}")
+            if worse:
+                regressions.append(f"{stage}.{key}")
+    return regressions
+
+
+def main(args) -> int:
+    # LLM factice en mémoire, sans cache ni limite de débit : chaque requête parcourt tout le pipeline
+    os.environ["LLM_PROVIDER"] = "stub"
+    os.environ["STUB_LLM_LATENCY"] = str(args.llm_latency)
+    os.environ["CACHE_BACKEND"] = "none"
+    os.environ["RATE_LIMIT_ENABLED"] = "false"
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+    corpus = build_corpus(args.pages, args.dpis, args.seed)
+    print(f"Corpus: {len(corpus)} documents, {args.repeat} passage(s), LLM stub {args.llm_latency}s")
+
+    results = {"metadata": _metadata(args), "corpus": [
+        {"name": document["name"], "kind": document["kind"], "bytes": len(document["content"])} for document in corpus
+    ], "stages": {}}
+    options = {"concurrency": args.concurrency}
+    texts: Dict[str, str] = {}
+
+    print(f"{'étape':>12} {'n':>5} {'débit/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'RSS Mo':>8} {'erreurs':>8}")
+    for stage in args.stages:
+        report, texts = run_stage(stage, corpus, texts, args.repeat, options)
+        results["stages"][stage] = report
+        if report["count"]:
+            print(f"{stage:>12} {report['count']:>5} {report['throughput_per_s']:>9.2f} {report['p50_ms']:>9.1f} "
+                  f"{report['p95_ms']:>9.1f} {report['p99_ms']:>9.1f} {report['peak_rss_mb']:>8.1f} {len(report['errors']):>8}")
+        else:
+            print(f"{stage:>12} {0:>5} (aucune mesure, erreurs: {len(report['errors'])})")
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as out:
+            json.dump(results, out, indent=2, ensure_ascii=False)
+        print(f"\nRésultats écrits dans {args.out}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as previous:
+            regressions = compare(results, json.load(previous), args.tolerance)
+        if regressions and args.strict:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark reproductible du pipeline CV")
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 3])
+    parser.add_argument("--dpis", type=int, nargs="+", default=[150, 300])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--concurrency", type=int, default=4, help="requêtes simultanées (bout en bout)")
+    parser.add_argument("--llm-latency", type=float, default=0.05, help="latence simulée du LLM stub (s)")
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=list(STAGES))
+    parser.add_argument("--out", default="pipeline_benchmark.json")
+    parser.add_argument("--baseline", help="rapport JSON précédent à comparer")
+    parser.add_argument("--tolerance", type=float, default=10.0, help="écart toléré (%%) avant de signaler une régression")
+    parser.add_argument("--strict", action="store_true", help="code de sortie 1 en cas de régression")
+    raise SystemExit(main(parser.parse_args()))
@@ -0,0 +1,237 @@
+"""
+Test de charge HTTP : un seul processus uvicorn (profil historique) contre le profil
+de production gunicorn (backend/gunicorn_conf.py : workers préchargés, recyclage).
+
+    python -m benchmarks.serving_load_test
+    python -m benchmarks.serving_load_test --workers 4 --concurrency 32 --requests 400 --kinds text pdf scan
+
+Chaque profil est lancé comme un vrai serveur (sous-processus, port local) avec le
+fournisseur LLM « stub » (latence simulée, aucun appel réseau) et sans cache : chaque
+requête repasse par la validation, l'extraction et le nettoyage. Mélange de requêtes :
+  text : /api/cv/analyze/text ; pdf : PDF à texte embarqué ; scan : PDF scanné (OCR, tesseract requis).
+Mesures : débit, latences p50/p95/max, erreurs, mémoire (PSS) du serveur et de ses processus
+avant et après la charge, workers recyclés (MAX_REQUESTS) pendant la charge.
+Sans nginx devant gunicorn, une requête envoyée sur une connexion persistante au moment
+où son worker est recyclé peut échouer (ReadError) : le client la renvoie (nginx ne rejoue pas les POST).
+Le gain du profil gunicorn croît avec le nombre de cœurs : sur un seul cœur, les deux profils se valent.
+"""
+import argparse
+import asyncio
+import os
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from benchmarks.synthetic import scanned_pdf, text_pdf
+
+SAMPLE_CV = """
+CURRICULUM VITAE
+Dupont Jean - Ingénieur Logiciel
+Email: jean.dupont@email.com | Tel: 06 12 34 56 78
+EXPERIENCES
+2022-2024 : Développeur Fullstack chez TechCorp. Python et React.
+COMPETENCES
+Python, Java, Docker, SQL
+FORMATION
+Master Informatique - Université de Paris (2020)
+"""
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _command(profile: str, port: int) -> List[str]:
+    if profile == "single":
+        return [sys.executable, "-m", "uvicorn", "backend.main:app", "--host", "127.0.0.1", "--port", str(port),
+                "--log-level", "warning"]
+    return [sys.executable, "-m", "gunicorn", "-c", "backend/gunicorn_conf.py", "backend.main:app"]
+
+
+def _env(profile: str, port: int, args) -> Dict[str, str]:
+    env = dict(os.environ)
+    env.update({
+        "LLM_PROVIDER": "stub", "STUB_LLM_LATENCY": str(args.latency), "CACHE_BACKEND": "none",
+        "RATE_LIMIT_ENABLED": "false", "LOG_LEVEL": "WARNING", "OTEL_TRACES_EXPORTER": "none", "WARMUP": "all",
+        "JOB_DB_PATH": os.path.join(args.workdir, f"jobs-{profile}.sqlite3"),
+    })
+    # uvicorn lit aussi WEB_CONCURRENCY : défini pour le seul profil gunicorn
+    env.pop("WEB_CONCURRENCY", None)
+    if profile == "gunicorn":
+        env.update({
+            "BIND": f"127.0.0.1:{port}", "WEB_CONCURRENCY": str(args.workers),
+            "MAX_REQUESTS": str(args.max_requests), "MAX_REQUESTS_JITTER": str(args.max_requests // 10),
+        })
+    return env
+
+
+def _ppid(pid: int) -> Optional[int]:
+    try:
+        with open(f"/proc/{pid}/stat") as stat:
+            return int(stat.read().rsplit(")", 1)[1].split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+def _children(pid: int) -> List[int]:
+    """
+    Processus descendants (workers gunicorn, pool d'extraction) lus dans /proc
+    """
+    parents: Dict[int, List[int]] = {}
+    for entry in os.listdir("/proc"):
+        if entry.isdigit():
+            parents.setdefault(_ppid(int(entry)), []).append(int(entry))
+    found, stack = [], [pid]
+    while stack:
+        for child in parents.get(stack.pop(), []):
+            found.append(child)
+            stack.append(child)
+    return found
+
+
+def _pss_mb(pids: List[int]) -> float:
+    """
+    Mémoire proportionnelle (PSS) : les pages partagées après le fork ne sont comptées qu'une fois
+    """
+    total = 0
+    for pid in pids:
+        try:
+            with open(f"/proc/{pid}/smaps_rollup") as rollup:
+                for line in rollup:
+                    if line.startswith("Pss:"):
+                        total += int(line.split()[1])
+        except OSError:
+            pass
+    return total / 1024
+
+
+def _documents(kinds: List[str]) -> Dict[str, Any]:
+    documents = {}
+    if "pdf" in kinds:
+        documents["pdf"] = ("cv.pdf", text_pdf(2))
+    if "scan" in kinds:
+        documents["scan"] = ("scan.pdf", scanned_pdf(1))
+    return documents
+
+
+async def _wait_ready(client: httpx.AsyncClient, process: subprocess.Popen, timeout: float = 60) -> None:
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Serveur arrêté au démarrage (code {process.returncode})")
+        try:
+            if (await client.get("/api/health")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.2)
+    raise RuntimeError("Serveur non prêt")
+
+
+async def _load(client: httpx.AsyncClient, args, documents: Dict[str, Any]) -> Dict[str, Any]:
+    semaphore = asyncio.Semaphore(args.concurrency)
+    latencies: Dict[str, List[float]] = {kind: [] for kind in args.kinds}
+    errors: Dict[str, int] = {}
+
+    async def one(index: int):
+        kind = args.kinds[index % len(args.kinds)]
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                if kind == "text":
+                    response = await client.post("/api/cv/analyze/text", data={"text": SAMPLE_CV})
+                else:
+                    filename, content = documents[kind]
+                    response = await client.post(
+                        "/api/cv/analyze/file", files={"file": (filename, content, "application/pdf")},
+                    )
+                status = str(response.status_code) if response.status_code != 200 else None
+            except httpx.TransportError as e:
+                status = type(e).__name__
+            if status:
+                errors[status] = errors.get(status, 0) + 1
+            else:
+                latencies[kind].append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(index) for index in range(args.requests)))
+    elapsed = time.perf_counter() - started
+    every = sorted(latency for values in latencies.values() for latency in values)
+    return {
+        "elapsed": elapsed,
+        "throughput": len(every) / elapsed,
+        "p50": statistics.median(every) if every else float("nan"),
+        "p95": every[int(len(every) * 0.95) - 1] if every else float("nan"),
+        "max": every[-1] if every else float("nan"),
+        "per_kind_p50": {kind: statistics.median(values) for kind, values in latencies.items() if values},
+        "errors": errors,
+    }
+
+
+async def run_profile(profile: str, args, documents: Dict[str, Any]) -> Dict[str, Any]:
+    port = _free_port()
+    process = subprocess.Popen(_command(profile, port), env=_env(profile, port, args))
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    try:
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", timeout=120, limits=limits) as client:
+            await _wait_ready(client, process)
+            # Une requête de chaque type : warm-up des workers hors de la mesure
+            await _load(client, argparse.Namespace(**{**vars(args), "requests": len(args.kinds) * args.workers}), documents)
+            before_pids = [process.pid] + _children(process.pid)
+            workers = [pid for pid in before_pids if _ppid(pid) == process.pid]
+            pss_before = _pss_mb(before_pids)
+            report = await _load(client, args, documents)
+            after_pids = [process.pid] + _children(process.pid)
+            report["pss_before_mb"] = pss_before
+            report["pss_after_mb"] = _pss_mb(after_pids)
+            report["processes"] = len(after_pids)
+            # Workers remplacés pendant la charge (gunicorn : recyclage après MAX_REQUESTS)
+            report["recycled"] = len(set(workers) - set(after_pids))
+    finally:
+        process.send_signal(signal.SIGTERM)
+        try:
+            process.wait(timeout=args.max_wait)
+        except subprocess.TimeoutExpired:
+            process.kill()
+    report["profile"] = profile
+    return report
+
+
+def main(args) -> None:
+    os.makedirs(args.workdir, exist_ok=True)
+    documents = _documents(args.kinds)
+    print(f"{args.requests} requêtes ({', '.join(args.kinds)}), concurrence {args.concurrency}, "
+          f"LLM stub {args.latency}s, {os.cpu_count()} cœurs")
+    reports = [asyncio.run(run_profile(profile, args, documents)) for profile in args.profiles]
+
+    print(f"\n{'profil':>8} {'req/s':>8} {'p50 (s)':>8} {'p95 (s)':>8} {'max (s)':>8} "
+          f"{'PSS av.':>8} {'PSS ap.':>8} {'proc.':>6} {'recyclés':>9}  erreurs")
+    for report in reports:
+        print(f"{report['profile']:>8} {report['throughput']:>8.2f} {report['p50']:>8.3f} {report['p95']:>8.3f} "
+              f"{report['max']:>8.3f} {report['pss_before_mb']:>7.0f}M {report['pss_after_mb']:>7.0f}M "
+              f"{report['processes']:>6} {report['recycled']:>9}  {report['errors'] or '-'}")
+    for report in reports:
+        per_kind = ", ".join(f"{kind} {p50:.3f}s" for kind, p50 in report["per_kind_p50"].items())
+        print(f"{report['profile']:>8} p50 par type : {per_kind}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Un worker uvicorn contre le profil gunicorn multi-workers")
+    parser.add_argument("--profiles", nargs="+", choices=["single", "gunicorn"], default=["single", "gunicorn"])
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2, help="workers du profil gunicorn")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--kinds", nargs="+", choices=["text", "pdf", "scan"], default=["text", "pdf"])
+    parser.add_argument("--latency", type=float, default=0.2, help="latence simulée du LLM (secondes)")
+    parser.add_argument("--max-requests", type=int, default=1000, help="recyclage des workers gunicorn")
+    parser.add_argument("--max-wait", type=float, default=90, help="attente de l'arrêt progressif (secondes)")
+    parser.add_argument("--workdir", default="/tmp/serving_load_test")
+    main(parser.parse_args())
@@ -0,0 +1,205 @@
+"""
+Temps de démarrage à froid de l'application (python -X importtime) et modules lourds chargés.
+
+    python -m benchmarks.startup_time
+    python -m benchmarks.startup_time --runs 10 --budget-ms 600 --out startup.json
+
+Chaque mesure tourne dans un interpréteur neuf (comme un démarrage à froid Vercel) :
+  - import de backend.main : durée cumulée et paquets les plus coûteux ;
+  - premières requêtes /api/health et /api/cv/analyze/text (mode fast) : la pile
+    PDF/OCR (PyPDF2, pdf2image, PIL) et le SDK LLM ne doivent pas être chargés ;
+  - warm-up (WARMUP=all) : coût du préchargement qui serait payé par la première requête fichier.
+Code de sortie 1 si le budget d'import est dépassé ou si un module lourd est chargé trop tôt.
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List
+
+# Chargés seulement par les analyses de fichiers (pile PDF/OCR) ou le premier appel LLM
+HEAVY_MODULES = ("PIL", "PyPDF2", "pdf2image", "pytesseract", "tesserocr", "groq", "httpx")
+
+# Texte de la requête texte (benchmarks.synthetic importe PIL : inutilisable dans la sonde)
+SAMPLE_CV = (
+    "CURRICULUM VITAE\nDupont Jean\nEmail: jean.dupont@email.com | Tel: 06 12 34 56 78\n"
+    "EXPERIENCES\n2022-2024 : Développeur Fullstack chez TechCorp.\nCOMPETENCES\nPython, Docker, SQL\n"
+    "FORMATION\nMaster Informatique - Université de Paris (2020)"
+)
+
+
+def _env() -> Dict[str, str]:
+    env = dict(os.environ)
+    # Aucun appel réseau ni processus du pool : seul le coût des imports est mesuré
+    env.update({"LLM_PROVIDER": "stub", "STUB_LLM_LATENCY": "0", "EXTRACTION_POOL": "thread",
+                "CACHE_BACKEND": "none", "RATE_LIMIT_ENABLED": "false", "WARMUP": "none"})
+    env.setdefault("LOG_LEVEL", "WARNING")
+    env.setdefault("OTEL_TRACES_EXPORTER", "none")
+    return env
+
+
+def parse_importtime(stderr: str) -> List[Dict[str, Any]]:
+    """
+    Lignes « import time: self | cumulative | module » de python -X importtime (µs)
+    """
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue
+        modules.append({
+            "module": fields[2].strip(),
+            "self_us": int(fields[0]),
+            "cumulative_us": int(fields[1]),
+        })
+    return modules
+
+
+def measure_import(target: str = "backend.main") -> Dict[str, Any]:
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        capture_output=True, text=True, env=_env(),
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"Import de {target} impossible:\n{completed.stderr[-2000:]}")
+    modules = parse_importtime(completed.stderr)
+    total = next(module["cumulative_us"] for module in modules if module["module"] == target)
+    packages: Dict[str, int] = {}
+    for module in modules:
+        package = module["module"].split(".")[0]
+        packages[package] = packages.get(package, 0) + module["self_us"]
+    return {
+        "total_ms": total / 1000,
+        "packages_ms": {name: us / 1000 for name, us in sorted(packages.items(), key=lambda item: -item[1])},
+    }
+
+
+async def _request(app, method: str, path: str, body: bytes = b"", content_type: str = "") -> int:
+    """
+    Requête ASGI minimale (sans client HTTP, pour ne pas charger httpx dans la sonde)
+    """
+    path, _, query = path.partition("?")
+    headers = [(b"host", b"probe"), (b"content-length", str(len(body)).encode())]
+    if content_type:
+        headers.append((b"content-type", content_type.encode()))
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": method, "scheme": "http",
+        "path": path, "raw_path": path.encode(), "query_string": query.encode(), "root_path": "",
+        "headers": headers, "client": ("127.0.0.1", 50000), "server": ("probe", 80),
+    }
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+    status = {}
+
+    async def receive():
+        return messages.pop(0) if messages else {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            status["code"] = message["status"]
+
+    await app(scope, receive, send)
+    return status["code"]
+
+
+def probe() -> Dict[str, Any]:
+    """
+    Exécutée dans un interpréteur neuf : modules lourds chargés après chaque phase
+    """
+    from urllib.parse import urlencode
+
+    def loaded():
+        return sorted(name for name in HEAVY_MODULES if name in sys.modules)
+
+    phases = {}
+    started = time.perf_counter()
+    from backend.main import app
+    phases["import"] = {"ms": (time.perf_counter() - started) * 1000, "loaded": loaded()}
+
+    async def requests():
+        started = time.perf_counter()
+        status = await _request(app, "GET", "/api/health")
+        phases["health"] = {"ms": (time.perf_counter() - started) * 1000, "status": status, "loaded": loaded()}
+
+        body = urlencode({"text": SAMPLE_CV}).encode()
+        started = time.perf_counter()
+        status = await _request(app, "POST", "/api/cv/analyze/text?mode=fast", body, "application/x-www-form-urlencoded")
+        phases["text"] = {"ms": (time.perf_counter() - started) * 1000, "status": status, "loaded": loaded()}
+
+        from backend.services.pipeline import warm_up
+        started = time.perf_counter()
+        report = await warm_up("all")
+        phases["warmup"] = {"ms": (time.perf_counter() - started) * 1000, "targets": report, "loaded": loaded()}
+
+    asyncio.run(requests())
+    return phases
+
+
+def run_probe() -> Dict[str, Any]:
+    completed = subprocess.run(
+        [sys.executable, "-m", "benchmarks.startup_time", "--probe"], capture_output=True, text=True, env=_env(),
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"Sonde de démarrage en échec:\n{completed.stderr[-2000:]}")
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def main(args) -> int:
+    imports = [measure_import() for _ in range(args.runs)]
+    totals = [run["total_ms"] for run in imports]
+    median = statistics.median(totals)
+    # Paquets du passage médian (les temps d'un passage isolé sont bruités)
+    packages = sorted(imports, key=lambda run: run["total_ms"])[len(imports) // 2]["packages_ms"]
+
+    print(f"import backend.main ({args.runs} passages) : médiane {median:.0f} ms, min {min(totals):.0f} ms, "
+          f"max {max(totals):.0f} ms (budget {args.budget_ms:g} ms)")
+    print(f"\n{'paquet':>24} {'ms':>8}")
+    for name, ms in list(packages.items())[:args.top]:
+        print(f"{name:>24} {ms:>8.1f}")
+
+    phases = run_probe()
+    print(f"\n{'phase':>8} {'ms':>8} {'statut':>7}  modules lourds chargés")
+    for name, phase in phases.items():
+        print(f"{name:>8} {phase['ms']:>8.1f} {str(phase.get('status', '')):>7}  {', '.join(phase['loaded']) or '-'}")
+
+    failures = []
+    if median > args.budget_ms:
+        failures.append(f"import médian {median:.0f} ms > budget {args.budget_ms:g} ms")
+    for name in ("import", "health", "text"):
+        if phases[name]["loaded"]:
+            failures.append(f"{name}: modules lourds chargés ({', '.join(phases[name]['loaded'])})")
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as out:
+            json.dump({
+                "python": sys.version.split()[0],
+                "import_ms": {"median": median, "min": min(totals), "max": max(totals), "runs": totals},
+                "packages_ms": packages,
+                "phases": phases,
+                "failures": failures,
+            }, out, indent=2, ensure_ascii=False)
+        print(f"\nRésultats écrits dans {args.out}")
+
+    for failure in failures:
+        print(f"ÉCHEC: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Temps de démarrage à froid et imports différés")
+    parser.add_argument("--runs", type=int, default=5, help="interpréteurs neufs mesurés")
+    parser.add_argument("--budget-ms", type=float, default=float(os.getenv("STARTUP_BUDGET_MS", "800")),
+                        help="durée médiane maximale de l'import de backend.main")
+    parser.add_argument("--top", type=int, default=15, help="paquets les plus coûteux affichés")
+    parser.add_argument("--out", help="fichier JSON de résultats")
+    parser.add_argument("--probe", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.probe:
+        print(json.dumps(probe()))
+        sys.exit(0)
+    sys.exit(main(args))
@@ -0,0 +1,90 @@
+"""
+Serveur LLM factice compatible OpenAI/Groq pour les tests de charge hors ligne.
+
+Répond à toute requête POST `.../chat/completions` après une latence fixe,
+avec un JSON de CV valide. Utilisable seul :
+
+    python -m benchmarks.stub_llm_server --port 8099 --latency 0.5
+"""
+import argparse
+import json
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Même réponse que le fournisseur « stub » en mémoire (backend.services.llm_providers) ;
+# dupliquée pour ne pas importer l'application avant la configuration de l'environnement
+STUB_CV = {
+    "nom": "Dupont",
+    "prenom": "Jean",
+    "email": "jean.dupont@email.com",
+    "telephone": "06 12 34 56 78",
+    "competences": ["Python", "Docker", "SQL"],
+    "experiences": [{"entreprise": "TechCorp", "poste": "Développeur Fullstack", "duree": "2022-2024"}],
+    "formations": [{"ecole": "Université de Paris", "diplome": "Master Informatique", "annee": "2020"}],
+}
+
+
+def _make_handler(latency: float):
+    class StubHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length", 0))
+            self.rfile.read(length)
+
+            if not self.path.rstrip("/").endswith("/chat/completions"):
+                self.send_error(404)
+                return
+
+            time.sleep(latency)
+            body = json.dumps({
+                "id": f"chatcmpl-{uuid.uuid4().hex}",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": "stub",
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": json.dumps(STUB_CV, ensure_ascii=False)},
+                    "finish_reason": "stop",
+                    "logprobs": None,
+                }],
+                "usage": {"prompt_tokens": 500, "completion_tokens": 150, "total_tokens": 650},
+            }).encode("utf-8")
+
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return StubHandler
+
+
+def start_stub_server(port: int = 0, latency: float = 0.5) -> ThreadingHTTPServer:
+    """
+    Démarre le serveur factice dans un thread et retourne l'instance (port via server_address)
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", port), _make_handler(latency))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serveur LLM factice")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--latency", type=float, default=0.5)
+    args = parser.parse_args()
+
+    srv = start_stub_server(args.port, args.latency)
+    print(f"Stub LLM sur http://127.0.0.1:{srv.server_address[1]} (latence {args.latency}s)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        srv.shutdown()
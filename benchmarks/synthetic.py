@@ -0,0 +1,131 @@
+"""
+Génération de documents synthétiques (CV scannés, PDF) pour les benchmarks.
+"""
+import io
+import random
+
+from PIL import Image, ImageDraw, ImageFont
+
+CV_LINES = [
+    "CURRICULUM VITAE",
+    "Dupont Jean - Ingenieur Logiciel",
+    "Email: jean.dupont@email.com  Tel: 06 12 34 56 78",
+    "EXPERIENCES",
+    "2022-2024 : Developpeur Fullstack chez TechCorp",
+    "2020-2022 : Stagiaire Java chez OldSchool Company",
+    "COMPETENCES",
+    "Python, Java, Docker, SQL, Anglais courant",
+    "FORMATION",
+    "Master Informatique - Universite de Paris (2020)",
+]
+
+# Document qui n'est pas un CV (facture) : doit être rejeté par le filtre avant l'appel IA
+NON_CV_LINES = [
+    "FACTURE N 2024-0193",
+    "Date d'emission : 12/03/2024",
+    "Client : Societe Exemple SARL",
+    "Designation            Quantite    Prix unitaire",
+    "Licence logicielle     3           450,00 EUR",
+    "Maintenance annuelle   1           1200,00 EUR",
+    "Total HT : 2550,00 EUR",
+    "TVA 20% : 510,00 EUR",
+    "Total TTC : 3060,00 EUR",
+    "Paiement a 30 jours par virement bancaire",
+]
+
+
+def cv_lines(seed: int, extra: int = 20):
+    """
+    Lignes d'un CV varié mais reproductible (même graine, même CV) : longueur réaliste
+    et contenu distinct d'un document à l'autre (pas de résultats servis par le cache)
+    """
+    rng = random.Random(seed)
+    skills = ["Python", "Java", "Docker", "SQL", "React", "Kubernetes", "Go", "Linux", "Spark", "Git"]
+    companies = ["TechCorp", "DataSoft", "CloudNine", "InnovLab", "WebAgency", "FinServ"]
+    lines = list(CV_LINES)
+    lines[1] = f"Candidat {seed} - Ingenieur Logiciel"
+    for _ in range(extra):
+        year = rng.randint(2005, 2023)
+        lines.append(f"{year}-{year + rng.randint(1, 3)} : {rng.choice(skills)} chez {rng.choice(companies)}")
+    return lines
+
+
+def _font(size: int):
+    try:
+        return ImageFont.truetype("DejaVuSans.ttf", size)
+    except OSError:
+        return ImageFont.load_default()
+
+
+def render_page(page_num: int, dpi: int = 150, lines=CV_LINES) -> Image.Image:
+    """
+    Rend une page A4 « scannée » (image en niveaux de gris) contenant du texte de CV
+    """
+    width, height = int(8.27 * dpi), int(11.69 * dpi)
+    image = Image.new("L", (width, height), 255)
+    draw = ImageDraw.Draw(image)
+    font = _font(max(12, dpi // 6))
+    y = dpi // 2
+    for line in [f"Page {page_num + 1}"] + list(lines):
+        draw.text((dpi // 2, y), line, fill=0, font=font)
+        y += int(font.size * 1.8) if hasattr(font, "size") else 20
+    return image
+
+
+def scanned_pdf(pages: int, dpi: int = 150, lines=CV_LINES) -> bytes:
+    """
+    PDF composé uniquement d'images (aucun texte embarqué), comme un scan
+    """
+    images = [render_page(i, dpi, lines).convert("RGB") for i in range(pages)]
+    buffer = io.BytesIO()
+    images[0].save(buffer, "PDF", resolution=dpi, save_all=True, append_images=images[1:])
+    return buffer.getvalue()
+
+
+def scanned_image(dpi: int = 150, fmt: str = "PNG", lines=CV_LINES) -> bytes:
+    """
+    Photo/scan d'un CV encodé en PNG ou JPEG
+    """
+    buffer = io.BytesIO()
+    render_page(0, dpi, lines).save(buffer, fmt)
+    return buffer.getvalue()
+
+
+def _pdf_escape(line: str) -> str:
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def text_pdf(pages: int, lines=CV_LINES, padding: int = 0) -> bytes:
+    """
+    PDF avec texte embarqué (export d'un traitement de texte) : extrait sans OCR.
+    `padding` : octets d'un flux binaire non référencé (images, polices) pour grossir le fichier
+    """
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for page_num in range(pages):
+        text = "".join(f"({_pdf_escape(line)}) Tj T* " for line in [f"Page {page_num + 1}"] + list(lines))
+        stream = f"BT /F1 11 Tf 14 TL 56 780 Td {text}ET".encode("latin-1")
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        content_id = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] /Contents %d 0 R "
+            b"/Resources << /Font << /F1 3 0 R >> >> >>" % content_id
+        )
+        kids.append(len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (" ".join(f"{k} 0 R" for k in kids).encode(), pages)
+    if padding:
+        blob = random.Random(padding).randbytes(padding)
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(blob), blob))
+
+    buffer = io.BytesIO()
+    buffer.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(buffer.tell())
+        buffer.write(b"%d 0 obj\n%s\nendobj\n" % (number, body))
+    xref = buffer.tell()
+    buffer.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for offset in offsets:
+        buffer.write(b"%010d 00000 n \n" % offset)
+    buffer.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref))
+    return buffer.getvalue()
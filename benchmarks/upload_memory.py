@@ -0,0 +1,69 @@
+"""
+Pic de mémoire (RSS) d'une requête d'analyse selon la taille du fichier envoyé,
+à travers l'application ASGI (mode fast : aucun appel LLM, extraction du texte embarqué).
+
+    python -m benchmarks.upload_memory --sizes 1 5 9 20
+
+Chaque requête tourne dans un processus neuf pour isoler le pic RSS. Un fichier
+au-delà de MAX_FILE_SIZE doit être refusé (413) sans faire croître la mémoire.
+Comparer deux commits : lancer le script sur chacun avec les mêmes tailles.
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import resource
+
+
+def _measure(size_mb: float, queue) -> None:
+    import httpx
+    from backend.main import app
+    from benchmarks.synthetic import text_pdf
+
+    content = text_pdf(1, padding=int(size_mb * 1024 * 1024))
+
+    async def post():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+            # Requête à vide : imports et initialisations hors de la mesure
+            await client.get("/api/health")
+            baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            response = await client.post(
+                "/api/analyze", params={"mode": "fast"}, files={"file": ("cv.pdf", content)},
+            )
+            return response.status_code, baseline
+
+    status, baseline = asyncio.run(post())
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    queue.put((len(content), status, (peak - baseline) / 1024, peak / 1024))
+
+
+def measure(size_mb: float):
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+    process = ctx.Process(target=_measure, args=(size_mb, queue))
+    process.start()
+    result = queue.get()
+    process.join()
+    return result
+
+
+def main(sizes) -> None:
+    # Extraction dans le processus mesuré, sans cache ni limite de débit
+    os.environ["EXTRACTION_POOL"] = "thread"
+    os.environ["CACHE_BACKEND"] = "none"
+    os.environ["RATE_LIMIT_ENABLED"] = "false"
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+    print(f"{'fichier (Mo)':>13} {'statut':>7} {'hausse RSS (Mo)':>16} {'pic RSS (Mo)':>13} {'ratio':>6}")
+    for size_mb in sizes:
+        size, status, growth, peak = measure(size_mb)
+        ratio = growth / (size / 1024 / 1024)
+        print(f"{size / 1024 / 1024:>13.1f} {status:>7} {growth:>16.1f} {peak:>13.1f} {ratio:>6.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pic mémoire par requête selon la taille de l'upload")
+    parser.add_argument("--sizes", type=float, nargs="+", default=[1, 5, 9, 20], help="tailles en Mo")
+    args = parser.parse_args()
+    main(args.sizes)
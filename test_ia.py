@@ -1,4 +1,7 @@
-from backend.services.llm_service import analyze_cv_with_ai
+import asyncio
+import json
+
+from backend.services.pipeline import analyze_text
 
 # Simulation d'un texte sale extrait d'un PDF par ton binôme
 fake_cv_text = """
@@ -18,9 +21,9 @@ FORMATION
 Master Informatique - Université de Paris (2020)
 """
 
-print("--- Envoi à l'IA en cours... ---")
-resultat = analyze_cv_with_ai(fake_cv_text)
+if __name__ == "__main__":
+    print("--- Envoi à l'IA en cours... ---")
+    resultat = asyncio.run(analyze_text(fake_cv_text))
 
-print("\n--- RÉSULTAT JSON ---")
-import json
-print(json.dumps(resultat, indent=4, ensure_ascii=False))
\ No newline at end of file
+    print("\n--- RÉSULTAT JSON ---")
+    print(json.dumps(resultat, indent=4, ensure_ascii=False))
\ No newline at end of file
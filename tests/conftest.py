@@ -0,0 +1,10 @@
+import os
+
+# Configuration de test fixée avant l'import de l'application : aucun appel réseau ni fichier partagé
+os.environ.setdefault("LLM_PROVIDER", "stub")
+os.environ.setdefault("CACHE_BACKEND", "none")
+os.environ.setdefault("JOB_STORE", "memory")
+os.environ.setdefault("EXTRACTION_POOL", "thread")
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+os.environ.setdefault("OTEL_TRACES_EXPORTER", "none")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
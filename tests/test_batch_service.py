@@ -0,0 +1,41 @@
+import io
+import zipfile
+
+import pytest
+
+from backend.services.batch_service import expand_zip
+
+
+def _zip(entries) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        for name, content in entries:
+            archive.writestr(name, content)
+    return buffer.getvalue()
+
+
+def test_expand_zip_skips_directories_and_metadata():
+    content = _zip([("cvs/a.pdf", b"a"), ("__MACOSX/cvs/._a.pdf", b"x"), ("cvs/.DS_Store", b"x"), ("b.png", b"bb")])
+    assert expand_zip(content, max_entries=10, max_entry_size=10) == [("a.pdf", b"a", None), ("b.png", b"bb", None)]
+
+
+def test_expand_zip_rejects_oversized_entry():
+    content = _zip([("a.pdf", b"a" * 100), ("b.pdf", b"b")])
+    assert expand_zip(content, max_entries=10, max_entry_size=50) == [
+        ("a.pdf", None, "Fichier trop volumineux"), ("b.pdf", b"b", None),
+    ]
+
+
+def test_expand_zip_entry_count_budget():
+    content = _zip([(f"{index}.pdf", b"x") for index in range(3)])
+    with pytest.raises(ValueError):
+        expand_zip(content, max_entries=2, max_entry_size=10)
+
+
+def test_expand_zip_total_size_budget():
+    # Très compressible : 3 Ko dans l'archive, 3 Mo une fois décompressée
+    content = _zip([(f"{index}.pdf", b"0" * 1024 * 1024) for index in range(3)])
+    assert len(content) < 64 * 1024
+    with pytest.raises(ValueError):
+        expand_zip(content, max_entries=10, max_entry_size=2 * 1024 * 1024, max_total_size=2 * 1024 * 1024)
+    assert len(expand_zip(content, max_entries=10, max_entry_size=2 * 1024 * 1024, max_total_size=3 * 1024 * 1024)) == 3
@@ -0,0 +1,147 @@
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+
+import pytest
+
+from backend.services import job_service
+from backend.services.job_service import (
+    DONE, FAILED, PENDING, RUNNING, MemoryJobStore, SQLiteJobStore, WebhookRejected, validate_webhook_url,
+)
+
+
+def _dead_pid() -> int:
+    process = subprocess.Popen([sys.executable, "-c", "pass"])
+    process.wait()
+    return process.pid
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        return MemoryJobStore()
+    return SQLiteJobStore(path=str(tmp_path / "jobs.sqlite3"))
+
+
+# -------------------- Stockage des tâches --------------------
+
+def test_claim_once(store):
+    job_id = store.create("cv.pdf", b"%PDF", None)
+    assert store.claim(job_id)
+    assert store.get(job_id)["status"] == RUNNING
+    assert not store.claim(job_id)
+
+
+def test_claim_finished_or_unknown(store):
+    job_id = store.create("cv.pdf", b"%PDF", None)
+    store.update(job_id, DONE, result={"nom": "Dupont"})
+    assert not store.claim(job_id)
+    assert not store.claim("inconnue")
+    assert store.get_content(job_id) is None
+    assert store.get(job_id)["result"] == {"nom": "Dupont"}
+
+
+def test_release_puts_job_back(store):
+    job_id = store.create("cv.pdf", b"%PDF", None)
+    assert store.claim(job_id)
+    store.release(job_id)
+    assert store.get(job_id)["status"] == PENDING
+    assert store.unfinished() == [job_id]
+    assert store.claim(job_id)
+
+
+def test_sqlite_claim_job_of_dead_worker(tmp_path):
+    store = SQLiteJobStore(path=str(tmp_path / "jobs.sqlite3"))
+    job_id = store.create("cv.pdf", b"%PDF", None)
+    store._conn.execute("UPDATE cv_jobs SET status = ?, worker = ? WHERE job_id = ?", (RUNNING, _dead_pid(), job_id))
+    store._conn.commit()
+    assert store.claim(job_id)
+
+
+def test_sqlite_claim_job_left_with_own_pid(tmp_path):
+    # Conteneur redémarré : l'ancien processus avait le même pid
+    store = SQLiteJobStore(path=str(tmp_path / "jobs.sqlite3"))
+    job_id = store.create("cv.pdf", b"%PDF", None)
+    store._conn.execute("UPDATE cv_jobs SET status = ?, worker = ? WHERE job_id = ?", (RUNNING, os.getpid(), job_id))
+    store._conn.commit()
+    assert store.claim(job_id)
+    assert not store.claim(job_id)
+
+
+def test_sqlite_claim_job_of_live_worker(tmp_path):
+    store = SQLiteJobStore(path=str(tmp_path / "jobs.sqlite3"))
+    job_id = store.create("cv.pdf", b"%PDF", None)
+    store._conn.execute("UPDATE cv_jobs SET status = ?, worker = ? WHERE job_id = ?", (RUNNING, os.getppid(), job_id))
+    store._conn.commit()
+    assert not store.claim(job_id)
+    # Une tâche d'un autre worker n'est pas remise en attente par ce processus
+    store.release(job_id)
+    assert store.get(job_id)["status"] == RUNNING
+
+
+def test_finished_jobs_evicted(store):
+    store.max_finished = 2
+    job_ids = [store.create("cv.pdf", b"%PDF", None) for _ in range(4)]
+    for job_id in job_ids[:3]:
+        store.update(job_id, FAILED, error="erreur")
+    assert [store.get(job_id) is not None for job_id in job_ids] == [False, True, True, True]
+
+
+# -------------------- Validation des webhooks --------------------
+
+@pytest.fixture
+def resolve(monkeypatch):
+    """
+    Résolution DNS simulée : {hôte: [adresses]}
+    """
+    addresses = {}
+
+    async def getaddrinfo(self, host, port, **kwargs):
+        if host not in addresses:
+            raise socket.gaierror(socket.EAI_NONAME, "inconnu")
+        return [(socket.AF_INET, socket.SOCK_STREAM, 6, "", (address, port)) for address in addresses[host]]
+
+    monkeypatch.setattr(asyncio.base_events.BaseEventLoop, "getaddrinfo", getaddrinfo)
+    monkeypatch.setattr(job_service, "JOB_WEBHOOK_ALLOWED_HOSTS", set())
+    return addresses
+
+
+def test_webhook_public_address(resolve):
+    resolve["hooks.example.com"] = ["93.184.216.34"]
+    assert asyncio.run(validate_webhook_url("https://hooks.example.com/cv")) == "93.184.216.34"
+
+
+@pytest.mark.parametrize("address", [
+    "127.0.0.1", "10.0.0.5", "172.16.3.4", "192.168.1.10", "169.254.169.254", "0.0.0.0", "::1", "fd00::1",
+    "::ffff:127.0.0.1", "224.0.0.1",
+])
+def test_webhook_internal_address_rejected(resolve, address):
+    resolve["hooks.example.com"] = [address]
+    with pytest.raises(WebhookRejected):
+        asyncio.run(validate_webhook_url("http://hooks.example.com/cv"))
+
+
+def test_webhook_any_internal_address_rejected(resolve):
+    resolve["hooks.example.com"] = ["93.184.216.34", "10.0.0.5"]
+    with pytest.raises(WebhookRejected):
+        asyncio.run(validate_webhook_url("http://hooks.example.com/cv"))
+
+
+@pytest.mark.parametrize("url", ["ftp://hooks.example.com/cv", "file:///etc/passwd", "http:///cv", "inconnu.example"])
+def test_webhook_invalid_url_rejected(resolve, url):
+    with pytest.raises(WebhookRejected):
+        asyncio.run(validate_webhook_url(url))
+
+
+def test_webhook_unknown_host_rejected(resolve):
+    with pytest.raises(WebhookRejected):
+        asyncio.run(validate_webhook_url("https://inconnu.example/cv"))
+
+
+def test_webhook_allowlist(resolve, monkeypatch):
+    monkeypatch.setattr(job_service, "JOB_WEBHOOK_ALLOWED_HOSTS", {"hooks.internal"})
+    assert asyncio.run(validate_webhook_url("http://hooks.internal/cv")) is None
+    with pytest.raises(WebhookRejected):
+        asyncio.run(validate_webhook_url("http://autre.example/cv"))
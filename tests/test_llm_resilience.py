@@ -0,0 +1,90 @@
+import pytest
+
+from backend.services import llm_resilience
+from backend.services.llm_resilience import (
+    CLOSED, HALF_OPEN, OPEN, CallPolicy, CircuitBreaker, LLMProviderError,
+)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(llm_resilience.time, "monotonic", clock)
+    return clock
+
+
+def test_breaker_opens_after_threshold(clock):
+    breaker = CircuitBreaker(threshold=3, cooldown=30)
+    for _ in range(2):
+        breaker.record_failure()
+        assert breaker.state == CLOSED and breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+    assert breaker.retry_in() == 30
+
+
+def test_breaker_success_resets_failures(clock):
+    breaker = CircuitBreaker(threshold=2, cooldown=30)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+
+
+def test_breaker_single_trial_after_cooldown(clock):
+    breaker = CircuitBreaker(threshold=1, cooldown=30)
+    breaker.record_failure()
+    clock.now += 29
+    assert not breaker.allow()
+    clock.now += 1
+    assert breaker.allow()
+    assert breaker.state == HALF_OPEN
+    # Un seul appel d'essai à la fois
+    assert not breaker.allow()
+
+
+def test_breaker_trial_success_closes(clock):
+    breaker = CircuitBreaker(threshold=1, cooldown=30)
+    breaker.record_failure()
+    clock.now += 30
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CLOSED and breaker.allow()
+
+
+def test_breaker_trial_failure_reopens(clock):
+    breaker = CircuitBreaker(threshold=5, cooldown=30)
+    for _ in range(5):
+        breaker.record_failure()
+    clock.now += 30
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert breaker.retry_in() == 30
+
+
+def test_breaker_cancelled_trial_released(clock):
+    breaker = CircuitBreaker(threshold=1, cooldown=30)
+    breaker.record_failure()
+    clock.now += 30
+    assert breaker.allow()
+    breaker.release_trial()
+    assert breaker.state == OPEN
+    assert breaker.allow()
+
+
+@pytest.mark.parametrize("status_code, opens", [(None, True), (500, True), (503, True), (429, False), (400, False)])
+def test_policy_counts_only_outages(clock, status_code, opens):
+    policy = CallPolicy("test", rate_limited=False)
+    policy.breaker.threshold = 1
+    policy.record(LLMProviderError("erreur", status_code))
+    assert (policy.breaker.state == OPEN) == opens
@@ -0,0 +1,43 @@
+import json
+
+from backend.services.llm_service import _FieldScanner, _completed_fields
+
+CV = {
+    "nom": 'Du"pont {x}',
+    "prenom": "Jean, [a]",
+    "competences": ["Python", "C\\"],
+    "experiences": [{"entreprise": "TechCorp", "poste": "}"}],
+    "email": "jean.dupont@email.com",
+}
+RESPONSE = "Voici le JSON demandé :\n" + json.dumps(CV, ensure_ascii=False, indent=2) + "\nFin."
+
+
+def test_completed_fields_full_response():
+    assert _completed_fields(RESPONSE) == CV
+
+
+def test_completed_fields_partial_response():
+    partial = RESPONSE[:RESPONSE.index('"competences"') + 20]
+    assert _completed_fields(partial) == {"nom": CV["nom"], "prenom": CV["prenom"]}
+
+
+def test_completed_fields_without_json():
+    assert _completed_fields("Aucune donnée") == {}
+
+
+def test_scanner_matches_full_scan_for_any_chunking():
+    for size in (1, 2, 3, 7, 16, len(RESPONSE)):
+        scanner = _FieldScanner()
+        fields = {}
+        for start in range(0, len(RESPONSE), size):
+            fields.update(scanner.feed(RESPONSE[start:start + size]))
+        assert fields == CV
+        assert scanner.text == RESPONSE
+
+
+def test_scanner_reports_each_field_once():
+    scanner = _FieldScanner()
+    seen = []
+    for char in RESPONSE:
+        seen.extend(scanner.feed(char))
+    assert seen == list(CV)